@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Benchmark of the matrix I/O functions used by the upgraders.
+
+Compares `numpy.savetxt` and `pandas.read_csv` (with type inference) to the functions
+of the `antares.study.version.matrix_io` module, on hourly matrices (8760 rows).
+The script also checks that the written files are byte-identical.
+"""
+
+import argparse
+import pathlib
+import tempfile
+import timeit
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from antares.study.version.fs import DiskFS
+from antares.study.version.matrix_io import read_matrix, write_matrix
+
+ROWS = 8760
+
+
+def _savetxt(path: pathlib.Path, matrix: np.ndarray) -> None:
+    with open(path, mode="w") as f:
+        np.savetxt(f, matrix, delimiter="\t", fmt="%.6f")
+
+
+def _read_csv(path: pathlib.Path) -> np.ndarray:
+    with open(path, mode="rb") as f:
+        return t.cast(np.ndarray, pd.read_csv(f, sep="\t", header=None).to_numpy())
+
+
+def _best_time(func: t.Callable[[], t.Any], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def benchmark(columns: t.Sequence[int], repeat: int) -> None:
+    rng = np.random.default_rng(42)
+    print(
+        f"{'matrix':>12} | {'savetxt':>9} | {'write':>9} | {'speedup':>7} | {'read_csv':>9} | {'read':>9} | {'speedup':>7}"
+    )
+    print("-" * 80)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = pathlib.Path(tmp_dir)
+        fs = DiskFS(root)
+        for n in columns:
+            matrix = rng.normal(0, 1e4, size=(ROWS, n))
+            expected_path, actual_path = root / "expected.txt", root / "actual.txt"
+
+            savetxt_time = _best_time(lambda: _savetxt(expected_path, matrix), repeat)
+            write_time = _best_time(lambda: write_matrix(fs, "actual.txt", matrix), repeat)
+            if actual_path.read_bytes() != expected_path.read_bytes():
+                raise AssertionError(f"The files are different for a matrix of {n} columns")
+
+            read_csv_time = _best_time(lambda: _read_csv(expected_path), repeat)
+            read_time = _best_time(lambda: read_matrix(fs, "expected.txt"), repeat)
+
+            print(
+                f"{f'{ROWS}x{n}':>12} | {savetxt_time * 1000:7.1f}ms | {write_time * 1000:7.1f}ms"
+                f" | {savetxt_time / write_time:6.1f}x | {read_csv_time * 1000:7.1f}ms | {read_time * 1000:7.1f}ms"
+                f" | {read_csv_time / read_time:6.1f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--columns",
+        type=int,
+        nargs="+",
+        default=[1, 3, 8, 100],
+        help="Number of columns of the matrices (default: 1 3 8 100)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions (default: 5)")
+    args = parser.parse_args()
+    benchmark(args.columns, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Benchmark of the peak memory used to split a large matrix by columns.
+
+A large hourly matrix (8784 rows) is split into three files, like a link matrix,
+in each split mode and with several chunk sizes. Each split runs in a separate process,
+which reports its peak resident set size (RSS), measured with `resource.getrusage` (Unix only).
+"""
+
+import argparse
+import json
+import pathlib
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import typing as t
+
+ROWS = 8784
+
+
+def _peak_rss_mib() -> float:
+    # `ru_maxrss` is in kibibytes on Linux, in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_split(study_dir: str, mode: str, chunk_size: t.Optional[int]) -> None:
+    """Split the matrix (in a child process) and print the measures as JSON."""
+    from antares.study.version.fs import DiskFS
+    from antares.study.version.upgrade_app.matrix_split import split_matrix
+
+    fs = DiskFS(study_dir)
+    outputs = [("parameters.txt", slice(2, None)), ("direct.txt", 0), ("indirect.txt", 1)]
+    baseline = _peak_rss_mib()
+    start = time.perf_counter()
+    split_matrix(fs, "matrix.txt", outputs, mode=mode, chunk_size=chunk_size)
+    duration = time.perf_counter() - start
+    print(json.dumps({"baseline": baseline, "peak": _peak_rss_mib(), "duration": duration}))
+
+
+def benchmark(columns: int, chunk_sizes: t.Sequence[t.Optional[int]]) -> None:
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        matrix_path = pathlib.Path(tmp_dir) / "matrix.txt"
+        matrix = np.random.default_rng(42).normal(0, 1e4, size=(ROWS, columns))
+        np.savetxt(matrix_path, matrix, delimiter="\t", fmt="%.6f")
+        del matrix
+        file_size = matrix_path.stat().st_size / (1024 * 1024)
+        print(f"Matrix: {ROWS}x{columns} ({file_size:.1f} MiB)")
+        print(f"{'mode':>8} | {'chunk size':>10} | {'peak RSS':>10} | {'above baseline':>14} | {'duration':>8}")
+        print("-" * 64)
+        for mode in ["numeric", "text"]:
+            for chunk_size in chunk_sizes:
+                args = [sys.executable, __file__, "--run", tmp_dir, mode, str(chunk_size or 0)]
+                result = json.loads(subprocess.run(args, check=True, capture_output=True, text=True).stdout)
+                print(
+                    f"{mode:>8} | {chunk_size or 'whole':>10} | {result['peak']:7.1f}MiB"
+                    f" | {result['peak'] - result['baseline']:11.1f}MiB | {result['duration']:7.2f}s"
+                )
+
+
+def main() -> None:
+    if len(sys.argv) == 5 and sys.argv[1] == "--run":
+        run_split(sys.argv[2], sys.argv[3], int(sys.argv[4]) or None)
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--columns", type=int, default=500, help="Number of columns of the matrix (default: 500)")
+    parser.add_argument(
+        "--chunk-sizes",
+        type=int,
+        nargs="+",
+        default=[0, 4096, 512, 64],
+        help="Chunk sizes to compare, 0 for the whole matrix (default: 0 4096 512 64)",
+    )
+    args = parser.parse_args()
+    benchmark(args.columns, [size or None for size in args.chunk_sizes])
+
+
+if __name__ == "__main__":
+    main()
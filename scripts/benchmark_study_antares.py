@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Benchmark of the reading of the version of many studies.
+
+Compares `StudyAntares.from_ini_file(study_dir).version` (full parsing and validation of the
+`study.antares` file) to `read_study_version(study_dir)` (sniffing of the version only),
+on a fleet of generated study directories. The script also checks that both give the same versions.
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+import typing as t
+
+from antares.study.version.model.study_antares import STUDY_ANTARES_PATH, StudyAntares, read_study_version
+
+VERSIONS = ["700", "800", "8.6", "8.8", "9.2"]
+
+
+def _create_fleet(root: pathlib.Path, count: int) -> t.List[pathlib.Path]:
+    study_dirs = []
+    for index in range(count):
+        study_dir = root / f"study_{index:06d}"
+        study_dir.mkdir()
+        study_dir.joinpath(STUDY_ANTARES_PATH).write_text(
+            "[antares]\n"
+            f"version = {VERSIONS[index % len(VERSIONS)]}\n"
+            f"caption = Study {index}\n"
+            "created = 1246524135\n"
+            "lastsave = 1686128483\n"
+            "author = John Doe\n"
+        )
+        study_dirs.append(study_dir)
+    return study_dirs
+
+
+def _scan(func: t.Callable[[pathlib.Path], t.Any], study_dirs: t.Sequence[pathlib.Path]) -> t.Tuple[float, list]:
+    start = time.perf_counter()
+    results = [func(study_dir) for study_dir in study_dirs]
+    return time.perf_counter() - start, results
+
+
+def benchmark(count: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"Creating {count} studies...")
+        study_dirs = _create_fleet(pathlib.Path(tmp_dir), count)
+
+        # The first scan warms up the OS cache
+        _scan(read_study_version, study_dirs)
+
+        full_time, full_versions = min(
+            (_scan(lambda d: StudyAntares.from_ini_file(d).version, study_dirs) for _ in range(repeat)),
+            key=lambda r: r[0],
+        )
+        sniff_time, sniff_versions = min(
+            (_scan(read_study_version, study_dirs) for _ in range(repeat)), key=lambda r: r[0]
+        )
+        if full_versions != sniff_versions:
+            raise AssertionError("The versions are different")
+
+        print(f"{'method':>20} | {'total':>9} | {'per study':>10}")
+        print("-" * 46)
+        print(f"{'from_ini_file':>20} | {full_time:8.2f}s | {full_time / count * 1e6:8.1f}µs")
+        print(f"{'read_study_version':>20} | {sniff_time:8.2f}s | {sniff_time / count * 1e6:8.1f}µs")
+        print(f"Speedup: {full_time / sniff_time:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--studies", type=int, default=100_000, help="Number of studies (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions (default: 3)")
+    args = parser.parse_args()
+    benchmark(args.studies, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
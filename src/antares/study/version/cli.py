@@ -4,19 +4,36 @@ The CLI module for the study version.
 This module defines the following CLI commands:
 
 - antares-study-version show: display the details of a study in human-readable format (name, version, creation date, etc.)
+- antares-study-version show-all: display the details of all the studies found below some directories.
+- antares-study-version index: update the inventory index of the studies found below some directories.
+- antares-study-version query-index: display the details of the studies of an inventory index.
 - antares-study-version create: create a new study.
+- antares-study-version upgrade: upgrade a study to a new version.
+- antares-study-version normalize: move the matrices of a study into a matrix store, replacing them by links.
+- antares-study-version export-config: export the configuration of a study (its INI files) into a snapshot file.
+- antares-study-version import-config: write the INI files of a configuration snapshot into a study.
 """
 
+import typing as t
 from pathlib import Path
 
 import click
 
 from antares.study.version import StudyVersion
 from antares.study.version.__about__ import __date__, __version__
+from antares.study.version.config_app import ExportConfigApp, ImportConfigApp
+from antares.study.version.config_snapshot import SNAPSHOT_FORMATS
 from antares.study.version.create_app import CreateApp, available_versions
 from antares.study.version.exceptions import ApplicationError
+from antares.study.version.fs.export import HARDLINK, LINK_MODES
+from antares.study.version.inventory_app import IndexApp, QueryIndexApp, ShowAllApp
+from antares.study.version.inventory_app.scanner import JSON_FORMAT, OUTPUT_FORMATS
+from antares.study.version.matrix_store import MatrixStore
+from antares.study.version.normalize_app import NormalizeApp
 from antares.study.version.show_app import ShowApp
 from antares.study.version.upgrade_app import UpgradeApp
+from antares.study.version.upgrade_app.options import NUMERIC_SPLIT, SPLIT_MODES
+from antares.study.version.upgrade_app.transform_cache import DEFAULT_TRANSFORM_CACHE_SIZE, TransformCache
 
 INTERRUPTED_BY_THE_USER = "Operation interrupted by the user."
 
@@ -32,16 +49,22 @@ def cli() -> None:
 @cli.command()
 @click.argument(
     "study_dir",
-    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True),
+    type=click.Path(exists=True, file_okay=True, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--entities",
+    is_flag=True,
+    default=False,
+    help="Also display the number of areas, links, clusters, storages and binding constraints (slower).",
 )
-def show(study_dir: str) -> None:
+def show(study_dir: str, entities: bool) -> None:
     """
     Display the details of a study in human-readable format.
 
-    STUDY_DIR: The directory containing the study.
+    STUDY_DIR: The directory containing the study, or the ZIP archive of the study.
     """
     try:
-        app = ShowApp(Path(study_dir))
+        app = ShowApp(Path(study_dir), entities=entities)
     except (ValueError, FileNotFoundError) as e:
         click.echo(f"Error: {e}", err=True)
         raise click.Abort()
@@ -56,6 +79,166 @@ def show(study_dir: str) -> None:
         raise click.Abort()
 
 
+@cli.command("show-all")
+@click.argument(
+    "root_dirs",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--format",
+    "fmt",
+    default=JSON_FORMAT,
+    help="Output format ('csv' lists the available upgrades separated by spaces).",
+    show_default=True,
+    type=click.Choice(OUTPUT_FORMATS),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "max_workers",
+    default=None,
+    help="Maximum number of threads used to explore the directories (by default, depends on the number of CPUs).",
+    type=click.IntRange(min=1),
+)
+def show_all(root_dirs: t.Tuple[str, ...], fmt: str, max_workers: t.Optional[int]) -> None:
+    """
+    Display the details of all the studies found below some directories (caption, version, dates, author,
+    available upgrades).
+
+    The subdirectories of the studies are not explored. The studies are listed in no particular order.
+
+    ROOT_DIRS: The directories to explore.
+    """
+    try:
+        app = ShowAllApp([Path(root_dir) for root_dir in root_dirs], fmt=fmt, max_workers=max_workers)
+    except (ValueError, FileNotFoundError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    try:
+        app()
+    except ApplicationError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    except KeyboardInterrupt:
+        click.echo(INTERRUPTED_BY_THE_USER, err=True)
+        raise click.Abort()
+    click.echo(f"Found {app.count} studies", err=True)
+
+
+@cli.command("index")
+@click.argument(
+    "index_path",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, resolve_path=True),
+)
+@click.argument(
+    "root_dirs",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "max_workers",
+    default=None,
+    help="Maximum number of threads used to explore the directories (by default, depends on the number of CPUs).",
+    type=click.IntRange(min=1),
+)
+def index(index_path: str, root_dirs: t.Tuple[str, ...], max_workers: t.Optional[int]) -> None:
+    """
+    Update the inventory index of the studies found below some directories.
+
+    Only the studies whose 'study.antares' file changed since the last update are read again.
+
+    INDEX_PATH: Path of the SQLite database of the index (created if missing).
+
+    ROOT_DIRS: The directories to explore.
+    """
+    try:
+        app = IndexApp(Path(index_path), [Path(root_dir) for root_dir in root_dirs], max_workers=max_workers)
+    except (ValueError, FileNotFoundError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    try:
+        app()
+    except (ApplicationError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    except KeyboardInterrupt:
+        click.echo(INTERRUPTED_BY_THE_USER, err=True)
+        raise click.Abort()
+
+
+@cli.command("query-index")
+@click.argument(
+    "index_path",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, resolve_path=True),
+)
+@click.option(
+    "--below",
+    default=None,
+    help="Select the studies whose version is strictly lower than this version (e.g. '8.8').",
+)
+@click.option(
+    "--from",
+    "from_version",
+    default=None,
+    help="Select the studies whose version is greater than or equal to this version (e.g. '8.0').",
+)
+@click.option(
+    "--root",
+    "root_dir",
+    default=None,
+    help="Select the studies below this directory.",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--format",
+    "fmt",
+    default=JSON_FORMAT,
+    help="Output format ('csv' lists the available upgrades separated by spaces).",
+    show_default=True,
+    type=click.Choice(OUTPUT_FORMATS),
+)
+def query_index(
+    index_path: str,
+    below: t.Optional[str],
+    from_version: t.Optional[str],
+    root_dir: t.Optional[str],
+    fmt: str,
+) -> None:
+    """
+    Display the details of the studies of an inventory index (see the 'index' command).
+
+    INDEX_PATH: Path of the SQLite database of the index.
+    """
+    try:
+        app = QueryIndexApp(
+            Path(index_path),
+            below=StudyVersion.parse(below) if below else None,
+            from_version=StudyVersion.parse(from_version) if from_version else None,
+            root_dir=Path(root_dir) if root_dir else None,
+            fmt=fmt,
+        )
+    except (ValueError, FileNotFoundError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    try:
+        app()
+    except (ApplicationError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    except KeyboardInterrupt:
+        click.echo(INTERRUPTED_BY_THE_USER, err=True)
+        raise click.Abort()
+    click.echo(f"Found {app.count} studies", err=True)
+
+
 def _display_available_versions(ctx: click.Context, _param: click.Option, value: bool) -> None:
     if not value or ctx.resilient_parsing:
         return
@@ -123,7 +306,7 @@ def create(study_dir: str, caption: str, version: str, author: str) -> None:
 @cli.command()
 @click.argument(
     "study_dir",
-    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True),
+    type=click.Path(exists=True, file_okay=True, dir_okay=True, resolve_path=True),
 )
 @click.option(
     "-v",
@@ -133,14 +316,163 @@ def create(study_dir: str, caption: str, version: str, author: str) -> None:
     show_default=True,
     type=click.Choice(available_versions()),
 )
-def upgrade(study_dir: str, version: str) -> None:
+@click.option(
+    "-o",
+    "--output",
+    "output_path",
+    default=None,
+    help=(
+        "Path of the upgraded study (by default, the study is upgraded in place)."
+        " For a study directory, the upgraded study is built in this new directory, leaving the source untouched."
+    ),
+    type=click.Path(exists=False, file_okay=True, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--link-mode",
+    default=HARDLINK,
+    help="How the untouched files are shared between the source study and the output directory.",
+    show_default=True,
+    type=click.Choice(LINK_MODES),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "max_workers",
+    default=None,
+    help="Maximum number of threads used to transform the matrix files (by default, depends on the number of CPUs).",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--split-mode",
+    default=NUMERIC_SPLIT,
+    help=(
+        "How the matrix files are split by columns: 'numeric' writes the values with 6 decimals,"
+        " 'text' copies the values as is (faster and lossless)."
+    ),
+    show_default=True,
+    type=click.Choice(SPLIT_MODES),
+)
+@click.option(
+    "--chunk-size",
+    default=None,
+    help="Number of rows processed at once when a matrix file is split (by default, the whole matrix).",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--empty-defaults",
+    is_flag=True,
+    default=False,
+    help="Write empty files instead of the split matrix files whose values are all zeros (the default series).",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    help=(
+        "Directory of a persistent cache of the matrix transformations, shared between upgrades:"
+        " the matrices already transformed, in this study or in others, are not transformed again."
+    ),
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--cache-size",
+    default=DEFAULT_TRANSFORM_CACHE_SIZE // (1024 * 1024),
+    help="Maximum size of the cache directory, in MiB (the least recently used entries are evicted first).",
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--matrix-store",
+    "matrix_store",
+    default=None,
+    help="Directory of the matrix store used to resolve the matrix links ('*.txt.link' files) of the study.",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--metrics",
+    "metrics_format",
+    default=None,
+    help="Display the timing and I/O metrics of each upgrade step in the given format.",
+    type=click.Choice(["json"]),
+)
+def upgrade(
+    study_dir: str,
+    version: str,
+    output_path: t.Optional[str],
+    link_mode: str,
+    max_workers: t.Optional[int],
+    split_mode: str,
+    chunk_size: t.Optional[int],
+    empty_defaults: bool,
+    cache_dir: t.Optional[str],
+    cache_size: int,
+    matrix_store: t.Optional[str],
+    metrics_format: t.Optional[str],
+) -> None:
     """
     Upgrade a study to a new version.
 
-    STUDY_DIR: The directory containing the study to upgrade.
+    STUDY_DIR: The directory containing the study to upgrade, or the ZIP archive of the study.
     """
     try:
-        app = UpgradeApp(Path(study_dir), version=StudyVersion.parse(version))
+        app = UpgradeApp(
+            Path(study_dir),
+            version=StudyVersion.parse(version),
+            output_path=Path(output_path) if output_path else None,
+            link_mode=link_mode,
+            max_workers=max_workers,
+            split_mode=split_mode,
+            chunk_size=chunk_size,
+            empty_defaults=empty_defaults,
+            transform_cache=TransformCache(cache_dir, max_size=cache_size * 1024 * 1024) if cache_dir else None,
+            matrix_store=MatrixStore(matrix_store) if matrix_store else None,
+            collect_metrics=bool(metrics_format),
+        )
+    except (ValueError, FileNotFoundError, FileExistsError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    try:
+        app()
+    except ApplicationError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    except KeyboardInterrupt:
+        click.echo(INTERRUPTED_BY_THE_USER, err=True)
+        raise click.Abort()
+
+    if metrics_format == "json" and app.metrics is not None:
+        click.echo(app.metrics.to_json())
+    if app.transform_cache is not None:
+        info = app.transform_cache.cache_info()
+        click.echo(
+            f"Cache: {info.hits} hits, {info.misses} misses, {info.count} entries ({info.size} bytes)"
+            f", {info.evictions} evictions",
+            err=True,
+        )
+
+
+@cli.command()
+@click.argument(
+    "study_dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--matrix-store",
+    "matrix_store",
+    required=True,
+    help="Directory of the matrix store where the matrices are moved (created if missing).",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+)
+def normalize(study_dir: str, matrix_store: str) -> None:
+    """
+    Move the matrices of a study into a matrix store, replacing them by links.
+
+    Identical matrices are stored only once. Use the same matrix store to upgrade the study.
+
+    STUDY_DIR: The directory containing the study to normalize.
+    """
+    try:
+        app = NormalizeApp(Path(study_dir), matrix_store=MatrixStore(matrix_store))
     except (ValueError, FileNotFoundError) as e:
         click.echo(f"Error: {e}", err=True)
         raise click.Abort()
@@ -153,3 +485,99 @@ def upgrade(study_dir: str, version: str) -> None:
     except KeyboardInterrupt:
         click.echo(INTERRUPTED_BY_THE_USER, err=True)
         raise click.Abort()
+
+
+@cli.command("export-config")
+@click.argument(
+    "study_dir",
+    type=click.Path(exists=True, file_okay=True, dir_okay=True, resolve_path=True),
+)
+@click.argument(
+    "output_path",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, resolve_path=True),
+)
+@click.option(
+    "--format",
+    "fmt",
+    default=None,
+    help="Format of the snapshot file (by default, 'msgpack' for a '.msgpack' file, 'json' otherwise).",
+    type=click.Choice(SNAPSHOT_FORMATS),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "max_workers",
+    default=None,
+    help="Maximum number of threads used to read the INI files (by default, depends on the number of CPUs).",
+    type=click.IntRange(min=1),
+)
+def export_config(study_dir: str, output_path: str, fmt: t.Optional[str], max_workers: t.Optional[int]) -> None:
+    """
+    Export the configuration of a study (the content of all its INI files) into a single snapshot file.
+
+    STUDY_DIR: The directory containing the study, or the ZIP archive of the study.
+
+    OUTPUT_PATH: Path of the snapshot file.
+    """
+    try:
+        app = ExportConfigApp(Path(study_dir), Path(output_path), fmt=fmt, max_workers=max_workers)
+    except (ValueError, FileNotFoundError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    try:
+        app()
+    except (ApplicationError, ImportError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    except KeyboardInterrupt:
+        click.echo(INTERRUPTED_BY_THE_USER, err=True)
+        raise click.Abort()
+
+
+@cli.command("import-config")
+@click.argument(
+    "snapshot_path",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, resolve_path=True),
+)
+@click.argument(
+    "study_dir",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+)
+@click.option(
+    "--format",
+    "fmt",
+    default=None,
+    help="Format of the snapshot file (by default, 'msgpack' for a '.msgpack' file, 'json' otherwise).",
+    type=click.Choice(SNAPSHOT_FORMATS),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "max_workers",
+    default=None,
+    help="Maximum number of threads used to write the INI files (by default, depends on the number of CPUs).",
+    type=click.IntRange(min=1),
+)
+def import_config(snapshot_path: str, study_dir: str, fmt: t.Optional[str], max_workers: t.Optional[int]) -> None:
+    """
+    Write the INI files of a configuration snapshot into a study directory.
+
+    SNAPSHOT_PATH: Path of the snapshot file.
+
+    STUDY_DIR: The directory of the study (created if missing).
+    """
+    try:
+        app = ImportConfigApp(Path(snapshot_path), Path(study_dir), fmt=fmt, max_workers=max_workers)
+    except (ValueError, FileNotFoundError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    try:
+        app()
+    except (ApplicationError, ImportError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    except KeyboardInterrupt:
+        click.echo(INTERRUPTED_BY_THE_USER, err=True)
+        raise click.Abort()
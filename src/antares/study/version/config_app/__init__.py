@@ -0,0 +1,87 @@
+import dataclasses
+import typing as t
+from pathlib import Path
+
+from antares.study.version.config_snapshot import (
+    SNAPSHOT_FORMATS,
+    ConfigSnapshot,
+    export_config,
+    import_config,
+    load_snapshot,
+    save_snapshot,
+)
+from antares.study.version.fs import ZipFS, as_study_fs, is_zip_study
+
+
+@dataclasses.dataclass
+class ExportConfigApp:
+    """
+    Export the configuration of a study (the content of all its INI files) into a single snapshot file.
+
+    Attributes:
+        study_dir: The study directory, or the ZIP archive of the study.
+        output_path: Path of the snapshot file.
+        fmt: "json" or "msgpack", by default guessed from the extension of the output file.
+        max_workers: Maximum number of threads used to read the INI files.
+        snapshot: The last exported snapshot.
+    """
+
+    study_dir: Path
+    output_path: Path
+    fmt: t.Optional[str] = None
+    max_workers: t.Optional[int] = None
+    snapshot: t.Optional[ConfigSnapshot] = dataclasses.field(default=None, init=False)
+
+    def __post_init__(self):
+        self.study_dir = Path(self.study_dir)
+        self.output_path = Path(self.output_path)
+        if not self.study_dir.exists():
+            raise FileNotFoundError(f"Study directory not found: {self.study_dir}")
+        if self.fmt is not None and self.fmt not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Invalid snapshot format: {self.fmt!r}, expected one of {SNAPSHOT_FORMATS}")
+
+    def __call__(self, file: t.Optional[t.TextIO] = None) -> None:
+        fs = as_study_fs(self.study_dir)
+        try:
+            self.snapshot = snapshot = export_config(fs, max_workers=self.max_workers)
+        finally:
+            if isinstance(fs, ZipFS):
+                fs.close()
+        save_snapshot(snapshot, self.output_path, fmt=self.fmt)
+        print(f"Exported {len(snapshot.files)} INI files (hash: {snapshot.content_hash})", file=file)
+
+
+@dataclasses.dataclass
+class ImportConfigApp:
+    """
+    Write the INI files of a configuration snapshot into a study directory.
+
+    The content of the snapshot is checked against its hash before anything is written.
+
+    Attributes:
+        snapshot_path: Path of the snapshot file.
+        study_dir: The study directory (created if missing).
+        fmt: "json" or "msgpack", by default guessed from the extension of the snapshot file.
+        max_workers: Maximum number of threads used to write the INI files.
+    """
+
+    snapshot_path: Path
+    study_dir: Path
+    fmt: t.Optional[str] = None
+    max_workers: t.Optional[int] = None
+
+    def __post_init__(self):
+        self.snapshot_path = Path(self.snapshot_path)
+        self.study_dir = Path(self.study_dir)
+        if not self.snapshot_path.is_file():
+            raise FileNotFoundError(f"Snapshot file not found: {self.snapshot_path}")
+        if is_zip_study(self.study_dir):
+            raise ValueError(f"A configuration cannot be imported into a ZIP archive: {self.study_dir}")
+        if self.fmt is not None and self.fmt not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Invalid snapshot format: {self.fmt!r}, expected one of {SNAPSHOT_FORMATS}")
+
+    def __call__(self, file: t.Optional[t.TextIO] = None) -> None:
+        snapshot = load_snapshot(self.snapshot_path, fmt=self.fmt, verify=True)
+        self.study_dir.mkdir(parents=True, exist_ok=True)
+        import_config(snapshot, self.study_dir, max_workers=self.max_workers)
+        print(f"Imported {len(snapshot.files)} INI files (hash: {snapshot.content_hash})", file=file)
@@ -0,0 +1,207 @@
+"""
+Snapshots of the configuration of a study: all its INI files in a single JSON or msgpack file.
+
+The configuration of a study (general data, areas, links, clusters, binding constraints, hydro...)
+is spread over thousands of small INI files. Services which consume this configuration can read
+a snapshot instead: a single file, loaded with one sequential read, which contains the parsed
+sections of every INI file of the `settings` and `input` directories, and a hash of this content.
+
+Usage:
+
+>>> from antares.study.version.config_snapshot import export_config, import_config, load_snapshot, save_snapshot
+
+>>> snapshot = export_config("path/to/study")  # doctest: +SKIP
+>>> save_snapshot(snapshot, "config.json")  # doctest: +SKIP
+>>> snapshot = load_snapshot("config.json")  # doctest: +SKIP
+>>> snapshot.files["settings/generaldata.ini"]["general"]["nbyears"]  # doctest: +SKIP
+1
+>>> import_config(snapshot, "path/to/other/study")  # doctest: +SKIP
+"""
+
+import dataclasses
+import hashlib
+import json
+import typing as t
+from pathlib import Path
+
+from antares.study.version.fs import StudyDir, as_study_fs
+from antares.study.version.fs.base import parent_relpath
+from antares.study.version.ini_reader import IniReader
+from antares.study.version.ini_writer import IniWriter
+from antares.study.version.model.general_data import DUPLICATE_KEYS, GENERAL_DATA_PATH
+from antares.study.version.parallel import run_in_parallel
+
+JSON_FORMAT = "json"
+MSGPACK_FORMAT = "msgpack"
+SNAPSHOT_FORMATS = (JSON_FORMAT, MSGPACK_FORMAT)
+
+SNAPSHOT_VERSION = 1
+"""Version of the layout of the snapshot files."""
+
+CONFIG_DIRS = ("settings", "input")
+"""Directories whose INI files are part of the configuration."""
+
+_SPECIAL_KEYS: t.Dict[str, t.Sequence[str]] = {
+    GENERAL_DATA_PATH: DUPLICATE_KEYS,
+    "input/areas/sets.ini": ["+", "-"],
+}
+"""Duplicate keys of the INI files which have some (see `IniReader`)."""
+
+Sections = t.Dict[str, t.Dict[str, t.Any]]
+
+
+def compute_content_hash(files: t.Mapping[str, Sections]) -> str:
+    """Compute the SHA-256 hash of the content of a snapshot, independently of the order of the keys."""
+    content = json.dumps(files, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclasses.dataclass
+class ConfigSnapshot:
+    """
+    Configuration of a study: the parsed sections of its INI files.
+
+    Attributes:
+        files: For each INI file (relative path), its sections and options.
+        content_hash: SHA-256 hash of the content (see `compute_content_hash`).
+    """
+
+    files: t.Dict[str, Sections]
+    content_hash: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.content_hash:
+            self.content_hash = compute_content_hash(self.files)
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Return the dictionary representation of the snapshot, as saved in the snapshot files."""
+        return {"version": SNAPSHOT_VERSION, "content_hash": self.content_hash, "files": self.files}
+
+    @classmethod
+    def from_dict(cls, obj: t.Mapping[str, t.Any], verify: bool = False) -> "ConfigSnapshot":
+        """
+        Create a snapshot from its dictionary representation.
+
+        Args:
+            obj: The dictionary representation of the snapshot (see `to_dict`).
+            verify: Whether to check that the content matches the content hash.
+
+        Raises:
+            ValueError: If the snapshot layout is not supported, or if the content doesn't match the hash.
+        """
+        version = obj.get("version")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version!r}")
+        snapshot = cls(files=obj["files"], content_hash=obj["content_hash"])
+        if verify and compute_content_hash(snapshot.files) != snapshot.content_hash:
+            raise ValueError("The content of the snapshot doesn't match its hash")
+        return snapshot
+
+
+def list_config_files(study_dir: StudyDir) -> t.List[str]:
+    """List the INI files which are part of the configuration of a study, in alphabetical order."""
+    fs = as_study_fs(study_dir)
+    return [
+        relpath
+        for config_dir in CONFIG_DIRS
+        if fs.is_dir(config_dir)
+        for relpath, is_dir in fs.walk(config_dir)
+        if not is_dir and relpath.endswith(".ini")
+    ]
+
+
+def export_config(study_dir: StudyDir, max_workers: t.Optional[int] = None) -> ConfigSnapshot:
+    """
+    Read all the INI files of the configuration of a study, in parallel.
+
+    Args:
+        study_dir: The study directory, or the file system view of the study.
+        max_workers: Maximum number of threads used to read the files (see `run_in_parallel`).
+
+    Returns:
+        The snapshot of the configuration.
+    """
+    fs = as_study_fs(study_dir)
+    paths = list_config_files(fs)
+
+    def read(relpath: str) -> Sections:
+        return fs.read_ini(relpath, IniReader(special_keys=_SPECIAL_KEYS.get(relpath, ())))
+
+    return ConfigSnapshot(files=dict(zip(paths, run_in_parallel(read, paths, max_workers=max_workers))))
+
+
+def import_config(snapshot: ConfigSnapshot, study_dir: StudyDir, max_workers: t.Optional[int] = None) -> None:
+    """
+    Write the INI files of a snapshot into a study, creating the missing directories.
+
+    The existing INI files are overwritten, the other files of the study are left untouched.
+
+    Args:
+        snapshot: The snapshot of the configuration.
+        study_dir: The study directory, or the file system view of the study.
+        max_workers: Maximum number of threads used to write the files (see `run_in_parallel`).
+    """
+    fs = as_study_fs(study_dir)
+    for parent in sorted({parent_relpath(relpath) for relpath in snapshot.files}):
+        fs.mkdir(parent, parents=True, exist_ok=True)
+
+    def write(relpath: str) -> None:
+        fs.write_ini(relpath, snapshot.files[relpath], IniWriter(special_keys=list(_SPECIAL_KEYS.get(relpath, ()))))
+
+    run_in_parallel(write, list(snapshot.files), max_workers=max_workers)
+
+
+def _import_msgpack() -> t.Any:
+    try:
+        import msgpack  # type: ignore[import-not-found]
+    except ImportError:
+        raise ImportError("The 'msgpack' format requires the 'msgpack' package (pip install msgpack)") from None
+    return msgpack
+
+
+def _guess_format(path: Path) -> str:
+    return MSGPACK_FORMAT if path.suffix.lower() in {".msgpack", ".mpk"} else JSON_FORMAT
+
+
+def save_snapshot(snapshot: ConfigSnapshot, path: t.Union[str, Path], fmt: t.Optional[str] = None) -> None:
+    """
+    Save a snapshot into a file.
+
+    Args:
+        snapshot: The snapshot to save.
+        path: Path of the snapshot file.
+        fmt: "json" or "msgpack", by default guessed from the file extension (".msgpack" or ".mpk" for msgpack).
+    """
+    path = Path(path)
+    fmt = fmt or _guess_format(path)
+    if fmt == MSGPACK_FORMAT:
+        path.write_bytes(_import_msgpack().packb(snapshot.to_dict(), use_bin_type=True))
+    elif fmt == JSON_FORMAT:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(snapshot.to_dict(), f, ensure_ascii=False)
+    else:
+        raise ValueError(f"Invalid snapshot format: {fmt!r}, expected one of {SNAPSHOT_FORMATS}")
+
+
+def load_snapshot(path: t.Union[str, Path], fmt: t.Optional[str] = None, verify: bool = False) -> ConfigSnapshot:
+    """
+    Load a snapshot from a file, with one sequential read.
+
+    Args:
+        path: Path of the snapshot file.
+        fmt: "json" or "msgpack", by default guessed from the file extension.
+        verify: Whether to check that the content matches the content hash.
+
+    Raises:
+        ValueError: If the snapshot is invalid (see `ConfigSnapshot.from_dict`).
+    """
+    path = Path(path)
+    fmt = fmt or _guess_format(path)
+    data = path.read_bytes()
+    if fmt == MSGPACK_FORMAT:
+        obj = _import_msgpack().unpackb(data, raw=False)
+    elif fmt == JSON_FORMAT:
+        obj = json.loads(data)
+    else:
+        raise ValueError(f"Invalid snapshot format: {fmt!r}, expected one of {SNAPSHOT_FORMATS}")
+    return ConfigSnapshot.from_dict(obj, verify=verify)
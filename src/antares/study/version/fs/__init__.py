@@ -0,0 +1,19 @@
+"""
+File system views of a study, used by the upgraders to read and write the study files.
+"""
+
+from .base import DiskFS, StudyDir, StudyFS, as_study_fs  # noqa: F401
+from .overlay import IOStats, OverlayChanges, OverlayFS  # noqa: F401
+from .zip_fs import ZipFS, is_zip_study  # noqa: F401
+
+__all__ = (
+    "DiskFS",
+    "StudyDir",
+    "StudyFS",
+    "as_study_fs",
+    "IOStats",
+    "OverlayChanges",
+    "OverlayFS",
+    "ZipFS",
+    "is_zip_study",
+)
@@ -0,0 +1,326 @@
+"""
+File system views of a study.
+
+Upgraders read and write the files of a study through a :class:`StudyFS` object,
+using paths relative to the study directory, in POSIX format (e.g. "input/links/fr/de.txt").
+The empty string designates the study directory itself.
+"""
+
+import fnmatch
+import io
+import os
+import threading
+import typing as t
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+
+from antares.study.version.ini_reader import JSON, IniReader
+from antares.study.version.ini_writer import IniWriter
+
+StudyDir = t.Union[str, Path, "StudyFS"]
+"""A study directory, or a file system view of a study."""
+
+_MAGIC_CHARS = frozenset("*?[")
+
+_GENERATION_LOCK = threading.Lock()
+
+
+def normalize_relpath(relpath: t.Union[str, PurePosixPath]) -> str:
+    """
+    Normalize a relative path: use "/" as separator and remove "." components.
+
+    Args:
+        relpath: A path relative to the study directory.
+
+    Returns:
+        The normalized path, "" for the study directory itself.
+    """
+    posix = PurePosixPath(str(relpath).replace("\\", "/")).as_posix()
+    return "" if posix == "." else posix
+
+
+def join_relpath(parent: str, name: str) -> str:
+    """Join a relative path and a name."""
+    return f"{parent}/{name}" if parent else name
+
+
+def parent_relpath(relpath: str) -> str:
+    """Return the parent of a relative path ("" for the top level files and folders)."""
+    return relpath.rpartition("/")[0]
+
+
+class StudyFS(ABC):
+    """
+    File system view of a study.
+    """
+
+    generation: int = 0
+    """
+    Number of modifications made through this view: the objects derived from the content of the study
+    (e.g. the `StudyIndex`) compare it to know if they are up to date.
+    """
+
+    def _modified(self) -> None:
+        """Record a modification made through this view."""
+        with _GENERATION_LOCK:
+            self.generation += 1
+
+    # Query methods
+    # -------------
+
+    @abstractmethod
+    def exists(self, relpath: str) -> bool:
+        """Check if a file or a directory exists."""
+
+    @abstractmethod
+    def is_dir(self, relpath: str) -> bool:
+        """Check if a path is an existing directory."""
+
+    @abstractmethod
+    def is_file(self, relpath: str) -> bool:
+        """Check if a path is an existing file."""
+
+    @abstractmethod
+    def iterdir(self, relpath: str) -> t.List[str]:
+        """
+        List the names of the entries of a directory, in alphabetical order.
+
+        Raises:
+            FileNotFoundError: If the directory doesn't exist.
+            NotADirectoryError: If the path is not a directory.
+        """
+
+    @abstractmethod
+    def size(self, relpath: str) -> int:
+        """Return the size of a file in bytes."""
+
+    def glob(self, pattern: str) -> t.List[str]:
+        """
+        Find the relative paths matching a glob pattern, like `Path.glob` (without recursive "**" support).
+
+        Args:
+            pattern: A relative glob pattern, like "input/links/*/*.txt".
+
+        Returns:
+            List of matching relative paths.
+        """
+        parts = PurePosixPath(normalize_relpath(pattern)).parts
+        candidates = [""]
+        for index, part in enumerate(parts):
+            is_last = index == len(parts) - 1
+            matches = []
+            for parent in candidates:
+                if _MAGIC_CHARS.isdisjoint(part):
+                    child = join_relpath(parent, part)
+                    if self.exists(child):
+                        matches.append(child)
+                elif self.is_dir(parent):
+                    matches.extend(
+                        join_relpath(parent, name) for name in self.iterdir(parent) if fnmatch.fnmatch(name, part)
+                    )
+            candidates = matches if is_last else [p for p in matches if self.is_dir(p)]
+        return candidates
+
+    def walk(self, relpath: str = "") -> t.Iterator[t.Tuple[str, bool]]:
+        """
+        Iterate over the files and directories below a directory, parents first.
+
+        Args:
+            relpath: Path of the directory, the study directory by default.
+
+        Yields:
+            Tuples `(relpath, is_dir)`, in alphabetical order.
+        """
+        for name in self.iterdir(relpath):
+            child = join_relpath(relpath, name)
+            if self.is_dir(child):
+                yield child, True
+                yield from self.walk(child)
+            else:
+                yield child, False
+
+    # Reading and writing
+    # -------------------
+
+    @abstractmethod
+    def open(self, relpath: str, mode: str = "r", encoding: t.Optional[str] = None) -> t.IO[t.Any]:
+        """
+        Open a file for reading or writing.
+
+        Args:
+            relpath: Path of the file.
+            mode: One of "r", "rb", "w" or "wb".
+            encoding: Encoding of text files, UTF-8 by default.
+
+        Returns:
+            A file object.
+        """
+
+    @abstractmethod
+    def mkdir(self, relpath: str, parents: bool = False, exist_ok: bool = False) -> None:
+        """Create a directory, like `Path.mkdir`."""
+
+    @abstractmethod
+    def touch(self, relpath: str) -> None:
+        """Create an empty file if it doesn't exist, like `Path.touch`."""
+
+    @abstractmethod
+    def unlink(self, relpath: str) -> None:
+        """Remove a file, like `Path.unlink`."""
+
+    def read_bytes(self, relpath: str) -> bytes:
+        with self.open(relpath, "rb") as f:
+            return t.cast(bytes, f.read())
+
+    def write_bytes(self, relpath: str, data: bytes) -> None:
+        with self.open(relpath, "wb") as f:
+            f.write(data)
+
+    def read_text(self, relpath: str, encoding: t.Optional[str] = None) -> str:
+        """
+        Read a text file, using UTF-8 encoding by default.
+
+        On Windows, files may use "cp1252" encoding: it is used as a fallback.
+        """
+        data = self.read_bytes(relpath)
+        if encoding:
+            return data.decode(encoding)
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            return data.decode("cp1252")
+
+    def write_text(self, relpath: str, text: str, encoding: t.Optional[str] = None) -> None:
+        with self.open(relpath, "w", encoding=encoding) as f:
+            f.write(text)
+
+    def read_ini(self, relpath: str, reader: t.Optional[IniReader] = None) -> JSON:
+        """
+        Parse an INI file, an empty dictionary is returned if the file is missing.
+
+        Args:
+            relpath: Path of the INI file.
+            reader: The reader to use, by default a standard `IniReader`.
+        """
+        reader = reader or IniReader()
+        try:
+            text = self.read_text(relpath)
+        except FileNotFoundError:
+            return {}
+        return reader.read(io.StringIO(text))
+
+    def write_ini(self, relpath: str, data: JSON, writer: t.Optional[IniWriter] = None) -> None:
+        """
+        Write an INI file.
+
+        Args:
+            relpath: Path of the INI file.
+            data: Sections and options to write.
+            writer: The writer to use, by default a standard `IniWriter`.
+        """
+        writer = writer or IniWriter()
+        with self.open(relpath, "w") as f:
+            writer.write(data, f)
+
+
+class DiskFS(StudyFS):
+    """
+    File system view of a study stored in a directory.
+
+    Args:
+        root: The study directory.
+        cache_listings: Whether to cache the directory listings (see `ListingCache`): the queries
+            (`exists`, `is_dir`, `iterdir`, `glob`...) are answered from a single scan of each directory.
+            The changes made through this object invalidate the cache, but the changes made by
+            other means are not seen.
+    """
+
+    def __init__(self, root: t.Union[str, Path], cache_listings: bool = False) -> None:
+        from .listing import ListingCache
+
+        self.root = Path(root)
+        self.listings: t.Optional[ListingCache] = ListingCache(self.root) if cache_listings else None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.root)!r})"
+
+    def path(self, relpath: str) -> Path:
+        """Return the absolute path of a file or directory."""
+        relpath = normalize_relpath(relpath)
+        return self.root.joinpath(relpath) if relpath else self.root
+
+    def exists(self, relpath: str) -> bool:
+        if self.listings is not None:
+            return self.listings.kind(relpath) is not None
+        return self.path(relpath).exists()
+
+    def is_dir(self, relpath: str) -> bool:
+        if self.listings is not None:
+            return self.listings.kind(relpath) is True
+        return self.path(relpath).is_dir()
+
+    def is_file(self, relpath: str) -> bool:
+        if self.listings is not None:
+            return self.listings.kind(relpath) is False
+        return self.path(relpath).is_file()
+
+    def iterdir(self, relpath: str) -> t.List[str]:
+        if self.listings is not None:
+            listing = self.listings.listing(relpath)
+            if listing is None:
+                if self.listings.kind(relpath) is False:
+                    raise NotADirectoryError(f"Not a directory: '{relpath}'")
+                raise FileNotFoundError(f"Directory not found: '{relpath}'")
+            return sorted(listing)
+        return sorted(os.listdir(self.path(relpath)))
+
+    def size(self, relpath: str) -> int:
+        return self.path(relpath).stat().st_size
+
+    def open(self, relpath: str, mode: str = "r", encoding: t.Optional[str] = None) -> t.IO[t.Any]:
+        if "b" in mode:
+            file = open(self.path(relpath), mode)
+        else:
+            file = open(self.path(relpath), mode, encoding=encoding or "utf-8")
+        if "w" in mode:
+            self._invalidate(relpath)
+        return file
+
+    def mkdir(self, relpath: str, parents: bool = False, exist_ok: bool = False) -> None:
+        self.path(relpath).mkdir(parents=parents, exist_ok=exist_ok)
+        self._invalidate(relpath, parents=parents)
+
+    def touch(self, relpath: str) -> None:
+        self.path(relpath).touch()
+        self._invalidate(relpath)
+
+    def unlink(self, relpath: str) -> None:
+        self.path(relpath).unlink()
+        self._invalidate(relpath)
+
+    def _invalidate(self, relpath: str, parents: bool = False) -> None:
+        """Forget the cached listings changed by the creation or removal of a path (and of its parents)."""
+        self._modified()
+        if self.listings is None:
+            return
+        relpath = normalize_relpath(relpath)
+        while relpath:
+            self.listings.invalidate(relpath)
+            relpath = parent_relpath(relpath) if parents else ""
+
+
+def as_study_fs(study_dir: StudyDir) -> StudyFS:
+    """
+    Return a file system view of a study.
+
+    Args:
+        study_dir: A study directory, a ZIP archive of a study,
+            or a file system view which is returned as is.
+    """
+    from .zip_fs import ZipFS, is_zip_study
+
+    if isinstance(study_dir, StudyFS):
+        return study_dir
+    if is_zip_study(study_dir):
+        return ZipFS(study_dir)
+    return DiskFS(study_dir)
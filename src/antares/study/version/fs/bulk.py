@@ -0,0 +1,189 @@
+"""
+Batched execution of file system operations in a directory tree.
+
+The upgraders create many directories and (mostly empty) files: two directories and two files
+per area, two cost files per thermal cluster, five cost matrices per storage...
+On a network file system, applying these changes one path at a time is dominated by
+the metadata round-trips (path resolution, existence checks).
+
+The :class:`BulkExecutor` collects the operations and runs them in batches:
+
+- the directories are created once (duplicates are ignored), level by level;
+- the operations are grouped by parent directory: each directory is opened once, and the entries
+  are created or removed relative to its file descriptor (`dir_fd`), without resolving the full path
+  again, and without checking the existence of the entries beforehand;
+- the directories of a level, or their entries, are processed in parallel.
+"""
+
+import collections
+import errno
+import os
+import shutil
+import typing as t
+from pathlib import Path
+
+from antares.study.version.parallel import run_in_parallel
+
+from .base import normalize_relpath
+
+FileContent = t.Union[bytes, Path]
+"""Content of a file to write: the bytes, or the path of a file to move."""
+
+_SUPPORTS_DIR_FD = {os.open, os.mkdir, os.unlink, os.rename} <= os.supports_dir_fd
+"""Whether the platform supports the operations relative to a directory file descriptor (not on Windows)."""
+
+_MKDIR, _WRITE, _UNLINK = "mkdir", "write", "unlink"
+
+_O_DIRECTORY = getattr(os, "O_DIRECTORY", 0)
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+class _Dir:
+    """
+    A directory in which entries are created or removed, relative to its file descriptor when possible.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.fd: t.Optional[int] = os.open(path, os.O_RDONLY | _O_DIRECTORY) if _SUPPORTS_DIR_FD else None
+
+    def __enter__(self) -> "_Dir":
+        return self
+
+    def __exit__(self, *exc: t.Any) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+
+    def _target(self, name: str) -> t.Union[str, Path]:
+        return name if self.fd is not None else self.path / name
+
+    def mkdir(self, name: str) -> None:
+        try:
+            os.mkdir(self._target(name), dir_fd=self.fd)
+        except FileExistsError:
+            pass
+
+    def unlink(self, name: str) -> None:
+        try:
+            os.unlink(self._target(name), dir_fd=self.fd)
+        except FileNotFoundError:
+            pass
+
+    def write(self, name: str, content: FileContent) -> None:
+        # The existing file is removed first: a hard link to this file (e.g. a backup) is preserved
+        self.unlink(name)
+        if isinstance(content, Path):
+            try:
+                os.rename(content, self._target(name), dst_dir_fd=self.fd)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # The file is on another device: it is copied
+                shutil.move(str(content), self.path / name)
+            return
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY
+        fd = os.open(self._target(name), flags, 0o666, dir_fd=self.fd)
+        with open(fd, mode="wb") as f:
+            if content:
+                f.write(content)
+
+
+class BulkExecutor:
+    """
+    Collect file system operations in a directory tree, and run them in batches.
+
+    The operations are run by `run`, in this order: the directories are created (parents first),
+    then the files are written, then the files are removed.
+
+    Args:
+        root: The root directory of the tree.
+        max_workers: Maximum number of threads (see `run_in_parallel`).
+            With one worker, the operations are run sequentially.
+    """
+
+    def __init__(self, root: t.Union[str, Path], max_workers: t.Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.max_workers = max_workers
+        self._dirs: t.Set[str] = set()
+        self._files: t.Dict[str, FileContent] = {}
+        self._deleted: t.Set[str] = set()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.root)!r})"
+
+    def __len__(self) -> int:
+        """Number of pending operations."""
+        return len(self._dirs) + len(self._files) + len(self._deleted)
+
+    def mkdir(self, relpath: str) -> None:
+        """
+        Queue the creation of a directory (nothing is done if it already exists).
+
+        The parent directory must exist, or be queued too.
+        """
+        self._dirs.add(normalize_relpath(relpath))
+
+    def write(self, relpath: str, content: FileContent) -> None:
+        """
+        Queue the writing of a file, replacing the existing file if any.
+
+        Args:
+            relpath: Relative path of the file.
+            content: The content of the file, or the path of a file to move (e.g. a spilled file).
+        """
+        relpath = normalize_relpath(relpath)
+        self._deleted.discard(relpath)
+        self._files[relpath] = content
+
+    def touch(self, relpath: str) -> None:
+        """Queue the creation of an empty file, replacing the existing file if any."""
+        self.write(relpath, b"")
+
+    def unlink(self, relpath: str) -> None:
+        """Queue the removal of a file (nothing is done if it doesn't exist)."""
+        relpath = normalize_relpath(relpath)
+        self._files.pop(relpath, None)
+        self._deleted.add(relpath)
+
+    def run(self) -> None:
+        """
+        Run the pending operations.
+
+        Raises:
+            OSError: If an operation fails (the first failure is raised, once the running batches are done).
+        """
+        dirs_by_level: t.Dict[int, t.List[str]] = collections.defaultdict(list)
+        for relpath in self._dirs:
+            dirs_by_level[relpath.count("/")].append(relpath)
+        for level in sorted(dirs_by_level):
+            self._run_by_parent([(_MKDIR, relpath, b"") for relpath in sorted(dirs_by_level[level])])
+        self._run_by_parent(
+            [
+                *((_WRITE, relpath, content) for relpath, content in sorted(self._files.items())),
+                *((_UNLINK, relpath, b"") for relpath in sorted(self._deleted)),
+            ]
+        )
+        self._dirs.clear()
+        self._files.clear()
+        self._deleted.clear()
+
+    def _run_by_parent(self, operations: t.Sequence[t.Tuple[str, str, FileContent]]) -> None:
+        """
+        Run operations `(operation, relpath, content)`, grouped by parent directory, in parallel.
+        """
+        by_parent: t.Dict[str, t.List[t.Tuple[str, str, FileContent]]] = collections.defaultdict(list)
+        for operation, relpath, content in operations:
+            parent, _, name = relpath.rpartition("/")
+            by_parent[parent].append((operation, name, content))
+
+        def run_in_dir(parent: str) -> None:
+            with _Dir(self.root / parent) as directory:
+                for operation, name, content in by_parent[parent]:
+                    if operation == _MKDIR:
+                        directory.mkdir(name)
+                    elif operation == _WRITE:
+                        directory.write(name, content)
+                    else:
+                        directory.unlink(name)
+
+        run_in_parallel(run_in_dir, list(by_parent), max_workers=self.max_workers)
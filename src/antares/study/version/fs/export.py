@@ -0,0 +1,135 @@
+"""
+Build an upgraded copy of a study in a new directory.
+
+The files which are not modified by the upgrade are shared with the source study
+(hard links or reflinks, when the file system supports them), so that building the copy
+is cheap: only the modified and new files are really written.
+"""
+
+import dataclasses
+import logging
+import os
+import shutil
+import typing as t
+from pathlib import Path
+
+from .base import DiskFS
+from .overlay import OverlayChanges, apply_changes
+
+logger = logging.getLogger(__name__)
+
+HARDLINK = "hardlink"
+REFLINK = "reflink"
+COPY = "copy"
+
+LINK_MODES = (HARDLINK, REFLINK, COPY)
+"""Ways to share the untouched files with the source study, from the cheapest to the most expensive."""
+
+_FICLONE = 0x40049409  # Linux `ioctl` request to clone a file (Btrfs, XFS...)
+
+
+def _hardlink(src_path: Path, dst_path: Path) -> None:
+    os.link(src_path, dst_path)
+
+
+def _reflink(src_path: Path, dst_path: Path) -> None:
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(f"Reflinks are not supported on this platform: '{src_path}'") from None
+
+    try:
+        with open(src_path, mode="rb") as src, open(dst_path, mode="wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        dst_path.unlink(missing_ok=True)
+        raise
+    shutil.copystat(src_path, dst_path)
+
+
+def _copy(src_path: Path, dst_path: Path) -> None:
+    shutil.copy2(src_path, dst_path)
+
+
+_SHARING_FUNCTIONS: t.Dict[str, t.Callable[[Path, Path], None]] = {
+    HARDLINK: _hardlink,
+    REFLINK: _reflink,
+    COPY: _copy,
+}
+
+
+@dataclasses.dataclass
+class ExportSummary:
+    """
+    Summary of the export of a study.
+
+    Attributes:
+        shared: Number of untouched files, by sharing mode ("hardlink", "reflink" or "copy").
+        written: Number of files written (modified or created by the upgrade).
+    """
+
+    shared: t.Dict[str, int] = dataclasses.field(default_factory=lambda: dict.fromkeys(LINK_MODES, 0))
+    written: int = 0
+
+
+def export_study(
+    lower: DiskFS,
+    changes: OverlayChanges,
+    target_dir: Path,
+    link_mode: str = HARDLINK,
+    max_workers: t.Optional[int] = None,
+) -> ExportSummary:
+    """
+    Build a copy of a study with the given changes applied, leaving the source study untouched.
+
+    The untouched files are shared with the source study using the given mode, falling back
+    to the next mode of `LINK_MODES` when the file system doesn't support it (e.g. hard links across
+    devices, or reflinks on ext4). The modified and new files are always written as new files,
+    so the files of the source study are never modified through a shared inode.
+
+    Args:
+        lower: The file system of the source study.
+        changes: The changes to apply.
+        target_dir: The directory of the new study, which must not exist.
+        link_mode: One of "hardlink", "reflink" or "copy".
+        max_workers: Maximum number of threads used to write the changes (see `apply_changes`).
+
+    Returns:
+        The summary of the export.
+
+    Raises:
+        ValueError: If the link mode is unknown.
+        FileExistsError: If the target directory already exists.
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"Invalid link mode '{link_mode}', expected one of {LINK_MODES}")
+    modes = list(LINK_MODES[LINK_MODES.index(link_mode) :])
+    replaced = set(changes.files) | set(changes.deleted)
+    summary = ExportSummary()
+
+    target_dir.mkdir()
+    for relpath, is_dir in lower.walk():
+        dst_path = target_dir / relpath
+        if is_dir:
+            dst_path.mkdir()
+            continue
+        if relpath in replaced:
+            continue
+        src_path = lower.path(relpath)
+        while True:
+            mode = modes[0]
+            try:
+                _SHARING_FUNCTIONS[mode](src_path, dst_path)
+            except OSError as e:
+                if len(modes) == 1:
+                    raise
+                # The file system doesn't support this mode: don't try it again for the next files
+                logger.debug(f"Cannot {mode} '{src_path}' ({e}), falling back to {modes[1]}")
+                modes.pop(0)
+            else:
+                summary.shared[mode] += 1
+                break
+
+    apply_changes(changes, target_dir, max_workers=max_workers)
+    summary.written = len(changes.files)
+    return summary
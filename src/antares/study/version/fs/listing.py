@@ -0,0 +1,139 @@
+"""
+Cache of the directory listings of a study.
+
+The upgraders explore the same directories again and again (`glob`, `iterdir`, `is_dir`, `exists`):
+"input/areas/*", "input/links/*", "input/thermal/clusters/*"... On a network file system,
+each of these queries is a metadata round-trip.
+
+The :class:`ListingCache` reads each directory once, with `os.scandir`, which gives the type
+of the entries without an additional `stat` call. All the queries on a path are then answered
+from the listing of its parent directory: the number of round-trips is proportional to the number
+of directories explored, not to the number of queries.
+"""
+
+import dataclasses
+import os
+import threading
+import typing as t
+from pathlib import Path
+
+from .base import normalize_relpath, parent_relpath
+
+Listing = t.Dict[str, bool]
+"""Entries of a directory: the name of each entry, and whether it is a directory."""
+
+
+@dataclasses.dataclass
+class ListingCacheInfo:
+    """
+    Statistics of the listing cache.
+
+    Attributes:
+        hits: Number of queries answered from the cache.
+        scans: Number of directories read from the disk.
+    """
+
+    hits: int = 0
+    scans: int = 0
+
+
+class ListingCache:
+    """
+    Cache of the directory listings below a root directory.
+
+    The cache must be invalidated when files or directories are created or removed
+    (see `invalidate`): this is done by `DiskFS` for the changes it makes itself.
+
+    Args:
+        root: The root directory.
+    """
+
+    def __init__(self, root: t.Union[str, Path]) -> None:
+        self.root = Path(root)
+        self._listings: t.Dict[str, t.Optional[Listing]] = {}
+        self._info = ListingCacheInfo()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.root)!r})"
+
+    def listing(self, relpath: str) -> t.Optional[Listing]:
+        """
+        Return the entries of a directory.
+
+        Args:
+            relpath: Relative path of the directory.
+
+        Returns:
+            The entries of the directory, or `None` if the path is not an existing directory.
+        """
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if relpath in self._listings:
+                self._info.hits += 1
+                return self._listings[relpath]
+        # The parent listing tells if the directory exists: missing directories are not scanned
+        if relpath and self.lookup(parent_relpath(relpath), relpath.rpartition("/")[2]) is not True:
+            listing = None
+        else:
+            listing = self._scan(relpath)
+        with self._lock:
+            self._listings[relpath] = listing
+        return listing
+
+    def lookup(self, parent: str, name: str) -> t.Optional[bool]:
+        """
+        Return the type of an entry of a directory.
+
+        Args:
+            parent: Relative path of the directory.
+            name: Name of the entry.
+
+        Returns:
+            `True` for a directory, `False` for a file, `None` if the entry doesn't exist.
+        """
+        listing = self.listing(parent)
+        return None if listing is None else listing.get(name)
+
+    def kind(self, relpath: str) -> t.Optional[bool]:
+        """
+        Return the type of a path: `True` for a directory, `False` for a file, `None` if it doesn't exist.
+        """
+        relpath = normalize_relpath(relpath)
+        if not relpath:
+            return True if self.root.is_dir() else None
+        parent, _, name = relpath.rpartition("/")
+        return self.lookup(parent, name)
+
+    def invalidate(self, relpath: str) -> None:
+        """
+        Forget the listings which may be changed by the creation or removal of a path:
+        the listing of its parent directory, and the listings of the path and of its subdirectories.
+        """
+        relpath = normalize_relpath(relpath)
+        prefix = f"{relpath}/"
+        with self._lock:
+            self._listings.pop(parent_relpath(relpath), None)
+            for key in [key for key in self._listings if key == relpath or key.startswith(prefix)]:
+                del self._listings[key]
+
+    def clear(self) -> None:
+        """Forget all the listings."""
+        with self._lock:
+            self._listings.clear()
+
+    def cache_info(self) -> ListingCacheInfo:
+        """Return the statistics of the cache."""
+        with self._lock:
+            return dataclasses.replace(self._info)
+
+    def _scan(self, relpath: str) -> t.Optional[Listing]:
+        try:
+            with os.scandir(self.root.joinpath(relpath) if relpath else self.root) as it:
+                # Like `Path.is_dir`, the symbolic links are followed
+                listing = {entry.name: entry.is_dir() for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            listing = None
+        with self._lock:
+            self._info.scans += 1
+        return listing
@@ -0,0 +1,442 @@
+"""
+In-memory overlay of a study file system.
+
+The :class:`OverlayFS` class is used to perform a whole chain of upgrades without touching the disk:
+reads fall back to the underlying file system, while writes, created directories and deletions
+are kept in memory (up to a configurable budget, beyond which the files are spilled in a temporary
+directory). Once all the upgraders are done, the final state is written once to the disk.
+
+The I/O performed through an overlay (files read, files written in memory, directories created)
+can be counted in an :class:`IOStats` object, see `OverlayFS.io_stats`.
+"""
+
+import dataclasses
+import io
+import os
+import shutil
+import tempfile
+import threading
+import typing as t
+from pathlib import Path
+
+from .base import StudyFS, normalize_relpath, parent_relpath
+from .bulk import BulkExecutor, FileContent
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+"""Default amount of memory (in bytes) used to store the modified files before spilling them to disk."""
+
+
+def read_content(content: FileContent) -> bytes:
+    """Return the bytes of a modified file."""
+    return content if isinstance(content, bytes) else content.read_bytes()
+
+
+@dataclasses.dataclass
+class IOStats:
+    """
+    I/O counters of a file system view, or of a set of changes.
+
+    Attributes:
+        files_read: Number of files opened for reading.
+        files_written: Number of files written.
+        bytes_read: Size of the files opened for reading.
+        bytes_written: Size of the files written.
+        dirs_created: Number of directories created.
+    """
+
+    files_read: int = 0
+    files_written: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    dirs_created: int = 0
+
+    def __add__(self, other: "IOStats") -> "IOStats":
+        return IOStats(*(getattr(self, f.name) + getattr(other, f.name) for f in dataclasses.fields(self)))
+
+    def __sub__(self, other: "IOStats") -> "IOStats":
+        return IOStats(*(getattr(self, f.name) - getattr(other, f.name) for f in dataclasses.fields(self)))
+
+
+@dataclasses.dataclass
+class OverlayChanges:
+    """
+    Changes to apply to the underlying file system.
+
+    Attributes:
+        dirs: Directories to create, parents first.
+        files: Files to write (created or modified) with their new content.
+        deleted: Files to remove.
+    """
+
+    dirs: t.List[str] = dataclasses.field(default_factory=list)
+    files: t.Dict[str, FileContent] = dataclasses.field(default_factory=dict)
+    deleted: t.List[str] = dataclasses.field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.dirs or self.files or self.deleted)
+
+    def io_stats(self) -> IOStats:
+        """Count the files and the directories written when the changes are applied."""
+        return IOStats(
+            files_written=len(self.files),
+            bytes_written=sum(_content_size(content) for content in self.files.values()),
+            dirs_created=len(self.dirs),
+        )
+
+
+def _content_size(content: FileContent) -> int:
+    return len(content) if isinstance(content, bytes) else content.stat().st_size
+
+
+class _OverlayWriter(io.RawIOBase):
+    """
+    Writable binary stream which stores its content in the overlay when it is closed.
+
+    The content is buffered in memory, unless it exceeds the memory budget left in the overlay:
+    in that case, it is spilled to a file and the next writes go directly to this file,
+    so that a large file never needs to be entirely held in memory.
+    """
+
+    def __init__(self, overlay: "OverlayFS", relpath: str) -> None:
+        super().__init__()
+        self._overlay = overlay
+        self._relpath = relpath
+        self._buffer: t.Optional[io.BytesIO] = io.BytesIO()
+        self._spill_path: t.Optional[Path] = None
+        self._spill_file: t.Optional[t.BinaryIO] = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: t.Any) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if self._spill_file is not None:
+            return self._spill_file.write(data)
+        buffer = t.cast(io.BytesIO, self._buffer)
+        count = buffer.write(data)
+        if buffer.tell() > self._overlay.memory_budget - self._overlay.memory_used:
+            self._spill_path, self._spill_file = self._overlay._open_spill_file()
+            self._spill_file.write(buffer.getbuffer())
+            self._buffer = None
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                if self._spill_file is not None:
+                    self._spill_file.close()
+                    self._overlay._store(self._relpath, t.cast(Path, self._spill_path))
+                else:
+                    self._overlay._store(self._relpath, t.cast(io.BytesIO, self._buffer).getvalue())
+            finally:
+                self._buffer = None
+                super().close()
+
+
+class OverlayFS(StudyFS):
+    """
+    Overlay file system keeping every modification in memory.
+
+    Args:
+        lower: The file system used to read the files which are not modified.
+        memory_budget: Amount of memory (in bytes) used to store the content of the modified files.
+            Beyond this budget, files are spilled in `spill_dir`.
+        spill_dir: Directory used to store the files which don't fit in memory.
+            By default, a temporary directory is created when needed.
+
+    Attributes:
+        io_stats: The I/O counters of the overlay, `None` (the default) to disable the counting.
+    """
+
+    def __init__(
+        self,
+        lower: StudyFS,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: t.Optional[Path] = None,
+    ) -> None:
+        self.lower = lower
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.memory_used = 0
+        self._files: t.Dict[str, FileContent] = {}
+        self._dirs: t.Set[str] = set()
+        self._deleted: t.Set[str] = set()
+        self._children: t.Dict[str, t.Set[str]] = {}
+        self._spill_count = 0
+        self._lock = threading.RLock()
+        self.io_stats: t.Optional[IOStats] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.lower!r})"
+
+    # Query methods
+    # -------------
+
+    def exists(self, relpath: str) -> bool:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if relpath in self._files or relpath in self._dirs:
+                return True
+            if relpath in self._deleted:
+                return False
+        return self.lower.exists(relpath)
+
+    def is_dir(self, relpath: str) -> bool:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if relpath in self._dirs:
+                return True
+            if relpath in self._files or relpath in self._deleted:
+                return False
+        return self.lower.is_dir(relpath)
+
+    def is_file(self, relpath: str) -> bool:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if relpath in self._files:
+                return True
+            if relpath in self._dirs or relpath in self._deleted:
+                return False
+        return self.lower.is_file(relpath)
+
+    def iterdir(self, relpath: str) -> t.List[str]:
+        relpath = normalize_relpath(relpath)
+        if not self.is_dir(relpath):
+            if self.exists(relpath):
+                raise NotADirectoryError(f"Not a directory: '{relpath}'")
+            raise FileNotFoundError(f"Directory not found: '{relpath}'")
+        names = set(self.lower.iterdir(relpath)) if self.lower.is_dir(relpath) else set()
+        prefix = f"{relpath}/" if relpath else ""
+        with self._lock:
+            names = {name for name in names if f"{prefix}{name}" not in self._deleted}
+            names.update(self._children.get(relpath, ()))
+        return sorted(names)
+
+    def size(self, relpath: str) -> int:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            content = self._files.get(relpath)
+            if content is None and relpath in self._deleted:
+                raise FileNotFoundError(f"File not found: '{relpath}'")
+        if content is None:
+            return self.lower.size(relpath)
+        return _content_size(content)
+
+    # Reading and writing
+    # -------------------
+
+    def open(self, relpath: str, mode: str = "r", encoding: t.Optional[str] = None) -> t.IO[t.Any]:
+        relpath = normalize_relpath(relpath)
+        if mode in {"r", "rb"}:
+            with self._lock:
+                content = self._files.get(relpath)
+                if content is None and relpath in self._deleted:
+                    raise FileNotFoundError(f"File not found: '{relpath}'")
+            if self.io_stats is not None:
+                size = self.lower.size(relpath) if content is None else _content_size(content)
+                with self._lock:
+                    self.io_stats.files_read += 1
+                    self.io_stats.bytes_read += size
+            if content is None:
+                return self.lower.open(relpath, mode, encoding=encoding)
+            stream: t.IO[bytes] = io.BytesIO(content) if isinstance(content, bytes) else content.open("rb")
+        elif mode in {"w", "wb"}:
+            if self.is_dir(relpath):
+                raise IsADirectoryError(f"Is a directory: '{relpath}'")
+            if not self.is_dir(parent_relpath(relpath)):
+                raise FileNotFoundError(f"Parent directory not found: '{relpath}'")
+            stream = io.BufferedWriter(_OverlayWriter(self, relpath))
+        else:
+            raise ValueError(f"Unsupported mode: '{mode}'")
+        if "b" in mode:
+            return stream
+        return io.TextIOWrapper(t.cast(t.BinaryIO, stream), encoding=encoding or "utf-8")
+
+    def mkdir(self, relpath: str, parents: bool = False, exist_ok: bool = False) -> None:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if self.exists(relpath):
+                if exist_ok and self.is_dir(relpath):
+                    return
+                raise FileExistsError(f"File exists: '{relpath}'")
+            parent = parent_relpath(relpath)
+            if not self.is_dir(parent):
+                if not parents:
+                    raise FileNotFoundError(f"Parent directory not found: '{relpath}'")
+                self.mkdir(parent, parents=True, exist_ok=True)
+            self._dirs.add(relpath)
+            self._children.setdefault(parent, set()).add(relpath.rpartition("/")[2])
+            if self.io_stats is not None:
+                self.io_stats.dirs_created += 1
+            self._modified()
+
+    def touch(self, relpath: str) -> None:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if self.exists(relpath):
+                return
+            if not self.is_dir(parent_relpath(relpath)):
+                raise FileNotFoundError(f"Parent directory not found: '{relpath}'")
+            self._store(relpath, b"")
+
+    def unlink(self, relpath: str) -> None:
+        relpath = normalize_relpath(relpath)
+        with self._lock:
+            if self.is_dir(relpath):
+                raise IsADirectoryError(f"Is a directory: '{relpath}'")
+            if not self.exists(relpath):
+                raise FileNotFoundError(f"File not found: '{relpath}'")
+            self._discard(relpath)
+            if self.lower.is_file(relpath):
+                self._deleted.add(relpath)
+            self._modified()
+
+    def _store(self, relpath: str, content: FileContent) -> None:
+        """
+        Store the content of a file, in memory or in the spill directory if the budget is exceeded.
+
+        The content is either the bytes of the file, or the path of a file already spilled.
+        """
+        with self._lock:
+            self._discard(relpath)
+            if isinstance(content, bytes):
+                if self.memory_used + len(content) > self.memory_budget:
+                    content = self._spill(content)
+                else:
+                    self.memory_used += len(content)
+            self._files[relpath] = content
+            if self.io_stats is not None:
+                self.io_stats.files_written += 1
+                self.io_stats.bytes_written += _content_size(content)
+            self._deleted.discard(relpath)
+            parent, _, name = relpath.rpartition("/")
+            self._children.setdefault(parent, set()).add(name)
+            self._modified()
+
+    def _discard(self, relpath: str) -> None:
+        """Forget the content of a modified file, if any."""
+        content = self._files.pop(relpath, None)
+        if content is None:
+            return
+        if isinstance(content, bytes):
+            self.memory_used -= len(content)
+        else:
+            content.unlink()
+        parent, _, name = relpath.rpartition("/")
+        self._children.get(parent, set()).discard(name)
+
+    def _spill(self, data: bytes) -> Path:
+        path, file = self._open_spill_file()
+        with file:
+            file.write(data)
+        return path
+
+    def _open_spill_file(self) -> t.Tuple[Path, t.BinaryIO]:
+        """Create a new file in the spill directory, and open it for writing."""
+        with self._lock:
+            if self.spill_dir is None:
+                self.spill_dir = Path(tempfile.mkdtemp(prefix="~", suffix=".spill.tmp"))
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._spill_count += 1
+            path = self.spill_dir / f"{self._spill_count:08d}.bin"
+        return path, open(path, mode="wb")
+
+    # Changes
+    # -------
+
+    def changes(self) -> OverlayChanges:
+        """
+        Compute the changes to apply to the underlying file system.
+
+        The files whose final content is identical to the content of the underlying file are ignored,
+        so that only the files which really change are written.
+        """
+        with self._lock:
+            dirs = sorted((d for d in self._dirs if not self.lower.is_dir(d)), key=lambda d: (d.count("/"), d))
+            files = {}
+            for relpath, content in sorted(self._files.items()):
+                if self.lower.is_file(relpath) and self._same_content(relpath, content):
+                    continue
+                files[relpath] = content
+            deleted = sorted(self._deleted)
+        return OverlayChanges(dirs=dirs, files=files, deleted=deleted)
+
+    def _same_content(self, relpath: str, content: FileContent) -> bool:
+        size = _content_size(content)
+        return self.lower.size(relpath) == size and self.lower.read_bytes(relpath) == read_content(content)
+
+
+def backup_files(changes: OverlayChanges, root: Path, backup_dir: Path) -> t.List[str]:
+    """
+    Backup the files of a study directory which are going to be overwritten or removed.
+
+    Files are hard-linked into the backup directory when possible (copied otherwise):
+    this is safe because `apply_changes` never modifies a file in place.
+
+    Args:
+        changes: The changes to apply.
+        root: The study directory.
+        backup_dir: The backup directory.
+
+    Returns:
+        The relative paths of the files that were backed up.
+    """
+    backed_up = []
+    for relpath in [*changes.files, *changes.deleted]:
+        src_path = root / relpath
+        if not src_path.is_file():
+            continue
+        dst_path = backup_dir / relpath
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(src_path, dst_path)
+        except OSError:
+            shutil.copy2(src_path, dst_path)
+        backed_up.append(relpath)
+    return backed_up
+
+
+def apply_changes(changes: OverlayChanges, root: Path, max_workers: t.Optional[int] = None) -> None:
+    """
+    Apply the changes to a study directory.
+
+    Existing files are removed before being written, so that their backup (hard link) is preserved.
+    The changes are applied in batches, by directory and in parallel (see `BulkExecutor`).
+
+    Args:
+        changes: The changes to apply.
+        root: The study directory.
+        max_workers: Maximum number of threads used to apply the changes.
+    """
+    executor = BulkExecutor(root, max_workers=max_workers)
+    for relpath in changes.dirs:
+        executor.mkdir(relpath)
+    for relpath, content in changes.files.items():
+        executor.write(relpath, content)
+    for relpath in changes.deleted:
+        executor.unlink(relpath)
+    executor.run()
+
+
+def restore_files(changes: OverlayChanges, root: Path, backup_dir: Path, backed_up: t.Collection[str]) -> None:
+    """
+    Restore a study directory after a failure of `apply_changes`.
+
+    Args:
+        changes: The changes that were applied (maybe partially).
+        root: The study directory.
+        backup_dir: The backup directory.
+        backed_up: The relative paths of the files that were backed up.
+    """
+    for relpath in changes.files:
+        if relpath not in backed_up:
+            root.joinpath(relpath).unlink(missing_ok=True)
+    for relpath in backed_up:
+        os.replace(backup_dir / relpath, root / relpath)
+    for relpath in reversed(changes.dirs):
+        try:
+            root.joinpath(relpath).rmdir()
+        except OSError:
+            # The directory is not empty or was already removed
+            pass
@@ -0,0 +1,230 @@
+"""
+File system view of a study stored in a ZIP archive.
+
+Studies can be read directly from a ZIP archive, without extracting it, and upgraded
+archive-to-archive: the members which are not modified by the upgraders are copied as raw
+compressed bytes into the new archive (without decompression and recompression).
+"""
+
+import io
+import shutil
+import struct
+import typing as t
+import zipfile
+from pathlib import Path
+
+from .base import StudyFS, normalize_relpath, parent_relpath
+from .overlay import OverlayChanges
+
+STUDY_ANTARES_NAME = "study.antares"
+
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_LOCAL_HEADER_SIZE = 30
+_USE_DATA_DESCRIPTOR = 0x08
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def is_zip_study(path: t.Union[str, Path]) -> bool:
+    """Check if a path is a ZIP archive (of a study)."""
+    path = Path(path)
+    return path.suffix.lower() == ".zip" and path.is_file()
+
+
+class ZipFS(StudyFS):
+    """
+    Read-only file system view of a study stored in a ZIP archive.
+
+    The study may be stored at the root of the archive, or in a single top-level directory.
+
+    Args:
+        zip_path: Path to the ZIP archive.
+    """
+
+    def __init__(self, zip_path: t.Union[str, Path]) -> None:
+        self.zip_path = Path(zip_path)
+        self._zf = zipfile.ZipFile(self.zip_path, mode="r")
+        self.prefix = self._find_prefix(self._zf.namelist())
+        self._members: t.Dict[str, zipfile.ZipInfo] = {}
+        self._dirs: t.Set[str] = {""}
+        self._children: t.Dict[str, t.Set[str]] = {}
+        for info in self._zf.infolist():
+            relpath = self.relpath_of(info)
+            if relpath is None:
+                continue
+            if info.is_dir():
+                self._add_dir(relpath)
+            else:
+                self._members[relpath] = info
+                self._add_dir(parent_relpath(relpath))
+                self._children.setdefault(parent_relpath(relpath), set()).add(relpath.rpartition("/")[2])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.zip_path)!r})"
+
+    def __enter__(self) -> "ZipFS":
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zf.close()
+
+    @staticmethod
+    def _find_prefix(names: t.List[str]) -> str:
+        if STUDY_ANTARES_NAME in names:
+            return ""
+        candidates = [n[: -len(STUDY_ANTARES_NAME)] for n in names if n.endswith(f"/{STUDY_ANTARES_NAME}")]
+        top_level = [c for c in candidates if c.count("/") == 1]
+        return top_level[0] if len(top_level) == 1 else ""
+
+    def _add_dir(self, relpath: str) -> None:
+        while relpath and relpath not in self._dirs:
+            self._dirs.add(relpath)
+            parent, _, name = relpath.rpartition("/")
+            self._children.setdefault(parent, set()).add(name)
+            relpath = parent
+
+    def relpath_of(self, info: zipfile.ZipInfo) -> t.Optional[str]:
+        """Return the path of a member relative to the study, or `None` if it is outside the study."""
+        name = info.filename
+        if not name.startswith(self.prefix):
+            return None
+        relpath = normalize_relpath(name[len(self.prefix) :].rstrip("/"))
+        return relpath or None
+
+    def infolist(self) -> t.List[zipfile.ZipInfo]:
+        """Return the members of the archive, in the archive order."""
+        return self._zf.infolist()
+
+    # Query methods
+    # -------------
+
+    def exists(self, relpath: str) -> bool:
+        relpath = normalize_relpath(relpath)
+        return relpath in self._members or relpath in self._dirs
+
+    def is_dir(self, relpath: str) -> bool:
+        return normalize_relpath(relpath) in self._dirs
+
+    def is_file(self, relpath: str) -> bool:
+        return normalize_relpath(relpath) in self._members
+
+    def iterdir(self, relpath: str) -> t.List[str]:
+        relpath = normalize_relpath(relpath)
+        if relpath not in self._dirs:
+            if relpath in self._members:
+                raise NotADirectoryError(f"Not a directory: '{relpath}'")
+            raise FileNotFoundError(f"Directory not found: '{relpath}'")
+        return sorted(self._children.get(relpath, ()))
+
+    def size(self, relpath: str) -> int:
+        return self._get_member(relpath).file_size
+
+    def _get_member(self, relpath: str) -> zipfile.ZipInfo:
+        try:
+            return self._members[normalize_relpath(relpath)]
+        except KeyError:
+            raise FileNotFoundError(f"File not found in '{self.zip_path}': '{relpath}'") from None
+
+    # Reading and writing
+    # -------------------
+
+    def open(self, relpath: str, mode: str = "r", encoding: t.Optional[str] = None) -> t.IO[t.Any]:
+        if mode not in {"r", "rb"}:
+            raise PermissionError(f"Read-only ZIP archive: '{self.zip_path}'")
+        stream = self._zf.open(self._get_member(relpath), mode="r")
+        if mode == "rb":
+            return stream
+        return io.TextIOWrapper(stream, encoding=encoding or "utf-8")
+
+    def mkdir(self, relpath: str, parents: bool = False, exist_ok: bool = False) -> None:
+        raise PermissionError(f"Read-only ZIP archive: '{self.zip_path}'")
+
+    def touch(self, relpath: str) -> None:
+        raise PermissionError(f"Read-only ZIP archive: '{self.zip_path}'")
+
+    def unlink(self, relpath: str) -> None:
+        raise PermissionError(f"Read-only ZIP archive: '{self.zip_path}'")
+
+    def copy_raw_member(self, info: zipfile.ZipInfo, dst: zipfile.ZipFile) -> None:
+        """
+        Copy a member into another archive, as raw compressed bytes.
+
+        Args:
+            info: The member to copy.
+            dst: The archive opened in write mode.
+        """
+        new_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+        new_info.compress_type = info.compress_type
+        new_info.comment = info.comment
+        new_info.create_system = info.create_system
+        new_info.create_version = info.create_version
+        new_info.extract_version = info.extract_version
+        new_info.external_attr = info.external_attr
+        new_info.internal_attr = info.internal_attr
+        # The sizes and the CRC are written in the local header instead of a data descriptor
+        new_info.flag_bits = info.flag_bits & ~_USE_DATA_DESCRIPTOR
+        new_info.CRC = info.CRC
+        new_info.compress_size = info.compress_size
+        new_info.file_size = info.file_size
+
+        # NOTE: `zipfile` has no public API to copy raw members: the archive internals
+        # are updated the same way as `ZipFile.writestr` does.
+        dst_fp = t.cast(t.BinaryIO, dst.fp)
+        new_info.header_offset = dst_fp.tell()
+        dst_fp.write(new_info.FileHeader())
+        with self._zf._lock:  # type: ignore
+            src_fp = t.cast(t.BinaryIO, self._zf.fp)
+            src_fp.seek(info.header_offset)
+            header = src_fp.read(_LOCAL_HEADER_SIZE)
+            if header[:4] != _LOCAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile(f"Bad local header for member '{info.filename}'")
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            src_fp.seek(name_length + extra_length, io.SEEK_CUR)
+            remaining = info.compress_size
+            while remaining:
+                chunk = src_fp.read(min(remaining, _COPY_BUFFER_SIZE))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"Truncated member '{info.filename}'")
+                dst_fp.write(chunk)
+                remaining -= len(chunk)
+        dst.start_dir = dst_fp.tell()  # type: ignore
+        dst.filelist.append(new_info)
+        dst.NameToInfo[new_info.filename] = new_info
+        dst._didModify = True  # type: ignore
+
+
+def write_zip(lower: StudyFS, changes: OverlayChanges, zip_path: Path) -> None:
+    """
+    Write a ZIP archive of a study with the given changes applied.
+
+    The files which are not modified are copied from the lower file system: when it is a `ZipFS`,
+    the members are copied as raw compressed bytes, in the original order and with the original layout.
+
+    Args:
+        lower: The file system of the original study.
+        changes: The changes to apply.
+        zip_path: Path of the new ZIP archive.
+    """
+    replaced = set(changes.files) | set(changes.deleted)
+    prefix = lower.prefix if isinstance(lower, ZipFS) else ""
+    with zipfile.ZipFile(zip_path, mode="w", compression=zipfile.ZIP_DEFLATED) as dst:
+        if isinstance(lower, ZipFS):
+            for info in lower.infolist():
+                if lower.relpath_of(info) not in replaced:
+                    lower.copy_raw_member(info, dst)
+        else:
+            for relpath, is_dir in lower.walk():
+                if is_dir:
+                    dst.writestr(zipfile.ZipInfo(f"{relpath}/"), b"")
+                elif relpath not in replaced:
+                    with lower.open(relpath, "rb") as src, dst.open(relpath, mode="w") as fp:
+                        shutil.copyfileobj(src, fp, _COPY_BUFFER_SIZE)
+        for relpath in changes.dirs:
+            dst.writestr(zipfile.ZipInfo(f"{prefix}{relpath}/"), b"")
+        for relpath, content in changes.files.items():
+            if isinstance(content, bytes):
+                dst.writestr(f"{prefix}{relpath}", content)
+            else:
+                dst.write(content, arcname=f"{prefix}{relpath}")
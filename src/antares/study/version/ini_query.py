@@ -0,0 +1,144 @@
+"""
+Query the sections of the INI files of a study.
+
+Questions like "every thermal cluster whose group is 'other'" or "every binding constraint which is disabled"
+require reading many INI files. The :func:`query_ini` function selects the files with a glob pattern,
+reads them in parallel, and yields the matching sections as records.
+
+The predicates are pushed down as far as possible, to avoid parsing what is not needed:
+
+- a file which doesn't contain the text of the expected string or boolean values is not parsed at all,
+- an exact section name is passed to the `IniReader` filter, which stops reading after this section,
+- when only some columns are requested, the other options are skipped by the `IniReader` filter.
+
+Usage:
+
+>>> from antares.study.version.ini_query import query_ini
+
+>>> pattern = "input/thermal/clusters/*/list.ini"
+>>> records = query_ini("path/to/study", pattern, where={"group": "other"})  # doctest: +SKIP
+>>> for record in records:  # doctest: +SKIP
+...     print(record.path, record.section, record.options["group"])
+input/thermal/clusters/fr/list.ini Gas other
+"""
+
+import dataclasses
+import io
+import re
+import typing as t
+
+from antares.study.version.fs import StudyDir, StudyFS, as_study_fs
+from antares.study.version.ini_reader import IniReader
+from antares.study.version.parallel import run_in_parallel
+
+Predicate = t.Union[str, int, float, bool, t.Callable[[t.Any], bool]]
+"""Expected value of an option, or a function which checks the value."""
+
+_BATCH_SIZE = 64
+"""Number of files read in parallel before the records are yielded."""
+
+
+@dataclasses.dataclass(frozen=True)
+class IniRecord:
+    """
+    A section of an INI file matching a query.
+
+    Attributes:
+        path: Relative path of the INI file.
+        section: Name of the section.
+        options: Options of the section (only the requested columns, if any).
+    """
+
+    path: str
+    section: str
+    options: t.Dict[str, t.Any]
+
+
+def _match_value(value: t.Any, expected: Predicate) -> bool:
+    if callable(expected):
+        return bool(expected(value))
+    if isinstance(value, str) and isinstance(expected, str):
+        # Names and groups are case-insensitive in Antares
+        return value.casefold() == expected.casefold()
+    return bool(value == expected) and isinstance(value, bool) == isinstance(expected, bool)
+
+
+def _text_tokens(where: t.Mapping[str, Predicate]) -> t.List[str]:
+    """Texts which must be present in a file for its sections to match (in lowercase)."""
+    tokens = []
+    for expected in where.values():
+        if isinstance(expected, bool):
+            tokens.append(str(expected).lower())
+        elif isinstance(expected, str):
+            tokens.append(expected.casefold())
+    return tokens
+
+
+class _Query:
+    def __init__(
+        self,
+        fs: StudyFS,
+        section: t.Optional[str],
+        where: t.Mapping[str, Predicate],
+        columns: t.Optional[t.Sequence[str]],
+    ) -> None:
+        self.fs = fs
+        self.where = dict(where)
+        self.columns = list(columns) if columns is not None else None
+        self.tokens = _text_tokens(self.where)
+        self.filter_kwargs: t.Dict[str, t.Any] = {"section": section or ""}
+        if self.columns is not None:
+            names = list(dict.fromkeys([*self.columns, *self.where]))
+            self.filter_kwargs["option_regex"] = "|".join(re.escape(name) for name in names)
+
+    def run(self, path: str) -> t.List[IniRecord]:
+        try:
+            text = self.fs.read_text(path)
+        except FileNotFoundError:
+            return []
+        if self.tokens:
+            lower_text = text.casefold()
+            if any(token not in lower_text for token in self.tokens):
+                return []
+        # The reader is stateful: one reader per file
+        sections = IniReader().read(io.StringIO(text), **self.filter_kwargs)
+        records = []
+        for name, options in sections.items():
+            if all(key in options and _match_value(options[key], expected) for key, expected in self.where.items()):
+                if self.columns is not None:
+                    options = {key: options[key] for key in self.columns if key in options}
+                records.append(IniRecord(path, name, options))
+        return records
+
+
+def query_ini(
+    study_dir: StudyDir,
+    pattern: str,
+    *,
+    section: t.Optional[str] = None,
+    where: t.Optional[t.Mapping[str, Predicate]] = None,
+    columns: t.Optional[t.Sequence[str]] = None,
+    max_workers: t.Optional[int] = None,
+) -> t.Iterator[IniRecord]:
+    """
+    Find the sections of the INI files matching a glob pattern which satisfy some predicates.
+
+    Args:
+        study_dir: The study directory, or the file system view of the study.
+        pattern: A relative glob pattern, like "input/thermal/clusters/*/list.ini".
+        section: The name of the section to select (by default, all the sections are selected).
+        where: For each option, the expected value (strings are compared case-insensitively),
+            or a function which checks the value. A section without the option doesn't match.
+        columns: The options to return in the records (by default, all the options).
+        max_workers: Maximum number of threads used to read the files (see `run_in_parallel`).
+
+    Yields:
+        The matching sections, in the order of the files (alphabetical) and of the sections.
+    """
+    fs = as_study_fs(study_dir)
+    query = _Query(fs, section, where or {}, columns)
+    paths = fs.glob(pattern)
+    for start in range(0, len(paths), _BATCH_SIZE):
+        batch = paths[start : start + _BATCH_SIZE]
+        for records in run_in_parallel(query.run, batch, max_workers=max_workers):
+            yield from records
@@ -0,0 +1,206 @@
+"""
+Columnar views of INI files, as pandas DataFrames.
+
+Some INI files of a study are tables keyed by area: `input/hydro/hydro.ini` or `input/thermal/areas.ini`
+have one section per property, with one option per area::
+
+    [inter - daily - breakdown]
+    de = 1
+    fr = 1
+
+    [intra - daily - modulation]
+    de = 24
+    fr = 24
+
+Editing such a file with dictionaries of dictionaries means looping over all the areas of each section.
+The :func:`read_area_table` function loads the file into a DataFrame (one row per area, one column per
+property), so that whole columns can be edited at once, and :func:`write_area_table` writes it back
+in a canonical order.
+
+Likewise, the :class:`ClusterTable` loads the "list.ini" files of all the areas into one DataFrame
+of clusters (see below).
+
+Usage:
+
+>>> from antares.study.version.ini_tables import read_area_table, write_area_table
+
+>>> df = read_area_table(fs, "input/hydro/hydro.ini")  # doctest: +SKIP
+>>> df["intra-daily-modulation"] = 24  # doctest: +SKIP
+>>> write_area_table(fs, "input/hydro/hydro.ini", df)  # doctest: +SKIP
+"""
+
+import io
+import math
+import typing as t
+
+import pandas as pd
+
+from antares.study.version.fs import StudyFS
+from antares.study.version.fs.base import parent_relpath
+from antares.study.version.ini_writer import format_ini_value
+from antares.study.version.model.study_index import CLUSTER_DIRS, StudyIndex
+from antares.study.version.parallel import run_in_parallel
+
+HYDRO_INI_PATH = "input/hydro/hydro.ini"
+
+
+def area_table_from_sections(sections: t.Mapping[str, t.Mapping[str, t.Any]]) -> pd.DataFrame:
+    """
+    Convert the sections of an area-keyed INI file to a DataFrame.
+
+    Args:
+        sections: For each property (section), the value of each area (option).
+
+    Returns:
+        A DataFrame indexed by area (in alphabetical order), with one column per property, in the order
+        of the sections.
+        The missing values are `pd.NA`, and the columns use the pandas nullable types (`Int64`,
+        `Float64`, `boolean`, `string`), so that integers are not turned into floats.
+    """
+    df = pd.DataFrame({name: pd.Series(dict(options), dtype=object) for name, options in sections.items()})
+    df.index.name = "area"
+    return df.convert_dtypes()
+
+
+def area_table_to_text(df: pd.DataFrame) -> str:
+    """
+    Format a DataFrame as the text of an area-keyed INI file.
+
+    The sections are written in the order of the columns, and the options in the alphabetical order
+    of the areas; missing values are skipped.
+    """
+    df = df.sort_index()
+    buffer = io.StringIO()
+    for name in df.columns:
+        buffer.write(f"[{name}]\n")
+        column = df[name].dropna()
+        buffer.writelines(f"{area} = {format_ini_value(value)}\n" for area, value in zip(column.index, column.tolist()))
+        buffer.write("\n")
+    return buffer.getvalue()
+
+
+def read_area_table(fs: StudyFS, relpath: str) -> pd.DataFrame:
+    """
+    Read an area-keyed INI file (one section per property, one option per area) into a DataFrame.
+
+    Args:
+        fs: The file system view of the study.
+        relpath: Relative path of the INI file; a missing file gives an empty DataFrame.
+
+    Returns:
+        A DataFrame indexed by area, with one column per property (see :func:`area_table_from_sections`).
+    """
+    return area_table_from_sections(fs.read_ini(relpath))
+
+
+def write_area_table(fs: StudyFS, relpath: str, df: pd.DataFrame) -> None:
+    """
+    Write a DataFrame indexed by area as an area-keyed INI file (see :func:`area_table_to_text`).
+
+    Args:
+        fs: The file system view of the study.
+        relpath: Relative path of the INI file.
+        df: The DataFrame indexed by area, with one column per property.
+    """
+    fs.write_text(relpath, area_table_to_text(df))
+
+
+class ClusterTable:
+    """
+    All the clusters of a kind (thermal, renewable or short-term storage), as one DataFrame.
+
+    The clusters are defined in one `input/<kind>/clusters/<area>/list.ini` file per area, with one section
+    per cluster. The table loads all these files (in parallel) into one DataFrame indexed by `(area, cluster)`,
+    with one column per property, so that a property can be updated for all the clusters at once::
+
+        table = ClusterTable.read(fs, THERMAL)
+        table.df["enabled"] = True
+        table.df["group"] = table.df["group"].replace({"Other": "other 1"})
+        table.write()
+
+    The values are the parsed INI values (object dtype), and missing properties are `NaN`.
+    When the table is written back, only the files of the areas whose clusters changed are rewritten,
+    and the properties of each cluster keep their original order (new properties are appended).
+
+    Args:
+        fs: The file system view of the study.
+        kind: "thermal", "renewable" or "st-storage".
+        sections_by_area: The sections of the "list.ini" file of each area.
+        max_workers: Maximum number of threads used to write the files (see `run_in_parallel`).
+
+    Attributes:
+        df: The DataFrame of the clusters, indexed by `(area, cluster)`.
+    """
+
+    def __init__(
+        self,
+        fs: StudyFS,
+        kind: str,
+        sections_by_area: t.Mapping[str, t.Mapping[str, t.Mapping[str, t.Any]]],
+        max_workers: t.Optional[int] = None,
+    ) -> None:
+        self.fs = fs
+        self.kind = kind
+        self.max_workers = max_workers
+        self._sections = {
+            area: {name: dict(section) for name, section in sections.items()}
+            for area, sections in sections_by_area.items()
+        }
+        keys = [(area, name) for area, sections in self._sections.items() for name in sections]
+        index = pd.MultiIndex.from_tuples(keys, names=["area", "cluster"])
+        records = [section for sections in self._sections.values() for section in sections.values()]
+        self.df = pd.DataFrame(records, index=index, dtype=object) if records else pd.DataFrame(index=index)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.fs!r}, {self.kind!r})"
+
+    @classmethod
+    def read(cls, fs: StudyFS, kind: str, max_workers: t.Optional[int] = None) -> "ClusterTable":
+        """
+        Read the "list.ini" files of all the areas, in parallel.
+
+        Args:
+            fs: The file system view of the study.
+            kind: "thermal", "renewable" or "st-storage".
+            max_workers: Maximum number of threads (see `run_in_parallel`).
+        """
+        files = StudyIndex.of(fs).cluster_list_files(kind)
+        all_sections = run_in_parallel(fs.read_ini, files, max_workers=max_workers)
+        sections_by_area = {path.split("/")[-2]: sections for path, sections in zip(files, all_sections)}
+        return cls(fs, kind, sections_by_area, max_workers=max_workers)
+
+    def to_sections(self) -> t.Dict[str, t.Dict[str, t.Dict[str, t.Any]]]:
+        """Return the sections of the "list.ini" file of each area, as they would be written."""
+        sections_by_area: t.Dict[str, t.Dict[str, t.Dict[str, t.Any]]] = {area: {} for area in self._sections}
+        columns = list(self.df.columns)
+        for (area, name), values in zip(self.df.index, self.df.itertuples(index=False, name=None)):
+            section = {column: value for column, value in zip(columns, values) if not _is_missing(value)}
+            original = self._sections.get(area, {}).get(name, {})
+            order = [key for key in original if key in section] + [key for key in section if key not in original]
+            sections_by_area.setdefault(area, {})[name] = {key: section[key] for key in order}
+        return sections_by_area
+
+    def write(self) -> t.List[str]:
+        """
+        Write back the "list.ini" files of the areas whose clusters changed.
+
+        Returns:
+            The relative paths of the files written, in alphabetical order.
+        """
+        cluster_dir = CLUSTER_DIRS[self.kind]
+        changes = {
+            f"{cluster_dir}/{area}/list.ini": sections
+            for area, sections in self.to_sections().items()
+            if sections != self._sections.get(area)
+        }
+        for path in changes:
+            self.fs.mkdir(parent_relpath(path), parents=True, exist_ok=True)
+        run_in_parallel(
+            lambda path: self.fs.write_ini(path, changes[path]), list(changes), max_workers=self.max_workers
+        )
+        self._sections.update((path.split("/")[-2], sections) for path, sections in changes.items())
+        return sorted(changes)
+
+
+def _is_missing(value: t.Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
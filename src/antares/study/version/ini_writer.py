@@ -6,6 +6,18 @@ from pathlib import Path
 JSON = t.Dict[str, t.Any]
 
 
+def format_ini_value(value: t.Any) -> str:
+    """
+    Format a value of an INI option, like the solver does: booleans are written in lowercase,
+    and integral floats as integers (a column with missing values may have been turned into floats).
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
 class IniConfigParser(configparser.RawConfigParser):
     def __init__(self, special_keys: t.Optional[t.List[str]] = None) -> None:
         super().__init__()
@@ -58,18 +70,21 @@ class IniWriter:
     def __init__(self, special_keys: t.Optional[t.List[str]] = None):
         self.special_keys = special_keys
 
-    def write(self, data: JSON, path: Path) -> None:
+    def write(self, data: JSON, path: t.Union[Path, t.TextIO]) -> None:
         """
         Write `.ini` file from JSON content
 
         Args:
             data: JSON content.
-            path: path to `.ini` file.
+            path: path to `.ini` file or file-like object.
         """
         config_parser = IniConfigParser(special_keys=self.special_keys)
         config_parser.read_dict(data)
-        with path.open("w") as fp:
-            config_parser.write(fp)
+        if isinstance(path, Path):
+            with path.open("w") as fp:
+                config_parser.write(fp)
+        else:
+            config_parser.write(path)
 
 
 class SimpleKeyValueWriter(IniWriter):
@@ -77,15 +92,18 @@ class SimpleKeyValueWriter(IniWriter):
     Simple key/value INI writer.
     """
 
-    def write(self, data: JSON, path: Path) -> None:
+    def write(self, data: JSON, path: t.Union[Path, t.TextIO]) -> None:
         """
         Write `.ini` file from JSON content
 
         Args:
             data: JSON content.
-            path: path to `.ini` file.
+            path: path to `.ini` file or file-like object.
         """
-        with path.open("w") as fp:
-            for key, value in data.items():
-                if value is not None:
-                    fp.write(f"{key}={value}\n")
+        if isinstance(path, Path):
+            with path.open("w") as fp:
+                self.write(data, fp)
+            return
+        for key, value in data.items():
+            if value is not None:
+                path.write(f"{key}={value}\n")
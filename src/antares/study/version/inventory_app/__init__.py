@@ -0,0 +1,111 @@
+import dataclasses
+import sys
+import typing as t
+from pathlib import Path
+
+from antares.study.version import StudyVersion
+from antares.study.version.inventory_app.index import InventoryIndex, RefreshStats
+from antares.study.version.inventory_app.scanner import JSON_FORMAT, OUTPUT_FORMATS, scan_fleet, write_study_infos
+
+
+@dataclasses.dataclass
+class ShowAllApp:
+    """
+    Show the details of all the studies found below some root directories (caption, version, dates, author,
+    available upgrades), in JSON, NDJSON or CSV format.
+
+    Attributes:
+        root_dirs: The root directories to explore.
+        fmt: "json", "ndjson" or "csv".
+        max_workers: Maximum number of threads used to explore the directories and read the studies.
+        count: Number of studies found by the last call.
+    """
+
+    root_dirs: t.Sequence[Path]
+    fmt: str = JSON_FORMAT
+    max_workers: t.Optional[int] = None
+    count: int = dataclasses.field(default=0, init=False)
+
+    def __post_init__(self):
+        self.root_dirs = [Path(root_dir) for root_dir in self.root_dirs]
+        for root_dir in self.root_dirs:
+            if not root_dir.is_dir():
+                raise FileNotFoundError(f"Directory not found: {root_dir}")
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Invalid output format: {self.fmt!r}, expected one of {OUTPUT_FORMATS}")
+
+    def __call__(self, file: t.Optional[t.TextIO] = None) -> None:
+        infos = scan_fleet(self.root_dirs, max_workers=self.max_workers)
+        self.count = write_study_infos(infos, file or sys.stdout, fmt=self.fmt)
+
+
+@dataclasses.dataclass
+class IndexApp:
+    """
+    Update the inventory index of the studies found below some root directories.
+
+    Only the studies whose 'study.antares' file changed since the last update are read again.
+
+    Attributes:
+        index_path: Path of the SQLite database of the index (created if missing).
+        root_dirs: The root directories to explore.
+        max_workers: Maximum number of threads used to explore the directories and read the studies.
+        stats: The statistics of the last update.
+    """
+
+    index_path: Path
+    root_dirs: t.Sequence[Path]
+    max_workers: t.Optional[int] = None
+    stats: t.Optional[RefreshStats] = dataclasses.field(default=None, init=False)
+
+    def __post_init__(self):
+        self.index_path = Path(self.index_path)
+        self.root_dirs = [Path(root_dir) for root_dir in self.root_dirs]
+        if not self.index_path.parent.is_dir():
+            raise FileNotFoundError(f"Directory not found: {self.index_path.parent}")
+        for root_dir in self.root_dirs:
+            if not root_dir.is_dir():
+                raise FileNotFoundError(f"Directory not found: {root_dir}")
+
+    def __call__(self, file: t.Optional[t.TextIO] = None) -> None:
+        with InventoryIndex(self.index_path) as index:
+            self.stats = stats = index.refresh(self.root_dirs, max_workers=self.max_workers)
+        print(
+            f"Indexed {stats.total} studies: {stats.added} added, {stats.updated} updated,"
+            f" {stats.removed} removed, {stats.unchanged} unchanged",
+            file=file,
+        )
+
+
+@dataclasses.dataclass
+class QueryIndexApp:
+    """
+    Show the details of the studies of the inventory index, in JSON, NDJSON or CSV format.
+
+    Attributes:
+        index_path: Path of the SQLite database of the index.
+        below: Select the studies whose version is strictly lower than this version.
+        from_version: Select the studies whose version is greater than or equal to this version.
+        root_dir: Select the studies below this directory.
+        fmt: "json", "ndjson" or "csv".
+        count: Number of studies found by the last call.
+    """
+
+    index_path: Path
+    below: t.Optional[StudyVersion] = None
+    from_version: t.Optional[StudyVersion] = None
+    root_dir: t.Optional[Path] = None
+    fmt: str = JSON_FORMAT
+    count: int = dataclasses.field(default=0, init=False)
+
+    def __post_init__(self):
+        self.index_path = Path(self.index_path)
+        if not self.index_path.is_file():
+            raise FileNotFoundError(f"Inventory index not found: {self.index_path}")
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Invalid output format: {self.fmt!r}, expected one of {OUTPUT_FORMATS}")
+
+    def __call__(self, file: t.Optional[t.TextIO] = None) -> None:
+        with InventoryIndex(self.index_path) as index:
+            studies = index.query(below=self.below, from_version=self.from_version, root_dir=self.root_dir)
+        self.count = write_study_infos(studies, file or sys.stdout, fmt=self.fmt)
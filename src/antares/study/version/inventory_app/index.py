@@ -0,0 +1,369 @@
+"""
+Persistent inventory of a fleet of studies, in a SQLite database.
+
+Scanning a large store of studies (see `scan_fleet`) reads the ``study.antares`` file of every study.
+The :class:`InventoryIndex` keeps the details of the studies in a local SQLite database, and refreshes
+them incrementally: the directories are still explored, but a study is only read again if the
+modification time or the size of its ``study.antares`` file changed. The queries, like "all the studies
+below version 8.8", are then answered from the database, using an index on the version.
+
+The index also records the upgrades it observes: when the version of a study increases between
+two refreshes, the previous version is kept, with the modification date of the ``study.antares`` file
+as upgrade date (the file is rewritten by the upgrade).
+
+Usage:
+
+>>> from antares.study.version.inventory_app.index import InventoryIndex
+
+>>> with InventoryIndex("inventory.db") as index:  # doctest: +SKIP
+...     stats = index.refresh(["path/to/studies"])
+...     old_studies = index.query(below="8.8")
+"""
+
+import dataclasses
+import functools
+import os
+import sqlite3
+import typing as t
+from pathlib import Path
+
+from antares.study.version.inventory_app.scanner import StudyInfo, read_study_info, walk_studies
+from antares.study.version.model.study_version import StudyVersion
+
+SCHEMA_VERSION = 1
+"""Version of the layout of the database (stored in the ``user_version`` pragma)."""
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS studies (
+    path TEXT PRIMARY KEY,
+    caption TEXT NOT NULL,
+    version INTEGER,
+    created_date INTEGER,
+    last_save_date INTEGER,
+    author TEXT NOT NULL,
+    available_upgrades TEXT NOT NULL,
+    error TEXT NOT NULL,
+    size INTEGER,
+    previous_version INTEGER,
+    upgraded_date INTEGER,
+    mtime_ns INTEGER NOT NULL,
+    file_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS studies_version ON studies (version);
+"""
+
+_COLUMNS = (
+    "path",
+    "caption",
+    "version",
+    "created_date",
+    "last_save_date",
+    "author",
+    "available_upgrades",
+    "error",
+    "size",
+    "previous_version",
+    "upgraded_date",
+)
+
+OUTPUT_DIR = "output"
+"""Directory of the simulation outputs, excluded from the size of the studies."""
+
+_BATCH_SIZE = 1000
+"""Number of rows written at once during a refresh."""
+
+VersionLike = t.Union[StudyVersion, str, int]
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexedStudy(StudyInfo):
+    """
+    Details of a study of the inventory index.
+
+    Attributes:
+        size: Size of the study in bytes, simulation outputs excluded.
+        previous_version: Version of the study before its last observed upgrade, if any.
+        upgraded_date: Date of the last observed upgrade (timestamp), if any.
+    """
+
+    size: t.Optional[int] = None
+    previous_version: t.Optional[StudyVersion] = None
+    upgraded_date: t.Optional[int] = None
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Serialize the object to a dictionary (the versions are formatted as "major.minor")."""
+        return {
+            **super().to_dict(),
+            "size": self.size,
+            "previous_version": None if self.previous_version is None else f"{self.previous_version:2d}",
+            "upgraded_date": self.upgraded_date,
+        }
+
+
+@dataclasses.dataclass
+class RefreshStats:
+    """
+    Statistics of a refresh of the inventory index.
+
+    Attributes:
+        added: Number of new studies.
+        updated: Number of studies read again, because their ``study.antares`` file changed.
+        removed: Number of studies which no longer exist.
+        unchanged: Number of studies which were not read again.
+    """
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of studies found by the refresh."""
+        return self.added + self.updated + self.unchanged
+
+
+class _Known(t.NamedTuple):
+    """State of a study in the index, as needed by a refresh."""
+
+    mtime_ns: int
+    file_size: int
+    version: t.Optional[int]
+    previous_version: t.Optional[int]
+    upgraded_date: t.Optional[int]
+
+
+class _Scanned(t.NamedTuple):
+    """Result of the visit of a study: `info` is `None` if the ``study.antares`` file is unchanged."""
+
+    path: str
+    mtime_ns: int
+    file_size: int
+    info: t.Optional[StudyInfo]
+    size: t.Optional[int]
+
+
+def study_size(study_dir: t.Union[str, "os.PathLike[str]"]) -> int:
+    """
+    Compute the size of a study, in bytes, without its simulation outputs.
+
+    The outputs are excluded because they change without the ``study.antares`` file being saved:
+    the size would be outdated by the incremental refresh of the index.
+    """
+    total = 0
+    stack = [os.fspath(study_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != OUTPUT_DIR:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+# The studies share a few versions: the conversions of the columns are cached
+@functools.lru_cache(maxsize=None)
+def _to_version(value: t.Optional[int]) -> t.Optional[StudyVersion]:
+    return None if value is None else StudyVersion.parse(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _to_versions(value: str) -> t.Tuple[StudyVersion, ...]:
+    return tuple(StudyVersion.parse(version) for version in value.split())
+
+
+def _path_range(root_dir: str) -> t.Tuple[str, str]:
+    """Bounds of the paths of the studies below a root directory (the root itself excluded)."""
+    prefix = root_dir.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class InventoryIndex:
+    """
+    Inventory of the studies found below some root directories, stored in a SQLite database.
+
+    Args:
+        db_path: Path of the database file (created if missing).
+    """
+
+    def __init__(self, db_path: t.Union[str, Path]) -> None:
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path))
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self._conn.close()
+            raise ValueError(f"Unsupported inventory index version: {version}, expected {SCHEMA_VERSION}")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.db_path)!r})"
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> "InventoryIndex":
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM studies").fetchone()[0])
+
+    def _known_studies(self, root_dir: str) -> t.Dict[str, _Known]:
+        low, high = _path_range(root_dir)
+        cursor = self._conn.execute(
+            "SELECT path, mtime_ns, file_size, version, previous_version, upgraded_date FROM studies"
+            " WHERE path = ? OR (path >= ? AND path < ?)",
+            (root_dir, low, high),
+        )
+        return {row[0]: _Known(*row[1:]) for row in cursor}
+
+    def refresh(
+        self,
+        root_dirs: t.Iterable[t.Union[str, "os.PathLike[str]"]],
+        max_workers: t.Optional[int] = None,
+    ) -> RefreshStats:
+        """
+        Update the index with the studies found below some root directories.
+
+        Only the studies whose ``study.antares`` file changed (modification time or size) are read again.
+        The studies of the index which are no longer found below the root directories are removed.
+
+        Args:
+            root_dirs: The root directories (a root directory can be a study itself).
+            max_workers: Maximum number of threads used to explore the directories and read the studies.
+
+        Returns:
+            The statistics of the refresh.
+        """
+        roots = [os.path.abspath(os.fspath(root_dir)) for root_dir in root_dirs]
+        known: t.Dict[str, _Known] = {}
+        for root in roots:
+            known.update(self._known_studies(root))
+
+        def visit(path: str, entry: "os.DirEntry[str]") -> _Scanned:
+            stat = entry.stat()
+            old = known.get(path)
+            if old is not None and (old.mtime_ns, old.file_size) == (stat.st_mtime_ns, stat.st_size):
+                return _Scanned(path, stat.st_mtime_ns, stat.st_size, None, None)
+            return _Scanned(path, stat.st_mtime_ns, stat.st_size, read_study_info(path), study_size(path))
+
+        stats = RefreshStats()
+        seen: t.Set[str] = set()
+        rows: t.List[t.Tuple[t.Any, ...]] = []
+        with self._conn:
+            for scanned in walk_studies(roots, visit, max_workers=max_workers):
+                seen.add(scanned.path)
+                if scanned.info is None:
+                    stats.unchanged += 1
+                    continue
+                old = known.get(scanned.path)
+                if old is None:
+                    stats.added += 1
+                else:
+                    stats.updated += 1
+                rows.append(self._to_row(scanned, old))
+                if len(rows) >= _BATCH_SIZE:
+                    self._upsert(rows)
+                    rows.clear()
+            self._upsert(rows)
+            removed = [(path,) for path in known if path not in seen]
+            self._conn.executemany("DELETE FROM studies WHERE path = ?", removed)
+            stats.removed = len(removed)
+        return stats
+
+    @staticmethod
+    def _to_row(scanned: _Scanned, old: t.Optional[_Known]) -> t.Tuple[t.Any, ...]:
+        info = t.cast(StudyInfo, scanned.info)
+        version = None if info.version is None else int(info.version)
+        previous_version = None if old is None else old.previous_version
+        upgraded_date = None if old is None else old.upgraded_date
+        if old is not None and old.version is not None and version is not None and version > old.version:
+            # The 'study.antares' file is rewritten by the upgrade
+            previous_version, upgraded_date = old.version, scanned.mtime_ns // 1_000_000_000
+        return (
+            scanned.path,
+            info.caption,
+            version,
+            info.created_date,
+            info.last_save_date,
+            info.author,
+            " ".join(f"{upgrade:2d}" for upgrade in info.available_upgrades),
+            info.error,
+            scanned.size,
+            previous_version,
+            upgraded_date,
+            scanned.mtime_ns,
+            scanned.file_size,
+        )
+
+    def _upsert(self, rows: t.Sequence[t.Tuple[t.Any, ...]]) -> None:
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO studies ({', '.join(_COLUMNS)}, mtime_ns, file_size)"
+            f" VALUES ({', '.join('?' * (len(_COLUMNS) + 2))})",
+            rows,
+        )
+
+    def query(
+        self,
+        *,
+        below: t.Optional[VersionLike] = None,
+        from_version: t.Optional[VersionLike] = None,
+        root_dir: t.Optional[t.Union[str, "os.PathLike[str]"]] = None,
+    ) -> t.List[IndexedStudy]:
+        """
+        Find the studies of the index, in the alphabetical order of their paths.
+
+        The studies whose version is missing or invalid are only returned when no version is given.
+
+        Args:
+            below: Select the studies whose version is strictly lower than this version.
+            from_version: Select the studies whose version is greater than or equal to this version.
+            root_dir: Select the studies below this directory.
+
+        Returns:
+            The matching studies.
+        """
+        conditions = []
+        params: t.List[t.Any] = []
+        if below is not None:
+            conditions.append("version < ?")
+            params.append(int(StudyVersion.parse(below)))
+        if from_version is not None:
+            conditions.append("version >= ?")
+            params.append(int(StudyVersion.parse(from_version)))
+        if root_dir is not None:
+            root = os.path.abspath(os.fspath(root_dir))
+            conditions.append("(path = ? OR (path >= ? AND path < ?))")
+            params.extend([root, *_path_range(root)])
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM studies"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY path"
+        return [self._to_study(row) for row in self._conn.execute(sql, params)]
+
+    @staticmethod
+    def _to_study(row: t.Sequence[t.Any]) -> IndexedStudy:
+        values = dict(zip(_COLUMNS, row))
+        return IndexedStudy(
+            path=values["path"],
+            caption=values["caption"],
+            version=_to_version(values["version"]),
+            created_date=values["created_date"],
+            last_save_date=values["last_save_date"],
+            author=values["author"],
+            available_upgrades=_to_versions(values["available_upgrades"]),
+            error=values["error"],
+            size=values["size"],
+            previous_version=_to_version(values["previous_version"]),
+            upgraded_date=values["upgraded_date"],
+        )
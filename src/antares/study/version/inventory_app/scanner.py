@@ -0,0 +1,253 @@
+"""
+Inventory of a fleet of studies: find every study below some root directories and read its ``study.antares`` file.
+
+The directory trees are explored in parallel, with `os.scandir`, which gives the type of the entries
+without an additional `stat` call. A directory which contains a ``study.antares`` file is a study:
+its subdirectories (``input``, ``output``, ``user``...) are never explored. The ``input`` and ``output``
+directories of broken studies (without ``study.antares`` file) and the temporary upgrade directories
+are not explored either. Only the fields of the ``study.antares`` file are read (see `sniff_study_antares`).
+
+Usage:
+
+>>> from antares.study.version.inventory_app.scanner import scan_fleet
+
+>>> for info in scan_fleet(["path/to/studies"]):  # doctest: +SKIP
+...     print(info.path, info.version, info.available_upgrades)
+path/to/studies/foo 8.8 (StudyVersion(major=9, minor=0, patch=0), StudyVersion(major=9, minor=2, patch=0))
+"""
+
+import concurrent.futures
+import csv
+import dataclasses
+import json
+import os
+import typing as t
+
+from antares.study.version.model.study_antares import STUDY_ANTARES_PATH, sniff_study_antares
+from antares.study.version.model.study_version import StudyVersion
+from antares.study.version.upgrade_app import UPGRADE_TEMPORARY_DIR_PREFIX, UPGRADE_TEMPORARY_DIR_SUFFIX
+from antares.study.version.upgrade_app.scenario_mapping import get_available_upgrades
+
+JSON_FORMAT = "json"
+NDJSON_FORMAT = "ndjson"
+CSV_FORMAT = "csv"
+OUTPUT_FORMATS = (JSON_FORMAT, NDJSON_FORMAT, CSV_FORMAT)
+
+PRUNED_DIRS = frozenset({"input", "output"})
+"""Names of the directories which are never explored, even outside a study."""
+
+R = t.TypeVar("R")
+
+Visitor = t.Callable[[str, "os.DirEntry[str]"], R]
+"""Function called with the path of a study directory and the directory entry of its ``study.antares`` file."""
+
+STUDY_ANTARES_KEYS = ("caption", "version", "created", "lastsave", "author")
+"""Keys of the ``[antares]`` section read for each study."""
+
+
+@dataclasses.dataclass(frozen=True)
+class StudyInfo:
+    """
+    Details of a study of the fleet.
+
+    Attributes:
+        path: Path of the study directory.
+        caption: Caption of the study.
+        version: Version of the study, or `None` if it is missing or invalid.
+        created_date: Creation date (timestamp), or `None` if it is missing or invalid.
+        last_save_date: Last save date (timestamp), or `None` if it is missing or invalid.
+        author: Author of the study.
+        available_upgrades: The versions to which the study can be upgraded.
+        error: Why the ``study.antares`` file could not be read, or an empty string.
+    """
+
+    path: str
+    caption: str = ""
+    version: t.Optional[StudyVersion] = None
+    created_date: t.Optional[int] = None
+    last_save_date: t.Optional[int] = None
+    author: str = ""
+    available_upgrades: t.Tuple[StudyVersion, ...] = ()
+    error: str = ""
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Serialize the object to a dictionary (the versions are formatted as "major.minor")."""
+        return {
+            "path": self.path,
+            "caption": self.caption,
+            "version": None if self.version is None else f"{self.version:2d}",
+            "created_date": self.created_date,
+            "last_save_date": self.last_save_date,
+            "author": self.author,
+            "available_upgrades": [f"{version:2d}" for version in self.available_upgrades],
+            "error": self.error,
+        }
+
+
+FIELD_NAMES = tuple(field.name for field in dataclasses.fields(StudyInfo))
+"""Names of the fields of a `StudyInfo`, in order (columns of an empty CSV output)."""
+
+
+def _parse_timestamp(value: t.Optional[str]) -> t.Optional[int]:
+    try:
+        return int(float(value))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def read_study_info(study_dir: t.Union[str, "os.PathLike[str]"]) -> StudyInfo:
+    """
+    Read the details of a study from its ``study.antares`` file.
+
+    Invalid files don't raise an exception: the reason is reported in the `error` field.
+
+    Args:
+        study_dir: Path of the study directory.
+
+    Returns:
+        The details of the study.
+    """
+    path = os.fspath(study_dir)
+    try:
+        fields = sniff_study_antares(path, STUDY_ANTARES_KEYS)
+    except OSError as e:
+        return StudyInfo(path, error=f"Cannot read '{STUDY_ANTARES_PATH}': {e}")
+    version = None
+    error = ""
+    if "version" not in fields:
+        error = "Missing version"
+    else:
+        try:
+            version = StudyVersion.parse(fields["version"])
+        except (TypeError, ValueError) as e:
+            error = f"Invalid version: {e}"
+    return StudyInfo(
+        path,
+        caption=fields.get("caption", ""),
+        version=version,
+        created_date=_parse_timestamp(fields.get("created")),
+        last_save_date=_parse_timestamp(fields.get("lastsave")),
+        author=fields.get("author", ""),
+        available_upgrades=() if version is None else get_available_upgrades(version),
+        error=error,
+    )
+
+
+def _is_pruned(name: str) -> bool:
+    return name in PRUNED_DIRS or (
+        name.startswith(UPGRADE_TEMPORARY_DIR_PREFIX) and name.endswith(UPGRADE_TEMPORARY_DIR_SUFFIX)
+    )
+
+
+def _scan_dir(path: str, visit: "Visitor[R]") -> t.Tuple[t.List[R], t.List[str]]:
+    """Visit the study, if the directory is a study, or return its subdirectories to explore."""
+    study_antares = None
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name == STUDY_ANTARES_PATH and entry.is_file():
+                    study_antares = entry
+                elif not _is_pruned(entry.name) and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+    except OSError:
+        # Unreadable or removed directory: nothing to report
+        return [], []
+    if study_antares is not None:
+        return [visit(path, study_antares)], []
+    return [], subdirs
+
+
+def walk_studies(
+    root_dirs: t.Iterable[t.Union[str, "os.PathLike[str]"]],
+    visit: "Visitor[R]",
+    max_workers: t.Optional[int] = None,
+) -> t.Iterator[R]:
+    """
+    Find the studies below some root directories and visit them, using a pool of threads.
+
+    The directories are explored concurrently: the results are yielded as soon as the studies are found,
+    in no particular order. The symbolic links to directories are not followed.
+
+    Args:
+        root_dirs: The root directories (a root directory can be a study itself).
+        visit: The function called, in a worker thread, with the path of each study directory
+            and the directory entry of its ``study.antares`` file.
+        max_workers: Maximum number of threads (see `ThreadPoolExecutor`).
+
+    Yields:
+        The result of the visit of each study.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    pending = {executor.submit(_scan_dir, os.fspath(root_dir), visit) for root_dir in root_dirs}
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                results, subdirs = future.result()
+                yield from results
+                pending.update(executor.submit(_scan_dir, subdir, visit) for subdir in subdirs)
+    finally:
+        # The iteration may be stopped early: don't explore the rest of the trees
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def scan_fleet(
+    root_dirs: t.Iterable[t.Union[str, "os.PathLike[str]"]],
+    max_workers: t.Optional[int] = None,
+) -> t.Iterator[StudyInfo]:
+    """
+    Find the studies below some root directories and read their details, using a pool of threads.
+
+    See `walk_studies` for the exploration of the directories.
+
+    Args:
+        root_dirs: The root directories (a root directory can be a study itself).
+        max_workers: Maximum number of threads (see `ThreadPoolExecutor`).
+
+    Yields:
+        The details of each study, in no particular order.
+    """
+    return walk_studies(root_dirs, lambda path, _entry: read_study_info(path), max_workers=max_workers)
+
+
+def write_study_infos(infos: t.Iterable[StudyInfo], file: t.TextIO, fmt: str = JSON_FORMAT) -> int:
+    """
+    Write the details of some studies, as they come (the whole list is never kept in memory).
+
+    Args:
+        infos: The details of the studies.
+        file: The output text file.
+        fmt: "json" (a list of objects), "ndjson" (one object per line) or "csv"
+            (the available upgrades are separated by spaces).
+
+    Returns:
+        The number of studies written.
+    """
+    count = 0
+    if fmt == JSON_FORMAT:
+        file.write("[")
+        for count, info in enumerate(infos, 1):
+            file.write(",\n" if count > 1 else "\n")
+            file.write(json.dumps(info.to_dict(), ensure_ascii=False))
+        file.write("\n]\n" if count else "]\n")
+    elif fmt == NDJSON_FORMAT:
+        for count, info in enumerate(infos, 1):
+            file.write(json.dumps(info.to_dict(), ensure_ascii=False) + "\n")
+    elif fmt == CSV_FORMAT:
+        # The columns are the keys of the first record: subclasses of `StudyInfo` may have more fields
+        writer = None
+        for count, info in enumerate(infos, 1):
+            row = info.to_dict()
+            row["available_upgrades"] = " ".join(row["available_upgrades"])
+            if writer is None:
+                writer = csv.DictWriter(file, fieldnames=list(row), lineterminator="\n")
+                writer.writeheader()
+            writer.writerow(row)
+        if writer is None:
+            csv.DictWriter(file, fieldnames=FIELD_NAMES, lineterminator="\n").writeheader()
+    else:
+        raise ValueError(f"Invalid output format: {fmt!r}, expected one of {OUTPUT_FORMATS}")
+    return count
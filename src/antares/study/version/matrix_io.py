@@ -0,0 +1,116 @@
+"""
+Fast reading and writing of the matrices of a study.
+
+The matrices (time series, link capacities, binding constraint terms...) are stored as headerless
+tab-separated values (TSV), one row per line (e.g. 8760 hourly rows).
+
+The writer produces the same bytes as `numpy.savetxt(file, matrix, delimiter="\\t", fmt="%.6f")`,
+but instead of formatting the rows one by one in a Python loop, it formats whole blocks of rows
+with a single `%` operation, and writes the result with a single call.
+"""
+
+import io
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from antares.study.version.fs import StudyFS
+
+MATRIX_FORMAT = "%.6f"
+"""Format of the values of the matrices written by the upgraders."""
+
+_BLOCK_SIZE = 1 << 16
+"""Number of values formatted at once (the formatted block is about 1 MiB)."""
+
+
+def read_matrix(fs: StudyFS, relpath: str) -> npt.NDArray[np.float64]:
+    """
+    Read a matrix: a headerless TSV file of numbers.
+
+    Args:
+        fs: The file system view of the study.
+        relpath: Relative path of the matrix file.
+
+    Returns:
+        A 2D array of floats; an empty file gives an array of shape `(0, 0)`.
+
+    Raises:
+        ValueError: If the file contains values which are not numbers.
+    """
+    if fs.size(relpath) == 0:
+        return np.zeros((0, 0), dtype=np.float64)
+    return parse_matrix(fs.read_bytes(relpath))
+
+
+def parse_matrix(data: bytes) -> npt.NDArray[np.float64]:
+    """
+    Parse the content of a matrix file (or a block of lines of a matrix file).
+
+    Args:
+        data: Headerless TSV content.
+
+    Returns:
+        A 2D array of floats; an empty content gives an array of shape `(0, 0)`.
+
+    Raises:
+        ValueError: If the content contains values which are not numbers.
+    """
+    if not data.strip():
+        return np.zeros((0, 0), dtype=np.float64)
+    try:
+        # Fast path: regular matrices are parsed by the C parser of NumPy
+        return np.loadtxt(io.BytesIO(data), delimiter="\t", dtype=np.float64, ndmin=2)
+    except ValueError:
+        # Irregular matrices (e.g. trailing tabulations, missing values) are parsed by Pandas,
+        # the dtype is given so that the values are converted directly, without type inference
+        df = pd.read_csv(io.BytesIO(data), sep="\t", header=None, dtype=np.float64)
+    return t.cast(npt.NDArray[np.float64], df.to_numpy())
+
+
+def format_matrix(matrix: npt.ArrayLike, fmt: str = MATRIX_FORMAT) -> str:
+    """
+    Format a matrix as headerless TSV, like `numpy.savetxt` does with `delimiter="\\t"`.
+
+    A 1D array is formatted as a column (one value per line).
+
+    Args:
+        matrix: The matrix to format (1D or 2D).
+        fmt: The format of a single value.
+
+    Returns:
+        The formatted matrix, each row ending with a newline.
+    """
+    array = np.asarray(matrix)
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    elif array.ndim != 2:
+        raise ValueError(f"Expected a 1D or 2D matrix, got an array of shape {array.shape}")
+    rows, columns = array.shape
+    if columns == 0:
+        return "\n" * rows
+
+    row_format = "\t".join([fmt] * columns) + "\n"
+    rows_per_block = max(1, _BLOCK_SIZE // columns)
+    blocks = []
+    for start in range(0, rows, rows_per_block):
+        block = array[start : start + rows_per_block]
+        # `tolist` converts the values to Python numbers, which are formatted like the NumPy scalars
+        blocks.append((row_format * len(block)) % tuple(block.ravel().tolist()))
+    return "".join(blocks)
+
+
+def write_matrix(fs: StudyFS, relpath: str, matrix: npt.ArrayLike, fmt: str = MATRIX_FORMAT) -> None:
+    """
+    Write a matrix as headerless TSV, with the same content as `numpy.savetxt` (`delimiter="\\t"`).
+
+    Args:
+        fs: The file system view of the study.
+        relpath: Relative path of the matrix file.
+        matrix: The matrix to write (1D or 2D).
+        fmt: The format of a single value.
+    """
+    text = format_matrix(matrix, fmt)
+    with fs.open(relpath, "w") as f:
+        f.write(text)
@@ -0,0 +1,386 @@
+"""
+Content-addressed store of matrices, used to resolve matrix links.
+
+Normalized studies (as managed by AntaREST) don't contain all their matrices: some matrix files
+are replaced by a link file (e.g. "input/links/fr/de.txt.link") which contains the URI
+of the matrix in a matrix store (e.g. "matrix://<id>").
+The matrix store is a directory which contains one TSV file per matrix, named after the matrix ID
+(e.g. "<store>/<id>.tsv").
+
+The denormalization replaces every link file by the matrix it refers to, so that the study
+can be upgraded. Since many links usually refer to the same matrices, the matrices read from
+the store are kept in an in-memory LRU cache.
+
+The normalization does the reverse: the matrix files of a study are moved into the store,
+identified by the SHA-256 hash of their content, and replaced by link files.
+Identical matrices (e.g. default time series) are thus stored only once.
+"""
+
+import collections
+import concurrent.futures
+import dataclasses
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import typing as t
+from pathlib import Path
+
+from antares.study.version.fs import DiskFS, StudyFS
+from antares.study.version.parallel import run_in_parallel
+
+logger = logging.getLogger(__name__)
+
+MATRIX_LINK_SUFFIX = ".link"
+"""Suffix of the link files, appended to the name of the matrix file (e.g. "de.txt.link")."""
+
+MATRIX_URI_PREFIX = "matrix://"
+"""Prefix of the URI of a matrix in the link files."""
+
+MATRIX_FILE_SUFFIXES = (".tsv", ".txt")
+"""Suffixes of the matrix files in the store, by order of preference."""
+
+DEFAULT_CACHE_SIZE = 128 * 1024 * 1024
+"""Default amount of memory (in bytes) used to cache the matrices read from the store."""
+
+MATRIX_DIR = "input"
+"""Directory of the study containing the matrices to normalize."""
+
+NON_MATRIX_FILES = frozenset({"input/areas/list.txt"})
+"""Text files of the `input` directory which are not matrices."""
+
+_HASH_BUFFER_SIZE = 1024 * 1024
+
+
+class MatrixStoreError(Exception):
+    """
+    Base class for the exceptions raised by the matrix store.
+    """
+
+
+class MatrixNotFoundError(MatrixStoreError):
+    """
+    Exception raised when a matrix is missing from the matrix store.
+    """
+
+    def __init__(self, matrix_id: str, store_dir: Path):
+        super().__init__(f"Matrix '{matrix_id}' not found in the matrix store '{store_dir}'")
+
+
+class InvalidMatrixLinkError(MatrixStoreError):
+    """
+    Exception raised when a link file doesn't contain a valid matrix URI.
+    """
+
+    def __init__(self, link_path: str, content: str):
+        super().__init__(f"Invalid matrix link '{link_path}': expected '{MATRIX_URI_PREFIX}<id>', got {content!r}")
+
+
+def parse_matrix_link(link_path: str, content: str) -> str:
+    """
+    Parse the content of a link file.
+
+    Args:
+        link_path: Relative path of the link file (used in error messages).
+        content: Content of the link file, like "matrix://<id>".
+
+    Returns:
+        The ID of the matrix.
+
+    Raises:
+        InvalidMatrixLinkError: If the content is not a valid matrix URI.
+    """
+    uri = content.strip()
+    matrix_id = uri[len(MATRIX_URI_PREFIX) :] if uri.startswith(MATRIX_URI_PREFIX) else ""
+    if not matrix_id or "/" in matrix_id or "\\" in matrix_id:
+        raise InvalidMatrixLinkError(link_path, content)
+    return matrix_id
+
+
+@dataclasses.dataclass
+class CacheInfo:
+    """
+    Statistics of the matrix cache.
+
+    Attributes:
+        hits: Number of matrices found in the cache.
+        misses: Number of matrices read from the store.
+        size: Amount of memory (in bytes) used by the cached matrices.
+        count: Number of cached matrices.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+    count: int = 0
+
+
+class MatrixStore:
+    """
+    Content-addressed store of matrices, in a local directory.
+
+    Args:
+        store_dir: The directory of the matrix store.
+        cache_size: Amount of memory (in bytes) used to cache the matrices read from the store.
+            The least recently used matrices are evicted first.
+    """
+
+    def __init__(self, store_dir: t.Union[str, Path], cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.store_dir = Path(store_dir)
+        self.cache_size = cache_size
+        self._cache: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+        self._cache_info = CacheInfo()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.store_dir)!r})"
+
+    def exists(self, matrix_id: str) -> bool:
+        """Check if a matrix exists in the store."""
+        return any(self.store_dir.joinpath(f"{matrix_id}{suffix}").is_file() for suffix in MATRIX_FILE_SUFFIXES)
+
+    def path(self, matrix_id: str) -> Path:
+        """
+        Return the path of a matrix file in the store.
+
+        Raises:
+            MatrixNotFoundError: If the matrix doesn't exist.
+        """
+        for suffix in MATRIX_FILE_SUFFIXES:
+            path = self.store_dir.joinpath(f"{matrix_id}{suffix}")
+            if path.is_file():
+                return path
+        raise MatrixNotFoundError(matrix_id, self.store_dir)
+
+    def get(self, matrix_id: str) -> bytes:
+        """
+        Return the content of a matrix file, from the cache if possible.
+
+        Args:
+            matrix_id: The ID of the matrix.
+
+        Returns:
+            The content of the matrix file (tab-separated values).
+
+        Raises:
+            MatrixNotFoundError: If the matrix doesn't exist.
+        """
+        with self._lock:
+            content = self._cache.get(matrix_id)
+            if content is not None:
+                self._cache.move_to_end(matrix_id)
+                self._cache_info.hits += 1
+                return content
+            self._cache_info.misses += 1
+
+        # The file is read outside the lock, so that the workers can read several matrices at the same time
+        content = self.path(matrix_id).read_bytes()
+        if len(content) <= self.cache_size:
+            with self._lock:
+                if matrix_id not in self._cache:
+                    self._cache[matrix_id] = content
+                    self._cache_info.size += len(content)
+                while self._cache_info.size > self.cache_size:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_info.size -= len(evicted)
+        return content
+
+    def import_file(self, path: Path, matrix_id: str) -> bool:
+        """
+        Add a matrix file to the store, unless the matrix already exists.
+
+        The file is hard-linked into the store when possible (copied otherwise): the caller can then
+        remove the original file, which is equivalent to a move.
+
+        Args:
+            path: Path of the matrix file.
+            matrix_id: The ID of the matrix (see `compute_matrix_id`).
+
+        Returns:
+            `True` if the matrix was added to the store, `False` if it already existed.
+        """
+        if self.exists(matrix_id):
+            return False
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        dst_path = self.store_dir.joinpath(f"{matrix_id}{MATRIX_FILE_SUFFIXES[0]}")
+        try:
+            os.link(path, dst_path)
+        except FileExistsError:
+            return False
+        except OSError:
+            # The file is copied under a temporary name, so that the store never contains partial matrices
+            fd, tmp_name = tempfile.mkstemp(suffix=".tmp", prefix=f"~{matrix_id}", dir=self.store_dir)
+            os.close(fd)
+            try:
+                shutil.copyfile(path, tmp_name)
+                os.replace(tmp_name, dst_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        return True
+
+    def cache_info(self) -> CacheInfo:
+        """Return the statistics of the matrix cache."""
+        with self._lock:
+            return dataclasses.replace(self._cache_info, count=len(self._cache))
+
+    def clear_cache(self) -> None:
+        """Clear the matrix cache."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_info = CacheInfo()
+
+
+def find_matrix_links(fs: StudyFS) -> t.List[str]:
+    """
+    Find the link files of a study: the `*.link` files of the `input` directory.
+
+    The other directories (`output`, `user`...) are not explored: they may be large and never contain links.
+
+    Args:
+        fs: The file system view of the study.
+
+    Returns:
+        The relative paths of the link files, in alphabetical order.
+    """
+    if not fs.is_dir(MATRIX_DIR):
+        return []
+    return [relpath for relpath, is_dir in fs.walk(MATRIX_DIR) if not is_dir and relpath.endswith(MATRIX_LINK_SUFFIX)]
+
+
+def denormalize_study(fs: StudyFS, store: MatrixStore, max_workers: t.Optional[int] = None) -> int:
+    """
+    Replace the link files of a study by the matrices they refer to.
+
+    Args:
+        fs: The file system view of the study.
+        store: The matrix store used to resolve the links.
+        max_workers: Maximum number of threads used to resolve the links (see `ThreadPoolExecutor`).
+
+    Returns:
+        The number of resolved links.
+
+    Raises:
+        InvalidMatrixLinkError: If a link file is invalid (the first one, in alphabetical order).
+        MatrixNotFoundError: If a matrix is missing from the store (for the first link, in alphabetical order).
+    """
+
+    def resolve(link_path: str) -> None:
+        matrix_id = parse_matrix_link(link_path, fs.read_text(link_path))
+        fs.write_bytes(link_path[: -len(MATRIX_LINK_SUFFIX)], store.get(matrix_id))
+        fs.unlink(link_path)
+
+    link_paths = find_matrix_links(fs)
+    if not link_paths:
+        return 0
+    # In case of errors, the exception of the first invalid link (in alphabetical order) is raised
+    run_in_parallel(resolve, link_paths, max_workers=max_workers)
+    logger.info(f"Resolved {len(link_paths)} matrix links: {store.cache_info()}")
+    return len(link_paths)
+
+
+def compute_matrix_id(path: Path) -> str:
+    """
+    Compute the ID of a matrix file: the SHA-256 hash of its content.
+
+    Args:
+        path: Path of the matrix file.
+
+    Returns:
+        The hexadecimal digest of the content.
+    """
+    digest = hashlib.sha256()
+    with open(path, mode="rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_BUFFER_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_matrix_files(study_dir: Path) -> t.List[str]:
+    """
+    Find the matrix files of a study which can be normalized: the non-empty `*.txt` files of the `input` directory.
+
+    Args:
+        study_dir: The study directory.
+
+    Returns:
+        The relative paths of the matrix files.
+    """
+    fs = DiskFS(study_dir)
+    if not fs.is_dir(MATRIX_DIR):
+        return []
+    return [
+        relpath
+        for relpath, is_dir in fs.walk(MATRIX_DIR)
+        if not is_dir and relpath.endswith(".txt") and relpath not in NON_MATRIX_FILES and fs.size(relpath) > 0
+    ]
+
+
+@dataclasses.dataclass
+class NormalizeSummary:
+    """
+    Summary of the normalization of a study.
+
+    Attributes:
+        files: Number of matrix files replaced by link files.
+        matrices: Number of distinct matrices among these files.
+        added: Number of matrices added to the store (the others were already in the store).
+        files_size: Total size of the matrix files replaced by link files.
+        added_size: Total size of the matrices added to the store.
+        links_size: Total size of the link files.
+    """
+
+    files: int = 0
+    matrices: int = 0
+    added: int = 0
+    files_size: int = 0
+    added_size: int = 0
+    links_size: int = 0
+
+    @property
+    def space_saved(self) -> int:
+        """Disk space saved by the normalization, taking the matrices added to the store into account."""
+        return self.files_size - self.added_size - self.links_size
+
+
+def normalize_study(study_dir: Path, store: MatrixStore, max_workers: t.Optional[int] = None) -> NormalizeSummary:
+    """
+    Move the matrix files of a study into a matrix store, and replace them by link files.
+
+    The files are hashed in parallel, then each distinct matrix is added once to the store.
+    A matrix file is only removed once its content is in the store and its link file is written.
+
+    Args:
+        study_dir: The study directory.
+        store: The matrix store.
+        max_workers: Maximum number of threads used to hash the files (see `ThreadPoolExecutor`).
+
+    Returns:
+        The summary of the normalization.
+    """
+    relpaths = find_matrix_files(study_dir)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        matrix_ids = list(executor.map(compute_matrix_id, (study_dir / relpath for relpath in relpaths)))
+
+    files_by_matrix: t.Dict[str, t.List[str]] = collections.defaultdict(list)
+    for relpath, matrix_id in zip(relpaths, matrix_ids):
+        files_by_matrix[matrix_id].append(relpath)
+
+    summary = NormalizeSummary(matrices=len(files_by_matrix))
+    for matrix_id, matrix_relpaths in files_by_matrix.items():
+        matrix_size = study_dir.joinpath(matrix_relpaths[0]).stat().st_size
+        if store.import_file(study_dir / matrix_relpaths[0], matrix_id):
+            summary.added += 1
+            summary.added_size += matrix_size
+        link_content = f"{MATRIX_URI_PREFIX}{matrix_id}"
+        for relpath in matrix_relpaths:
+            study_dir.joinpath(f"{relpath}{MATRIX_LINK_SUFFIX}").write_text(link_content, encoding="utf-8")
+            study_dir.joinpath(relpath).unlink()
+            summary.files += 1
+            summary.files_size += matrix_size
+            summary.links_size += len(link_content)
+
+    logger.info(f"Normalized {summary.files} matrix files, {summary.space_saved} bytes saved")
+    return summary
@@ -1,7 +1,19 @@
-from pathlib import Path
+"""
+Lazy model of the `settings/generaldata.ini` file.
 
+The "generaldata.ini" file may contain very large sections, like `[playlist]` or `[variables selection]`,
+which most upgraders never touch. The :class:`GeneralData` dictionary splits the file into section blocks
+and parses a section only on first access: the sections which were never accessed are written back as
+their original text, so the cost of an upgrade is proportional to the size of the sections it uses.
+"""
+
+import io
+import typing as t
+
+from antares.study.version.fs import StudyDir, ZipFS, as_study_fs
 from antares.study.version.ini_reader import IniReader
 from antares.study.version.ini_writer import IniWriter
+from antares.study.version.model.playlist import PLAYLIST_SECTION, Playlist
 
 GENERAL_DATA_PATH = "settings/generaldata.ini"
 
@@ -14,15 +26,206 @@ DUPLICATE_KEYS = [
 ]
 
 
-class GeneralData(dict):
+class _RawSection:
+    """Original text of a section which was not parsed yet (header line included)."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+def split_sections(text: str) -> t.Optional[t.Dict[str, str]]:
+    """
+    Split the text of an INI file into section blocks.
+
+    Each block contains the section header and the following lines, up to the next section header.
+    The blocks of duplicate sections are concatenated.
+
+    Args:
+        text: The text of the INI file.
+
+    Returns:
+        The text of each section, or `None` if some options are defined before the first section.
+    """
+    blocks: t.Dict[str, t.List[str]] = {}
+    current: t.Optional[t.List[str]] = None
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith("["):
+            current = blocks.setdefault(stripped[1:-1], [])
+        elif current is None:
+            if stripped and not stripped.startswith((";", "#")):
+                return None
+            continue  # comments before the first section are dropped, like the `IniWriter` does
+        if not line.endswith("\n"):
+            line += "\n"
+        current.append(line)
+    return {name: "".join(lines) for name, lines in blocks.items()}
+
+
+class GeneralData(dict):  # type: ignore[type-arg]
+    """
+    Sections of the `settings/generaldata.ini` file.
+
+    When read with `from_ini_file`, the sections are parsed on first access (`data["section"]`,
+    `data.get("section")`, `data.items()`...), and the sections never accessed are written back
+    verbatim by `to_ini_file`.
+    """
+
     @classmethod
-    def from_ini_file(cls, study_dir: Path) -> "GeneralData":
-        reader = IniReader(special_keys=DUPLICATE_KEYS)
-        ini_path = study_dir / GENERAL_DATA_PATH
-        data = reader.read(ini_path)
-        return cls(**data)
+    def from_ini_file(cls, study_dir: StudyDir) -> "GeneralData":
+        fs = as_study_fs(study_dir)
+        try:
+            text = fs.read_text(GENERAL_DATA_PATH)
+        except FileNotFoundError:
+            return cls()
+        finally:
+            # The ZIP archive is only closed if it was opened here
+            if fs is not study_dir and isinstance(fs, ZipFS):
+                fs.close()
+        sections = split_sections(text)
+        if sections is None:
+            # Unusual file: parse everything
+            data = IniReader(special_keys=DUPLICATE_KEYS).read(io.StringIO(text))
+            return cls(**data)
+        data = cls()
+        for name, section_text in sections.items():
+            dict.__setitem__(data, name, _RawSection(section_text))
+        return data
 
-    def to_ini_file(self, study_dir: Path) -> None:
+    def to_ini_file(self, study_dir: StudyDir) -> None:
+        self._attach_playlist()
         writer = IniWriter(special_keys=DUPLICATE_KEYS)
-        ini_path = study_dir / GENERAL_DATA_PATH
-        writer.write(self, ini_path)
+        with as_study_fs(study_dir).open(GENERAL_DATA_PATH, "w") as f:
+            for name, section in dict.items(self):
+                if isinstance(section, _RawSection):
+                    f.write(section.text)
+                elif isinstance(section, Playlist):
+                    f.write(section.to_text())
+                else:
+                    writer.write({name: section}, f)
+
+    @property
+    def playlist(self) -> Playlist:
+        """
+        NumPy view of the `[playlist]` section, for vectorized edits.
+
+        The view is written back straight to repeated lines by `to_ini_file` (as it was read, if it was not modified).
+        Accessing the section through the dictionary API (`data["playlist"]`) converts it back to a dictionary.
+        If the section is missing, it is only added once the view is modified.
+        """
+        value = dict.get(self, PLAYLIST_SECTION)
+        if isinstance(value, Playlist):
+            return value
+        nb_years = int(self.get("general", {}).get("nbyears", 1))
+        if value is None:
+            new_playlist: t.Optional[Playlist] = self.__dict__.get("_new_playlist")
+            if new_playlist is None:
+                new_playlist = self.__dict__["_new_playlist"] = Playlist(nb_years)
+            return new_playlist
+        if isinstance(value, _RawSection):
+            playlist = Playlist.from_text(value.text, nb_years)
+        else:
+            playlist = Playlist.from_section(value, nb_years)
+        dict.__setitem__(self, PLAYLIST_SECTION, playlist)
+        return playlist
+
+    def _attach_playlist(self) -> None:
+        """Add the view of a missing `[playlist]` section to the sections, once it is modified."""
+        new_playlist: t.Optional[Playlist] = self.__dict__.get("_new_playlist")
+        if new_playlist is None:
+            return
+        if dict.__contains__(self, PLAYLIST_SECTION):
+            # The section was set in the meantime: the view is outdated
+            del self.__dict__["_new_playlist"]
+        elif new_playlist.modified:
+            del self.__dict__["_new_playlist"]
+            dict.__setitem__(self, PLAYLIST_SECTION, new_playlist)
+
+    def is_parsed(self, section: str) -> bool:
+        """Check whether a section was parsed (or set), as opposed to kept as its original text."""
+        return not isinstance(dict.__getitem__(self, section), _RawSection)
+
+    def _parse(self, name: str, value: t.Any) -> t.Any:
+        if isinstance(value, _RawSection):
+            sections = IniReader(special_keys=DUPLICATE_KEYS).read(io.StringIO(value.text))
+            value = sections.get(name, {})
+            dict.__setitem__(self, name, value)
+        elif isinstance(value, Playlist):
+            value = value.to_section()
+            dict.__setitem__(self, name, value)
+        return value
+
+    def _parse_all(self) -> None:
+        self._attach_playlist()
+        for name, value in list(dict.items(self)):
+            self._parse(name, value)
+
+    def __getitem__(self, key: str) -> t.Any:
+        self._attach_playlist()
+        return self._parse(key, dict.__getitem__(self, key))
+
+    def __iter__(self) -> t.Iterator[str]:
+        # Overriding `__iter__` also makes `dict(data)` and `{**data}` use `__getitem__`
+        self._attach_playlist()
+        return dict.__iter__(self)
+
+    def __contains__(self, key: object) -> bool:
+        self._attach_playlist()
+        return dict.__contains__(self, key)
+
+    def __len__(self) -> int:
+        self._attach_playlist()
+        return dict.__len__(self)
+
+    def keys(self) -> t.KeysView[str]:  # type: ignore[override]
+        self._attach_playlist()
+        return dict.keys(self)
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: str, default: t.Any = None) -> t.Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *args: t.Any) -> t.Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *args)
+
+    def popitem(self) -> t.Tuple[str, t.Any]:
+        self._attach_playlist()
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def values(self) -> t.ValuesView[t.Any]:  # type: ignore[override]
+        self._parse_all()
+        return dict.values(self)
+
+    def items(self) -> t.ItemsView[str, t.Any]:  # type: ignore[override]
+        self._parse_all()
+        return dict.items(self)
+
+    def copy(self) -> "GeneralData":
+        self._parse_all()
+        return GeneralData(dict.items(self))
+
+    def __eq__(self, other: object) -> bool:
+        self._parse_all()
+        if isinstance(other, GeneralData):
+            other._parse_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._parse_all()
+        return f"{self.__class__.__name__}({dict.__repr__(self)})"
@@ -0,0 +1,284 @@
+"""
+NumPy view of the Monte-Carlo playlist of a study (`[playlist]` section of `settings/generaldata.ini`).
+
+The playlist is stored as repeated options, one line per year::
+
+    [playlist]
+    playlist_reset = false
+    playlist_year + = 0
+    playlist_year + = 2
+    playlist_year_weight = 2,1.5
+
+With thousands of Monte-Carlo years, handling these options as lists of Python scalars is slow.
+The :class:`Playlist` holds one boolean activation array and one weight array, supports vectorized
+edits, and is serialized straight to repeated lines.
+
+A playlist read from a file keeps its original section: as long as the years, the weights and the options
+are not changed, the section is written back as it was (same form, same lines, same values).
+Once changed, the shortest form is written, and the values are formatted like the INI writer does
+(see `format_ini_value`), except the values which were not changed, written back as they were read.
+
+Usage:
+
+>>> from antares.study.version.model.playlist import Playlist
+
+>>> playlist = Playlist(nb_years=5, active=False)
+>>> playlist.enable(slice(1, 3))
+>>> playlist.set_weights([2], 1.5)
+>>> playlist.active_years.tolist()
+[1, 2]
+>>> print(playlist.to_text(), end="")
+[playlist]
+playlist_reset = false
+playlist_year + = 1
+playlist_year + = 2
+playlist_year_weight = 2,1.5
+<BLANKLINE>
+"""
+
+import io
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from antares.study.version.ini_writer import IniWriter, format_ini_value
+
+PLAYLIST_SECTION = "playlist"
+PLAYLIST_RESET = "playlist_reset"
+PLAYLIST_YEAR_PLUS = "playlist_year +"
+PLAYLIST_YEAR_MINUS = "playlist_year -"
+PLAYLIST_YEAR_WEIGHT = "playlist_year_weight"
+
+_PLAYLIST_KEYS = {PLAYLIST_RESET, PLAYLIST_YEAR_PLUS, PLAYLIST_YEAR_MINUS, PLAYLIST_YEAR_WEIGHT}
+
+YearSelection = t.Union[None, int, slice, t.Sequence[int], npt.NDArray[t.Any]]
+"""Selection of years (0-based indices): an index, a slice, a sequence, an array or a boolean mask, `None` for all."""
+
+
+def _as_bool(value: t.Any) -> bool:
+    return value if isinstance(value, bool) else str(value).strip().lower() == "true"
+
+
+class Playlist:
+    """
+    Monte-Carlo playlist: activation and weight of each year.
+
+    Args:
+        nb_years: Number of Monte-Carlo years of the study.
+        active: Initial activation of the years (all the years are active by default).
+        options: Other options of the `[playlist]` section, written back unchanged.
+
+    Attributes:
+        active: Boolean array: whether each year is played.
+        weights: Float array: weight of each year (1 by default).
+    """
+
+    def __init__(self, nb_years: int, active: bool = True, options: t.Optional[t.Dict[str, t.Any]] = None) -> None:
+        self.active: npt.NDArray[np.bool_] = np.full(nb_years, active, dtype=np.bool_)
+        self.weights: npt.NDArray[np.float64] = np.ones(nb_years, dtype=np.float64)
+        self.options: t.Dict[str, t.Any] = dict(options or {})
+        # Original text of the values read from a file: `(value, text)` by option and by weighted year
+        self._texts: t.Dict[str, t.Tuple[t.Any, str]] = {}
+        self._weight_texts: t.Dict[int, t.Tuple[float, str]] = {}
+        # Original section (text or parsed options), written back as is while the playlist is not modified
+        self._source: t.Union[None, str, t.Dict[str, t.Any]] = None
+        self._snapshot()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(nb_years={self.nb_years}, active_years={self.active_years.size})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Playlist):
+            return NotImplemented
+        return (
+            np.array_equal(self.active, other.active)
+            and np.array_equal(self.weights, other.weights)
+            and self.options == other.options
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def nb_years(self) -> int:
+        """Number of Monte-Carlo years."""
+        return int(self.active.size)
+
+    @property
+    def active_years(self) -> npt.NDArray[np.intp]:
+        """Indices of the active years."""
+        return np.flatnonzero(self.active)
+
+    @property
+    def modified(self) -> bool:
+        """Whether the years, the weights or the options were changed since the playlist was created."""
+        active, weights, options = self._original
+        return not (
+            np.array_equal(self.active, active) and np.array_equal(self.weights, weights) and self.options == options
+        )
+
+    def _snapshot(self) -> None:
+        self._original = (self.active.copy(), self.weights.copy(), dict(self.options))
+
+    # Construction
+    # ------------
+
+    @classmethod
+    def from_section(cls, section: t.Mapping[str, t.Any], nb_years: int) -> "Playlist":
+        """
+        Create a playlist from a parsed `[playlist]` section.
+
+        Args:
+            section: Options of the section, as parsed with the duplicate keys of `GeneralData`.
+            nb_years: Number of Monte-Carlo years of the study.
+        """
+        options = {key: value for key, value in section.items() if key not in _PLAYLIST_KEYS}
+        playlist = cls(nb_years, active=_as_bool(section.get(PLAYLIST_RESET, True)), options=options)
+        playlist._apply(
+            section.get(PLAYLIST_YEAR_PLUS, []),
+            section.get(PLAYLIST_YEAR_MINUS, []),
+            section.get(PLAYLIST_YEAR_WEIGHT, []),
+        )
+        playlist._source = {key: list(value) if isinstance(value, list) else value for key, value in section.items()}
+        playlist._snapshot()
+        return playlist
+
+    @classmethod
+    def from_text(cls, text: str, nb_years: int) -> "Playlist":
+        """
+        Create a playlist from the text of the `[playlist]` section, without the generic INI parsing.
+
+        Args:
+            text: Text of the section (the header line is optional).
+            nb_years: Number of Monte-Carlo years of the study.
+        """
+        from antares.study.version.ini_reader import convert_value
+
+        reset: t.Any = True
+        plus: t.List[str] = []
+        minus: t.List[str] = []
+        year_weights: t.List[str] = []
+        targets = {PLAYLIST_YEAR_PLUS: plus, PLAYLIST_YEAR_MINUS: minus, PLAYLIST_YEAR_WEIGHT: year_weights}
+        options: t.Dict[str, t.Any] = {}
+        texts: t.Dict[str, t.Tuple[t.Any, str]] = {}
+        for line in text.splitlines():
+            key, sep, value = line.partition("=")
+            if not sep or line.lstrip().startswith((";", "#", "[")):
+                continue
+            key, value = key.strip(), value.strip()
+            if key in targets:
+                targets[key].append(value)
+            elif key == PLAYLIST_RESET:
+                reset = value
+                texts[key] = (_as_bool(value), value)
+            else:
+                options[key] = convert_value(value)
+                texts[key] = (options[key], value)
+        playlist = cls(nb_years, active=_as_bool(reset), options=options)
+        playlist._texts = texts
+        playlist._apply(plus, minus, year_weights)
+        header = f"[{PLAYLIST_SECTION}]"
+        playlist._source = text if text.lstrip().startswith(header) else f"{header}\n{text}"
+        playlist._snapshot()
+        return playlist
+
+    def _apply(self, plus: t.Sequence[t.Any], minus: t.Sequence[t.Any], year_weights: t.Sequence[t.Any]) -> None:
+        # Years out of range are ignored, like the solver does
+        plus_years = np.asarray(plus, dtype=np.int64).ravel()
+        self.active[plus_years[(plus_years >= 0) & (plus_years < self.nb_years)]] = True
+        minus_years = np.asarray(minus, dtype=np.int64).ravel()
+        self.active[minus_years[(minus_years >= 0) & (minus_years < self.nb_years)]] = False
+        if len(year_weights):
+            items = [str(value).split(",", 1) for value in year_weights]
+            pairs = np.array(items, dtype=np.float64).reshape(-1, 2)
+            years = pairs[:, 0].astype(np.int64)
+            in_range = (years >= 0) & (years < self.nb_years)
+            self.weights[years[in_range]] = pairs[in_range, 1]
+            self._weight_texts.update(
+                (year, (weight, item[1].strip()))
+                for year, weight, item in zip(years.tolist(), pairs[:, 1].tolist(), items)
+            )
+
+    # Vectorized edits
+    # ----------------
+
+    @staticmethod
+    def _select(years: YearSelection) -> t.Any:
+        return slice(None) if years is None else years
+
+    def enable(self, years: YearSelection = None) -> None:
+        """Activate the selected years (all the years by default)."""
+        self.active[self._select(years)] = True
+
+    def disable(self, years: YearSelection = None) -> None:
+        """Deactivate the selected years (all the years by default)."""
+        self.active[self._select(years)] = False
+
+    def set_weights(self, years: YearSelection, weights: t.Union[float, t.Sequence[float], npt.NDArray[t.Any]]) -> None:
+        """
+        Set the weight of the selected years.
+
+        Args:
+            years: The selected years, `None` for all.
+            weights: One weight for all the selected years, or one weight per selected year.
+        """
+        self.weights[self._select(years)] = weights
+
+    # Serialization
+    # -------------
+
+    def to_section(self) -> t.Dict[str, t.Any]:
+        """Return the options of the `[playlist]` section, as parsed with the duplicate keys of `GeneralData`."""
+        if not self.modified and isinstance(self._source, dict):
+            return {key: list(value) if isinstance(value, list) else value for key, value in self._source.items()}
+        if not self.modified and isinstance(self._source, str):
+            from antares.study.version.ini_reader import IniReader
+
+            reader = IniReader(special_keys=[PLAYLIST_YEAR_PLUS, PLAYLIST_YEAR_MINUS, PLAYLIST_YEAR_WEIGHT])
+            return t.cast(t.Dict[str, t.Any], reader.read(io.StringIO(self._source)).get(PLAYLIST_SECTION, {}))
+        reset, key, years = self._year_lines()
+        section: t.Dict[str, t.Any] = {PLAYLIST_RESET: reset, **self.options}
+        if years.size:
+            section[key] = years.tolist()
+        weighted = np.flatnonzero(self.weights != 1.0)
+        if weighted.size:
+            section[PLAYLIST_YEAR_WEIGHT] = self._weight_values(weighted)
+        return section
+
+    def to_text(self) -> str:
+        """Return the text of the `[playlist]` section, header line included."""
+        if not self.modified and isinstance(self._source, str):
+            return self._source if self._source.endswith("\n") else f"{self._source}\n"
+        if not self.modified and isinstance(self._source, dict):
+            buffer = io.StringIO()
+            writer = IniWriter(special_keys=[PLAYLIST_YEAR_PLUS, PLAYLIST_YEAR_MINUS, PLAYLIST_YEAR_WEIGHT])
+            writer.write({PLAYLIST_SECTION: self._source}, buffer)
+            return buffer.getvalue()
+        reset, key, years = self._year_lines()
+        lines = [f"[{PLAYLIST_SECTION}]", f"{PLAYLIST_RESET} = {self._format(PLAYLIST_RESET, reset)}"]
+        lines.extend(f"{name} = {self._format(name, value)}" for name, value in self.options.items())
+        lines.extend(f"{key} = {year}" for year in years.tolist())
+        weighted = np.flatnonzero(self.weights != 1.0)
+        lines.extend(f"{PLAYLIST_YEAR_WEIGHT} = {value}" for value in self._weight_values(weighted))
+        return "\n".join(lines) + "\n\n"
+
+    def _format(self, key: str, value: t.Any) -> str:
+        # The original text is kept while the value is unchanged (`True == 1`, so the types are compared too)
+        original = self._texts.get(key)
+        if original is not None and type(original[0]) is type(value) and original[0] == value:
+            return original[1]
+        return format_ini_value(value)
+
+    def _weight_values(self, weighted: npt.NDArray[np.intp]) -> t.List[str]:
+        values = []
+        for year, weight in zip(weighted.tolist(), self.weights[weighted].tolist()):
+            original = self._weight_texts.get(year)
+            text = original[1] if original is not None and original[0] == weight else format_ini_value(weight)
+            values.append(f"{year},{text}")
+        return values
+
+    def _year_lines(self) -> t.Tuple[bool, str, npt.NDArray[np.intp]]:
+        # The shortest form is used: list the active years, or reset and list the inactive years
+        if 2 * np.count_nonzero(self.active) > self.nb_years:
+            return True, PLAYLIST_YEAR_MINUS, np.flatnonzero(~self.active)
+        return False, PLAYLIST_YEAR_PLUS, np.flatnonzero(self.active)
@@ -1,16 +1,122 @@
 import configparser
 import dataclasses
 import datetime
+import functools
+import os
 import textwrap
 import typing as t
 from pathlib import Path
 
+from antares.study.version.fs import StudyDir, StudyFS, ZipFS, as_study_fs, is_zip_study
+
 from .exceptions import ValidationError
 from .study_version import StudyVersion
 
 STUDY_ANTARES_PATH = "study.antares"
 DOTTED_VERSION = "9.0"
 
+SNIFF_SIZE = 4096
+"""Number of bytes of the ``study.antares`` file read first by `sniff_study_antares`: the whole file in practice."""
+
+
+def _read_head(study_dir: StudyDir, size: int) -> bytes:
+    """Read the first bytes of the ``study.antares`` file (the whole file if `size` is negative)."""
+    if isinstance(study_dir, StudyFS):
+        with study_dir.open(STUDY_ANTARES_PATH, "rb") as f:
+            return t.cast(bytes, f.read(size))
+    if is_zip_study(study_dir):
+        fs = as_study_fs(study_dir)
+        try:
+            return _read_head(fs, size)
+        finally:
+            t.cast(ZipFS, fs).close()
+    path = os.path.join(study_dir, STUDY_ANTARES_PATH)
+    if size < 0:
+        return Path(path).read_bytes()
+    # Fast path for a study directory: no file system view, no buffered file object
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _parse_fields(data: bytes, keys: t.Collection[str]) -> t.Dict[str, str]:
+    """Extract the values of some keys of the ``[antares]`` section."""
+    start = data.find(b"[antares]")
+    if start < 0:
+        return {}
+    section = data[start + len(b"[antares]") :]
+    end = section.find(b"\n[")
+    if end >= 0:
+        section = section[:end]
+    wanted = {key.encode("ascii"): key for key in keys}
+    fields: t.Dict[str, str] = {}
+    for line in section.splitlines():
+        name, sep, value = line.partition(b"=")
+        key = wanted.get(name.strip().lower()) if sep else None
+        if key is not None and key not in fields:
+            try:
+                fields[key] = value.strip().decode("utf-8")
+            except UnicodeDecodeError:
+                fields[key] = value.strip().decode("cp1252", errors="replace")
+            if len(fields) == len(wanted):
+                break
+    return fields
+
+
+def sniff_study_antares(study_dir: StudyDir, keys: t.Collection[str] = ("version",)) -> t.Dict[str, str]:
+    """
+    Read only some fields of a ``study.antares`` file, without parsing nor validating the whole file.
+
+    Only the first `SNIFF_SIZE` bytes of the file are read, unless some keys are not found there.
+
+    Args:
+        study_dir: Path to the study directory (or ZIP archive), or file system view of the study.
+        keys: The keys to extract from the ``[antares]`` section (e.g. "version", "caption").
+
+    Returns:
+        The raw values of the keys found in the file.
+
+    Raises:
+        FileNotFoundError: If the ``study.antares`` file is missing.
+    """
+    data = _read_head(study_dir, SNIFF_SIZE)
+    fields = _parse_fields(data, keys)
+    if len(fields) < len(keys) and len(data) == SNIFF_SIZE:
+        fields = _parse_fields(_read_head(study_dir, -1), keys)
+    return fields
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_version(value: str) -> StudyVersion:
+    return StudyVersion.parse(value)
+
+
+def read_study_version(study_dir: StudyDir) -> StudyVersion:
+    """
+    Read the version of a study, without parsing nor validating the whole ``study.antares`` file.
+
+    The versions are cached: all the studies of the same version share the same `StudyVersion` object.
+
+    Args:
+        study_dir: Path to the study directory (or ZIP archive), or file system view of the study.
+
+    Returns:
+        The version of the study.
+
+    Raises:
+        FileNotFoundError: If the ``study.antares`` file is missing.
+        ValidationError: If the version is missing or invalid.
+    """
+    value = sniff_study_antares(study_dir, ("version",)).get("version")
+    if value is None:
+        raise ValidationError("Invalid 'study.antares' file", {"version": "Field required"})
+    try:
+        return _parse_version(value)
+    except (ValueError, TypeError) as error:
+        raise ValidationError("Invalid 'study.antares' file", {"version": str(error)}) from None
+
 
 @dataclasses.dataclass(frozen=False, eq=False, order=False, unsafe_hash=False, init=True, repr=True)
 class StudyAntares:
@@ -131,19 +237,25 @@ class StudyAntares:
         }
 
     @classmethod
-    def from_ini_file(cls, study_dir: t.Union[str, Path]) -> "StudyAntares":
+    def from_ini_file(cls, study_dir: StudyDir) -> "StudyAntares":
         """
         Parse a ``study.antares`` file and return a new instance of the object.
 
         Args:
-            study_dir: Path to the study directory.
+            study_dir: Path to the study directory (or ZIP archive), or file system view of the study.
 
         Returns:
             A new instance of the object.
         """
-        ini_path = Path(study_dir) / STUDY_ANTARES_PATH
+        fs = as_study_fs(study_dir)
         parser = configparser.ConfigParser()
-        parser.read(ini_path, encoding="utf-8")
+        try:
+            if fs.is_file(STUDY_ANTARES_PATH):
+                parser.read_string(fs.read_text(STUDY_ANTARES_PATH, encoding="utf-8"))
+        finally:
+            # The ZIP archive is only closed if it was opened here
+            if fs is not study_dir and isinstance(fs, ZipFS):
+                fs.close()
         section = parser["antares"]
         return cls(
             caption=section["caption"],
@@ -153,12 +265,12 @@ class StudyAntares:
             author=section["author"],
         )
 
-    def to_ini_file(self, study_dir: t.Union[str, Path], update_save_date: bool = True) -> None:
+    def to_ini_file(self, study_dir: StudyDir, update_save_date: bool = True) -> None:
         """
         Serialize the object to a ``study.antares`` file.
 
         Args:
-            study_dir: Path to the study directory.
+            study_dir: Path to the study directory, or file system view of the study.
             update_save_date: If True, update the ``last_save_date`` field to the current date and time.
         """
         if update_save_date:
@@ -177,8 +289,7 @@ class StudyAntares:
 
         parser = configparser.ConfigParser()
         parser["antares"] = section_dict
-        ini_path = Path(study_dir) / STUDY_ANTARES_PATH
-        with ini_path.open(mode="w", encoding="utf-8") as file:
+        with as_study_fs(study_dir).open(STUDY_ANTARES_PATH, mode="w", encoding="utf-8") as file:
             parser.write(file)
 
     # Human-readable representation
@@ -0,0 +1,179 @@
+"""
+Index of the entities of a study: areas, links, clusters, storages and binding constraints.
+
+The upgraders and the `ShowApp` need the list of the entities of a study, which is spread over
+many directories and INI files. The :class:`StudyIndex` builds each part of the index lazily,
+on first access, and keeps it until the study is modified through its file system view:
+an index shared by the whole chain of upgraders stays consistent when an upgrader adds entities.
+
+Usage:
+
+>>> from antares.study.version.model.study_index import StudyIndex
+
+>>> index = StudyIndex.of("path/to/study")  # doctest: +SKIP
+>>> index.area_ids  # doctest: +SKIP
+['de', 'fr', 'it']
+>>> index.thermal_clusters["fr"]  # doctest: +SKIP
+['Gas', 'Nuclear']
+"""
+
+import threading
+import typing as t
+import weakref
+
+from antares.study.version.fs import StudyDir, StudyFS, as_study_fs
+
+T = t.TypeVar("T")
+
+AREAS_LIST_PATH = "input/areas/list.txt"
+AREAS_DIR = "input/areas"
+LINKS_DIR = "input/links"
+BINDING_CONSTRAINTS_PATH = "input/bindingconstraints/bindingconstraints.ini"
+
+THERMAL = "thermal"
+RENEWABLE = "renewable"
+ST_STORAGE = "st-storage"
+CLUSTER_DIRS = {
+    THERMAL: "input/thermal/clusters",
+    RENEWABLE: "input/renewables/clusters",
+    ST_STORAGE: "input/st-storage/clusters",
+}
+"""Directories of the clusters of each kind, containing one "<area>/list.ini" file per area."""
+
+_indexes: "weakref.WeakKeyDictionary[StudyFS, StudyIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+class StudyIndex:
+    """
+    Index of the entities of a study, built lazily from its file system view.
+
+    Each part of the index (areas, links, clusters...) is built on first access, and rebuilt
+    on the next access if the study was modified through the file system view in the meantime.
+
+    Args:
+        fs: The file system view of the study.
+    """
+
+    def __init__(self, fs: StudyFS) -> None:
+        self.fs = fs
+        self._parts: t.Dict[str, t.Tuple[int, t.Any]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.fs!r})"
+
+    @classmethod
+    def of(cls, study_dir: StudyDir) -> "StudyIndex":
+        """
+        Return the index of a study, shared by all the users of the same file system view.
+
+        Args:
+            study_dir: The study directory, or the file system view of the study.
+        """
+        fs = as_study_fs(study_dir)
+        with _indexes_lock:
+            index = _indexes.get(fs)
+            if index is None:
+                index = _indexes[fs] = cls(fs)
+        return index
+
+    def _get(self, name: str, build: t.Callable[[], T]) -> T:
+        """Return a part of the index, building it if it is missing or out of date."""
+        generation = self.fs.generation
+        with self._lock:
+            cached = self._parts.get(name)
+        if cached is not None and cached[0] == generation:
+            return t.cast(T, cached[1])
+        value = build()
+        with self._lock:
+            self._parts[name] = (generation, value)
+        return value
+
+    # Areas and links
+    # ---------------
+
+    @property
+    def area_ids(self) -> t.List[str]:
+        """IDs of the areas declared in "input/areas/list.txt", in the order of the file."""
+        return self._get("area_ids", self._build_area_ids)
+
+    def _build_area_ids(self) -> t.List[str]:
+        from antares.study.version.upgrade_app.helpers import transform_name_to_id
+
+        if not self.fs.is_file(AREAS_LIST_PATH):
+            return []
+        names = self.fs.read_text(AREAS_LIST_PATH, encoding="utf-8").splitlines(keepends=False)
+        return [transform_name_to_id(name) for name in names]
+
+    @property
+    def area_folders(self) -> t.List[str]:
+        """Names of the area directories in "input/areas", in alphabetical order."""
+        return self._get("area_folders", lambda: self._list_dirs(AREAS_DIR))
+
+    @property
+    def links(self) -> t.Dict[str, t.List[str]]:
+        """Links of the study: for each area, the areas it is linked to (sections of "properties.ini")."""
+        return self._get("links", self._build_links)
+
+    def _build_links(self) -> t.Dict[str, t.List[str]]:
+        return {
+            area: list(self.fs.read_ini(f"{LINKS_DIR}/{area}/properties.ini")) for area in self._list_dirs(LINKS_DIR)
+        }
+
+    # Clusters
+    # --------
+
+    def cluster_list_files(self, kind: str) -> t.List[str]:
+        """
+        Relative paths of the "list.ini" files of the clusters of a kind, in alphabetical order.
+
+        Args:
+            kind: "thermal", "renewable" or "st-storage".
+        """
+        cluster_dir = CLUSTER_DIRS[kind]
+        return self._get(f"{kind}_files", lambda: self.fs.glob(f"{cluster_dir}/*/list.ini"))
+
+    def clusters(self, kind: str) -> t.Dict[str, t.List[str]]:
+        """
+        Clusters of a kind: for each area, the names of its clusters (sections of "list.ini").
+
+        Args:
+            kind: "thermal", "renewable" or "st-storage".
+        """
+        return self._get(f"{kind}_clusters", lambda: self._build_clusters(kind))
+
+    def _build_clusters(self, kind: str) -> t.Dict[str, t.List[str]]:
+        return {path.split("/")[-2]: list(self.fs.read_ini(path)) for path in self.cluster_list_files(kind)}
+
+    @property
+    def thermal_clusters(self) -> t.Dict[str, t.List[str]]:
+        """Thermal clusters: for each area, the names of its clusters."""
+        return self.clusters(THERMAL)
+
+    @property
+    def renewable_clusters(self) -> t.Dict[str, t.List[str]]:
+        """Renewable clusters: for each area, the names of its clusters."""
+        return self.clusters(RENEWABLE)
+
+    @property
+    def st_storages(self) -> t.Dict[str, t.List[str]]:
+        """Short-term storages: for each area, the names of its storages."""
+        return self.clusters(ST_STORAGE)
+
+    # Binding constraints
+    # -------------------
+
+    @property
+    def binding_constraints(self) -> t.List[str]:
+        """IDs of the binding constraints, in the order of "bindingconstraints.ini"."""
+        return self._get("binding_constraints", self._build_binding_constraints)
+
+    def _build_binding_constraints(self) -> t.List[str]:
+        sections = self.fs.read_ini(BINDING_CONSTRAINTS_PATH)
+        return [str(section.get("id", name)) for name, section in sections.items()]
+
+    def _list_dirs(self, relpath: str) -> t.List[str]:
+        if not self.fs.is_dir(relpath):
+            return []
+        return [name for name in self.fs.iterdir(relpath) if self.fs.is_dir(f"{relpath}/{name}")]
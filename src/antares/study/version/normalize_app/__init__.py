@@ -0,0 +1,45 @@
+import dataclasses
+import typing as t
+from pathlib import Path
+
+from antares.study.version.fs import is_zip_study
+from antares.study.version.matrix_store import MatrixStore, NormalizeSummary, normalize_study
+
+
+@dataclasses.dataclass
+class NormalizeApp:
+    """
+    Normalize a study: move its matrices into a matrix store and replace them by link files.
+
+    Identical matrices are stored only once in the store, which reduces the disk footprint of the study
+    (and the volume of the backups of later upgrades). Use the same store to denormalize the study.
+
+    Attributes:
+        study_dir: The study directory.
+        matrix_store: The matrix store (directory or `MatrixStore` object).
+        max_workers: Maximum number of threads used to hash the matrix files.
+        summary: Summary of the last normalization.
+    """
+
+    study_dir: Path
+    matrix_store: MatrixStore
+    max_workers: t.Optional[int] = None
+    summary: t.Optional[NormalizeSummary] = dataclasses.field(default=None, init=False)
+
+    def __post_init__(self):
+        self.study_dir = Path(self.study_dir)
+        if not isinstance(self.matrix_store, MatrixStore):
+            self.matrix_store = MatrixStore(self.matrix_store)
+        if not self.study_dir.exists():
+            raise FileNotFoundError(f"Study directory not found: {self.study_dir}")
+        if is_zip_study(self.study_dir):
+            raise ValueError(f"A ZIP archive cannot be normalized: {self.study_dir}")
+
+    def __call__(self, file: t.Optional[t.TextIO] = None) -> None:
+        self.summary = summary = normalize_study(self.study_dir, self.matrix_store, max_workers=self.max_workers)
+        print(
+            f"Normalized {summary.files} matrix files ({summary.matrices} distinct matrices,"
+            f" {summary.added} added to the matrix store)",
+            file=file,
+        )
+        print(f"Space saved: {summary.space_saved} bytes", file=file)
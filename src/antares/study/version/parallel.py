@@ -0,0 +1,52 @@
+"""
+Execution of independent tasks in a thread pool.
+"""
+
+import concurrent.futures
+import contextvars
+import typing as t
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+
+def run_in_parallel(
+    func: t.Callable[[T], R],
+    items: t.Iterable[T],
+    max_workers: t.Optional[int] = None,
+) -> t.List[R]:
+    """
+    Apply a function to each item, using a pool of threads.
+
+    Each task runs in a copy of the context of the caller, so that the context variables
+    (like the upgrade options) have the same values in the worker threads.
+
+    Errors are reported deterministically: as soon as a task fails, the tasks which are not started yet
+    are cancelled, the running tasks are awaited, and the exception of the first failed task
+    (in the order of the items) is raised.
+
+    Args:
+        func: The function to apply.
+        items: The items to process.
+        max_workers: Maximum number of threads (see `ThreadPoolExecutor`).
+            With one worker, the items are processed sequentially in the calling thread.
+
+    Returns:
+        The results, in the order of the items.
+    """
+    items = list(items)
+    if max_workers == 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        done, not_done = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+        if not_done:
+            # A task failed: cancel the pending tasks, the running ones are awaited by the executor
+            for future in not_done:
+                future.cancel()
+            concurrent.futures.wait(not_done)
+        for future in futures:
+            if not future.cancelled() and future.exception() is not None:
+                raise t.cast(BaseException, future.exception())
+        return [future.result() for future in futures]
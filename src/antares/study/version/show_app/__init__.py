@@ -5,18 +5,28 @@ from pathlib import Path
 
 from antares.study.version import StudyVersion
 from antares.study.version.exceptions import ApplicationError
+from antares.study.version.fs import ZipFS, as_study_fs
 from antares.study.version.model.exceptions import ValidationError
 from antares.study.version.model.study_antares import StudyAntares
-from antares.study.version.upgrade_app.scenario_mapping import scenarios
+from antares.study.version.model.study_index import StudyIndex
+from antares.study.version.upgrade_app.scenario_mapping import get_available_upgrades
 
 
 @dataclasses.dataclass
 class ShowApp:
     """
     Show the details of a study in human-readable format (name, version, creation date, etc.)
+
+    The study can be a directory or a ZIP archive: the 'study.antares' file is read from the archive.
+
+    Attributes:
+        study_dir: The study directory, or the ZIP archive of the study.
+        entities: Whether to also show the number of entities of each kind (this reads the INI files
+            of the areas, links, clusters and binding constraints, so it takes longer on large studies).
     """
 
     study_dir: Path
+    entities: bool = False
 
     def __post_init__(self):
         self.study_dir = Path(self.study_dir)
@@ -30,16 +40,27 @@ class ShowApp:
         except ValidationError as e:
             raise ApplicationError(str(e)) from e
 
+    @functools.cached_property
+    def entity_counts(self) -> t.Dict[str, int]:
+        """Number of entities of each kind in the study (areas, links, clusters, storages, binding constraints)."""
+        fs = as_study_fs(self.study_dir)
+        try:
+            index = StudyIndex(fs)
+            return {
+                "Areas": len(index.area_ids),
+                "Links": sum(len(areas) for areas in index.links.values()),
+                "Thermal clusters": sum(len(names) for names in index.thermal_clusters.values()),
+                "Renewable clusters": sum(len(names) for names in index.renewable_clusters.values()),
+                "Short-term storages": sum(len(names) for names in index.st_storages.values()),
+                "Binding constraints": len(index.binding_constraints),
+            }
+        finally:
+            if isinstance(fs, ZipFS):
+                fs.close()
+
     @property
     def available_upgrades(self) -> t.List[StudyVersion]:
-        try:
-            start = self.study_antares.version
-            end = scenarios[-1].new  # type: ignore
-            update_methods = scenarios[start:end]  # type: ignore
-        except KeyError:
-            return []
-        else:
-            return [meth.new for meth in update_methods]  # type: ignore
+        return list(get_available_upgrades(self.study_antares.version))
 
     def __call__(self, file: t.Optional[t.TextIO] = None):
         study_antares = self.study_antares
@@ -49,3 +70,5 @@ class ShowApp:
             available_upgrades = "None"
         print(str(study_antares), file=file)
         print(f"Available Upgrades: {available_upgrades}", file=file)
+        if self.entities:
+            print(", ".join(f"{kind}: {count}" for kind, count in self.entity_counts.items()), file=file)
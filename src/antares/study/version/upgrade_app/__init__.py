@@ -1,16 +1,25 @@
 import dataclasses
 import functools
 import logging
+import os
 import shutil
 import tempfile
 import typing as t
 from pathlib import Path, PurePath
 
 from ..exceptions import ApplicationError
+from ..fs import DiskFS, OverlayFS, StudyFS, ZipFS, is_zip_study
+from ..fs.export import HARDLINK, LINK_MODES, export_study
+from ..fs.overlay import DEFAULT_MEMORY_BUDGET, OverlayChanges, apply_changes, backup_files, restore_files
+from ..fs.zip_fs import write_zip
+from ..matrix_store import MatrixStore, MatrixStoreError, denormalize_study
 from ..model.exceptions import ValidationError
 from ..model.study_antares import StudyAntares
 from ..model.study_version import StudyVersion
+from .metrics import NULL_RECORDER, PHASE, STEP, MetricsHook, MetricsRecorder, Recorder, UpgradeReport
+from .options import NUMERIC_SPLIT, UpgradeOptions, use_upgrade_options
 from .scenario_mapping import scenarios
+from .transform_cache import TransformCache
 from .upgrade_method import UpgradeMethod
 
 logger = logging.getLogger(__name__)
@@ -66,11 +75,56 @@ def filter_out_child_files(files: t.Collection[str]) -> t.List[str]:
 @dataclasses.dataclass
 class UpgradeApp:
     """
-    Create a new study.
+    Upgrade a study to a new version.
+
+    The study can be a directory or a ZIP archive. A ZIP archive is upgraded archive-to-archive:
+    the members which are not modified by the upgraders are copied without being decompressed.
+
+    Attributes:
+        study_dir: The study directory, or the ZIP archive of the study.
+        version: The target version.
+        output_path: Path of the upgraded study. By default, the study is upgraded in place.
+            For a study directory, this is a new directory: the source study is left untouched
+            and the files which are not modified are shared with it (see `link_mode`).
+            For a ZIP archive, this is the path of the upgraded archive.
+        link_mode: How the files which are not modified are shared between the source study directory
+            and the `output_path` directory: "hardlink", "reflink" or "copy". When the file system
+            doesn't support a mode, the next one is used.
+        matrix_store: The matrix store used to resolve the matrix links of a normalized study:
+            the links are replaced by the matrices before the upgrade, if any upgrader needs it.
+        max_workers: Maximum number of threads used by the upgraders to transform the matrix files
+            (see `UpgradeOptions`) and to resolve the matrix links. By default, it depends on the number of CPUs.
+        split_mode: How the upgraders split the matrix files by columns: "numeric" (values written
+            with the "%.6f" format) or "text" (values copied as is).
+        chunk_size: Number of rows processed at once when the upgraders split a matrix file by columns.
+            By default, the whole matrix is loaded in memory.
+        empty_defaults: Whether the upgraders write empty files instead of the split matrices
+            whose values are all zeros (the default series of Antares).
+        transform_cache: Persistent cache of the matrix transformations, shared between upgrades
+            (a `TransformCache` or its directory): the outputs of the transformations already done
+            on the same contents, possibly in other studies, are reused.
+        memory_budget: Amount of memory (in bytes) used to keep the modified files in memory
+            until the final commit. Beyond this budget, files are spilled in a temporary directory.
+        collect_metrics: Whether to collect the timing and I/O metrics of the upgrade in `metrics`.
+        metrics_hooks: Callbacks called with the metrics of each phase and step of the upgrade.
+            Using hooks enables the collection of the metrics.
+        metrics: Report of the last upgrade, if the metrics are enabled.
     """
 
     study_dir: Path
     version: StudyVersion
+    output_path: t.Optional[Path] = None
+    link_mode: str = HARDLINK
+    matrix_store: t.Optional[MatrixStore] = None
+    max_workers: t.Optional[int] = None
+    split_mode: str = NUMERIC_SPLIT
+    chunk_size: t.Optional[int] = None
+    empty_defaults: bool = False
+    transform_cache: t.Optional[TransformCache] = None
+    memory_budget: int = DEFAULT_MEMORY_BUDGET
+    collect_metrics: bool = False
+    metrics_hooks: t.Sequence[MetricsHook] = ()
+    metrics: t.Optional[UpgradeReport] = dataclasses.field(default=None, init=False)
 
     def __post_init__(self):
         """Parse, validate and initialize the fields of the object."""
@@ -78,6 +132,18 @@ class UpgradeApp:
         self.version = StudyVersion.parse(self.version)
         if not self.study_dir.exists():
             raise FileNotFoundError(f"Study directory not found: {self.study_dir}")
+        # Check the options of the upgraders (raises `ValueError` if an option is invalid)
+        _ = self.upgrade_options
+        if self.link_mode not in LINK_MODES:
+            raise ValueError(f"Invalid link mode '{self.link_mode}', expected one of {LINK_MODES}")
+        if self.matrix_store is not None and not isinstance(self.matrix_store, MatrixStore):
+            self.matrix_store = MatrixStore(self.matrix_store)
+        if self.transform_cache is not None and not isinstance(self.transform_cache, TransformCache):
+            self.transform_cache = TransformCache(self.transform_cache)
+        if self.output_path is not None:
+            self.output_path = Path(self.output_path)
+            if not is_zip_study(self.study_dir) and self.output_path.exists():
+                raise FileExistsError(f"Output directory already exists: {self.output_path}")
 
     @functools.cached_property
     def study_antares(self) -> StudyAntares:
@@ -97,89 +163,157 @@ class UpgradeApp:
         except KeyError as e:
             raise ApplicationError(e.args[0]) from e
 
+    @property
+    def upgrade_options(self) -> UpgradeOptions:
+        """Options of the upgraders."""
+        return UpgradeOptions(
+            max_workers=self.max_workers,
+            split_mode=self.split_mode,
+            chunk_size=self.chunk_size,
+            empty_defaults=self.empty_defaults,
+            transform_cache=self.transform_cache,
+        )
+
     @property
     def should_denormalize(self) -> bool:
         """Check if the study should be denormalized before the upgrade."""
         return any(meth.should_denormalize for meth in self.upgrade_methods)
 
     def __call__(self) -> None:
-        with tempfile.TemporaryDirectory(
+        """
+        Perform the upgrade.
+
+        The upgraders are applied on an in-memory overlay of the study: the study directory is only
+        modified once all the upgraders succeeded. Only the files that really change are written,
+        and only the existing files that are overwritten or removed are backed up.
+        If an error occurs while writing the changes, the original files are restored.
+
+        When an `output_path` is given, the source study is not modified at all, so no backup is needed.
+        """
+        recorder = MetricsRecorder(self.metrics_hooks) if self.collect_metrics or self.metrics_hooks else NULL_RECORDER
+        old_version = self.study_antares.version
+        tmp_dir = tempfile.TemporaryDirectory(
             suffix=UPGRADE_TEMPORARY_DIR_SUFFIX, prefix=UPGRADE_TEMPORARY_DIR_PREFIX, dir=self.study_dir.parent
-        ) as path:
-            tmp_path = Path(path)
+        )
+        # The directory listings are cached during the upgrade: the study directory is not modified until the commit
+        lower: StudyFS = (
+            ZipFS(self.study_dir) if is_zip_study(self.study_dir) else DiskFS(self.study_dir, cache_listings=True)
+        )
+        try:
+            tmp_path = Path(tmp_dir.name)
+            fs = OverlayFS(lower, memory_budget=self.memory_budget, spill_dir=tmp_path / "spill")
+            recorder.watch(fs)
 
-            # Prepare the upgrade
-            files_to_upgrade = {f for meth in self.upgrade_methods for f in meth.files} | {"study.antares"}
-            files_to_retrieve = self._copies_only_necessary_files(files_to_upgrade, tmp_path)
+            # Resolve the matrix links, in the overlay too
+            if self.matrix_store is not None and self.should_denormalize:
+                with recorder.measure("denormalize", PHASE):
+                    self._denormalize(fs, self.matrix_store)
 
-            try:
-                # Perform the upgrade
+            # Perform the upgrade in memory
+            with use_upgrade_options(self.upgrade_options):
                 for meth in self.upgrade_methods:
-                    meth.upgrade(self.study_dir)
+                    with recorder.measure(meth.__class__.__name__, STEP):
+                        meth.upgrade(fs)
+            if self.transform_cache is not None:
+                info = self.transform_cache.cache_info()
+                logger.info(
+                    f"Transformation cache: {info.hits} hits, {info.misses} misses,"
+                    f" {info.count} entries ({info.size} bytes), {info.evictions} evictions"
+                )
 
-                # Update the 'study.antares' file
-                self.study_antares.version = self.version
-                self.study_antares.to_ini_file(self.study_dir)
+            # Update the 'study.antares' file
+            study_antares = dataclasses.replace(self.study_antares, version=self.version)
+            study_antares.to_ini_file(fs)
 
-            except Exception:
-                # If an error occurs, restore the original files
-                self._safely_replace_original_files(files_to_retrieve, tmp_path)
-                raise
+            if isinstance(lower, ZipFS):
+                self._commit_zip(lower, fs.changes(), recorder)
+            elif self.output_path is not None:
+                self._commit_out_of_place(t.cast(DiskFS, lower), fs.changes(), recorder)
+            else:
+                self._commit_in_place(fs.changes(), tmp_path, recorder)
 
-    def _copies_only_necessary_files(self, files_to_upgrade: t.Collection[str], tmp_path: Path) -> t.List[str]:
-        """
-        Copies files concerned by the version upgrader into a temporary directory.
+            if self.output_path is None:
+                self.study_antares = study_antares
 
-        Args:
-            files_to_upgrade: List of the files and folders concerned by the upgrade.
-            tmp_path: Path to the temporary directory where the file modification will be performed.
+        finally:
+            if isinstance(lower, ZipFS):
+                lower.close()
+            with recorder.measure("cleanup", PHASE):
+                tmp_dir.cleanup()
+            if recorder is not NULL_RECORDER:
+                self.metrics = UpgradeReport(
+                    study_dir=str(self.study_dir),
+                    old_version=f"{old_version:2d}",
+                    new_version=f"{self.version:2d}",
+                    steps=list(recorder.steps),
+                )
 
-        Returns:
-            The list of files and folders that were really copied. It's the same as files_to_upgrade but
-            without any children that has parents already in the list.
+    def _denormalize(self, fs: StudyFS, matrix_store: MatrixStore) -> None:
         """
-        files_to_copy = filter_out_child_files(files_to_upgrade)
-        files_to_retrieve = []
-        for relpath in files_to_copy:
-            src_path = self.study_dir / relpath
-            if not src_path.exists():
-                # This can happen when upgrading a study to v8.8.
-                continue
-            dst_path = tmp_path / relpath
-            if src_path.is_dir():
-                if not dst_path.exists():
-                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                    files_to_retrieve.append(relpath)
-            else:
-                dst_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy(src_path, dst_path)
-                files_to_retrieve.append(relpath)
-        return files_to_retrieve
+        Replace the matrix links of the study by the matrices of the matrix store.
+        """
+        try:
+            denormalize_study(fs, matrix_store, max_workers=self.max_workers)
+        except MatrixStoreError as e:
+            raise ApplicationError(str(e)) from e
 
-    def _safely_replace_original_files(self, files_to_replace: t.List[str], tmp_path: Path) -> None:
+    def _commit_in_place(self, changes: OverlayChanges, tmp_path: Path, recorder: Recorder) -> None:
         """
-        Replace files/folders of the study that should be upgraded by their copy already upgraded in the tmp directory.
-        It uses Path.rename() and an intermediary tmp directory to swap the folders safely.
-        In the end, all tmp directories are removed.
-
-        Args:
-            files_to_replace: List of files and folders that were really copied
-            tmp_path: Path to the temporary directory where the file modification will be performed.
-            (cf. _copies_only_necessary_files's doc just above)
+        Write the changes in the study directory, restoring the original files if an error occurs.
         """
-        for k, path in enumerate(files_to_replace):
-            backup_dir = Path(
+        # Backup the files which are going to be overwritten or removed
+        with recorder.measure("backup", PHASE):
+            backup_dir = tmp_path / "backup"
+            backed_up = backup_files(changes, self.study_dir, backup_dir)
+
+        try:
+            with recorder.measure("commit", PHASE, changes=changes):
+                apply_changes(changes, self.study_dir, max_workers=self.max_workers)
+        except Exception:
+            # If an error occurs, restore the original files
+            with recorder.measure("rollback", PHASE):
+                restore_files(changes, self.study_dir, backup_dir, backed_up)
+            raise
+
+    def _commit_out_of_place(self, lower: DiskFS, changes: OverlayChanges, recorder: Recorder) -> None:
+        """
+        Build the upgraded study in the output directory, sharing the untouched files with the source study.
+        """
+        target_dir = t.cast(Path, self.output_path)
+        with recorder.measure("commit", PHASE, changes=changes):
+            # The study is built next to the target, and renamed once complete
+            build_dir = Path(
                 tempfile.mkdtemp(
-                    suffix=f".backup_{k}.tmp",
-                    prefix="~",
-                    dir=self.study_dir.parent,
+                    suffix=UPGRADE_TEMPORARY_DIR_SUFFIX, prefix=UPGRADE_TEMPORARY_DIR_PREFIX, dir=target_dir.parent
                 )
             )
-            backup_dir.rmdir()
-            original_path = self.study_dir / path
-            original_path.rename(backup_dir)
-            (tmp_path / path).rename(original_path)
-            if backup_dir.is_dir():
-                shutil.rmtree(backup_dir)
-            else:
-                backup_dir.unlink()
+            try:
+                summary = export_study(
+                    lower, changes, build_dir / target_dir.name, link_mode=self.link_mode, max_workers=self.max_workers
+                )
+                os.rename(build_dir / target_dir.name, target_dir)
+            finally:
+                shutil.rmtree(build_dir, ignore_errors=True)
+        logger.info(
+            f"Untouched files shared with '{self.study_dir}': {summary.shared}, files written: {summary.written}"
+        )
+
+    def _commit_zip(self, lower: ZipFS, changes: OverlayChanges, recorder: Recorder) -> None:
+        """
+        Write the upgraded ZIP archive: no backup is needed since the original archive is replaced atomically.
+        """
+        target_path = self.output_path or self.study_dir
+        with recorder.measure("commit", PHASE, changes=changes):
+            # The archive is written next to the target, so that it can be renamed atomically
+            fd, tmp_name = tempfile.mkstemp(
+                suffix=UPGRADE_TEMPORARY_DIR_SUFFIX, prefix=UPGRADE_TEMPORARY_DIR_PREFIX, dir=target_path.parent
+            )
+            os.close(fd)
+            zip_path = Path(tmp_name)
+            try:
+                write_zip(lower, changes, zip_path)
+                lower.close()
+                os.replace(zip_path, target_path)
+            except Exception:
+                zip_path.unlink(missing_ok=True)
+                raise
@@ -27,6 +27,22 @@ class UnexpectedMatrixLinksError(UpgradeError):
         super().__init__(message)
 
 
+class MatrixTransformationError(UpgradeError):
+    """
+    Exception raised when a matrix file cannot be transformed by an upgrader.
+    """
+
+    def __init__(self, file_path: str, reason: str):
+        """
+        Initialize the exception.
+
+        Args:
+            file_path: The relative path to the matrix file.
+            reason: The reason of the failure.
+        """
+        super().__init__(f"Cannot transform the matrix file '{file_path}': {reason}")
+
+
 class UnexpectedThematicTrimmingFieldsError(UpgradeError):
     """
     Exception raised when there are unexpected thematic trimming fields in the generaldata.ini file.
@@ -0,0 +1,252 @@
+"""
+Splitting of a matrix file into several matrix files, by columns.
+
+Two modes are available (see `UpgradeOptions.split_mode`):
+
+- "numeric": the values are parsed and written with the "%.6f" format,
+  which is the historical behavior of the upgraders;
+- "text": the lines are split on tabulations and the column slices are written as is,
+  without any numeric conversion: the values are kept exactly, and the throughput is only
+  limited by the I/O.
+
+In both modes, the matrix can be processed by chunks of rows (see `UpgradeOptions.chunk_size`),
+to bound the memory used by the split of large matrices.
+
+Identical matrix files give identical outputs: `group_identical_files` finds them, so that each
+distinct content is split only once.
+
+With the `UpgradeOptions.empty_defaults` option, the outputs whose values are all zeros are written
+as empty files, which Antares reads as the default series.
+"""
+
+import collections
+import contextlib
+import functools
+import hashlib
+import itertools
+import re
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from antares.study.version.fs import StudyFS
+from antares.study.version.matrix_io import format_matrix, parse_matrix, read_matrix, write_matrix
+from antares.study.version.parallel import run_in_parallel
+
+from .options import NUMERIC_SPLIT, SPLIT_MODES, get_upgrade_options
+
+ColumnSelector = t.Union[int, slice]
+"""Selection of the columns of an output file: a single column (index) or a range of columns (slice)."""
+
+_ZERO_VALUE = re.compile(rb"[+-]?(?:0+\.?0*|\.0+)(?:[eE][+-]?[0-9]+)?")
+"""Textual representations of zero (e.g. "0", "0.000000", "-0.0", "0e+00")."""
+
+_HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def split_matrix(
+    fs: StudyFS,
+    relpath: str,
+    outputs: t.Sequence[t.Tuple[str, ColumnSelector]],
+    mode: t.Optional[str] = None,
+    chunk_size: t.Optional[int] = None,
+    empty_defaults: t.Optional[bool] = None,
+) -> None:
+    """
+    Split a matrix file into several matrix files, by columns.
+
+    An empty matrix file gives empty output files.
+    With `empty_defaults`, an output whose values are all zeros is also written as an empty file.
+
+    Args:
+        fs: The file system view of the study.
+        relpath: Relative path of the matrix file.
+        outputs: Relative paths of the output files, with the columns to write in each file.
+        mode: The split mode, "numeric" or "text". By default, the mode of the current upgrade options.
+        chunk_size: Number of rows processed at once. By default, the chunk size of the current
+            upgrade options. If `None`, the whole matrix is loaded in memory.
+        empty_defaults: Whether to write empty files for the outputs whose values are all zeros.
+            By default, the option of the current upgrade options.
+
+    Raises:
+        ValueError: If the mode is unknown, or if a column is missing.
+    """
+    options = get_upgrade_options()
+    mode = mode or options.split_mode
+    chunk_size = chunk_size or options.chunk_size
+    empty_defaults = options.empty_defaults if empty_defaults is None else empty_defaults
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"Invalid split mode '{mode}', expected one of {SPLIT_MODES}")
+
+    if chunk_size is not None:
+        _split_matrix_by_chunks(fs, relpath, outputs, mode, chunk_size, empty_defaults)
+    elif mode == NUMERIC_SPLIT:
+        matrix = read_matrix(fs, relpath)
+        for output_path, columns in outputs:
+            if matrix.size and not (empty_defaults and _is_zero_matrix(matrix[:, columns])):
+                write_matrix(fs, output_path, matrix[:, columns])
+            else:
+                fs.write_bytes(output_path, b"")
+    else:
+        contents = split_text(fs.read_bytes(relpath), [columns for _, columns in outputs])
+        for (output_path, _), content in zip(outputs, contents):
+            fs.write_bytes(output_path, b"" if empty_defaults and is_zero_text(content) else content)
+
+
+def _split_matrix_by_chunks(
+    fs: StudyFS,
+    relpath: str,
+    outputs: t.Sequence[t.Tuple[str, ColumnSelector]],
+    mode: str,
+    chunk_size: int,
+    empty_defaults: bool,
+) -> None:
+    """
+    Split a matrix file by chunks of rows: each chunk is appended to all the output files at once,
+    so that the memory used depends on the chunk size, not on the size of the matrix.
+
+    With `empty_defaults`, the outputs are checked chunk by chunk: the outputs which are still
+    all zeros at the end are emptied (the memory used remains bounded by the chunk size).
+    """
+    selectors = [columns for _, columns in outputs]
+    output_mode = "w" if mode == NUMERIC_SPLIT else "wb"
+    all_zeros = [empty_defaults] * len(outputs)
+    with contextlib.ExitStack() as stack:
+        src = stack.enter_context(fs.open(relpath, "rb"))
+        dst_files = [stack.enter_context(fs.open(output_path, output_mode)) for output_path, _ in outputs]
+        line_offset = 0
+        while lines := list(itertools.islice(src, chunk_size)):
+            chunk = b"".join(lines)
+            if mode == NUMERIC_SPLIT:
+                matrix = parse_matrix(chunk)
+                if matrix.size:
+                    for index, (dst_file, columns) in enumerate(zip(dst_files, selectors)):
+                        all_zeros[index] = all_zeros[index] and _is_zero_matrix(matrix[:, columns])
+                        dst_file.write(format_matrix(matrix[:, columns]))
+            else:
+                contents = split_text(chunk, selectors, line_offset=line_offset)
+                for index, (dst_file, content) in enumerate(zip(dst_files, contents)):
+                    all_zeros[index] = all_zeros[index] and is_zero_text(content)
+                    dst_file.write(content)
+            line_offset += len(lines)
+
+    for (output_path, _), all_zero in zip(outputs, all_zeros):
+        if all_zero:
+            fs.write_bytes(output_path, b"")
+
+
+def _is_zero_matrix(matrix: npt.NDArray[np.float64]) -> bool:
+    # NaN values are not zeros: `any` is true for them
+    return not np.any(matrix)
+
+
+def is_zero_text(content: bytes) -> bool:
+    """
+    Check whether all the values of a TSV content are zeros, without converting the values.
+
+    Args:
+        content: TSV content (lines ending with "\\n").
+
+    Returns:
+        `True` if all the values are zeros (or if there are no values at all).
+    """
+    # Fast rejection of the contents containing other characters than those of the zeros
+    if content.translate(None, b"0.+-eE\t\r\n"):
+        return False
+    # The zero series contain few distinct lines: only those are checked
+    for line in set(content.split(b"\n")):
+        if line and not all(_ZERO_VALUE.fullmatch(value) for value in line.rstrip(b"\r").split(b"\t")):
+            return False
+    return True
+
+
+def split_text(data: bytes, selectors: t.Sequence[ColumnSelector], line_offset: int = 0) -> t.List[bytes]:
+    """
+    Split the content of a TSV file by columns, without converting the values.
+
+    Args:
+        data: The content of the TSV file (lines ending with "\\n" or "\\r\\n").
+        selectors: The columns of each output.
+        line_offset: Number of lines preceding the content in the file (used in error messages).
+
+    Returns:
+        The content of each output, with lines ending with "\\n".
+
+    Raises:
+        ValueError: If a single column is selected and is missing from a line.
+    """
+    lines = data.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    if not lines:
+        return [b""] * len(selectors)
+    if b"\r" in data:
+        lines = [line.rstrip(b"\r") for line in lines]
+    rows = [line.split(b"\t") for line in lines]
+
+    contents = []
+    for selector in selectors:
+        if isinstance(selector, slice):
+            column = [b"\t".join(row[selector]) for row in rows]
+        else:
+            try:
+                column = [row[selector] for row in rows]
+            except IndexError:
+                line_no = next(i for i, row in enumerate(rows, line_offset + 1) if len(row) <= selector)
+                raise ValueError(f"Column {selector} is missing at line {line_no}") from None
+        column.append(b"")
+        contents.append(b"\n".join(column))
+    return contents
+
+
+def group_identical_files(
+    fs: StudyFS,
+    file_paths: t.Sequence[str],
+    max_workers: t.Optional[int] = None,
+) -> t.List[t.List[str]]:
+    """
+    Group the files which have the same content.
+
+    The files are first grouped by size: only the files which have the same size as another file
+    are hashed (in parallel), so that distinct files are not read.
+
+    Args:
+        fs: The file system view of the study.
+        file_paths: Relative paths of the files.
+        max_workers: Maximum number of threads used to hash the files.
+
+    Returns:
+        The groups of identical files, in the order of their first file;
+        the files of a group are in the order of `file_paths`.
+    """
+    sizes = {file_path: fs.size(file_path) for file_path in file_paths}
+    by_size: t.Dict[int, t.List[str]] = collections.defaultdict(list)
+    for file_path, size in sizes.items():
+        by_size[size].append(file_path)
+    to_hash = [file_path for paths in by_size.values() if len(paths) > 1 for file_path in paths]
+    digests = dict(zip(to_hash, run_in_parallel(functools.partial(hash_file, fs), to_hash, max_workers)))
+
+    groups: t.Dict[t.Tuple[int, str], t.List[str]] = {}
+    for file_path, size in sizes.items():
+        # the files which are not hashed have a unique size: their path is a unique key
+        groups.setdefault((size, digests.get(file_path, file_path)), []).append(file_path)
+    return list(groups.values())
+
+
+def hash_file(fs: StudyFS, relpath: str) -> str:
+    """
+    Compute the SHA-256 hash of the content of a file.
+
+    Args:
+        fs: The file system view of the study.
+        relpath: Relative path of the file.
+
+    Returns:
+        The hexadecimal digest of the content.
+    """
+    digest = hashlib.sha256()
+    with fs.open(relpath, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_BUFFER_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
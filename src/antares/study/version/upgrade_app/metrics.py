@@ -0,0 +1,186 @@
+"""
+Timing and I/O metrics collected during a study upgrade.
+
+The metrics are recorded per phase (backup, commit, cleanup...) and per upgrade step
+(one step per `UpgradeMethod`). The I/O counters are those of the upgrade itself, not of the process:
+
+- the upgrade steps work on the in-memory overlay of the study (`OverlayFS`), which counts the files
+  read, the files written in memory and the directories created through it (see `MetricsRecorder.watch`);
+- the commit phases count the changes written to the disk (see `OverlayChanges.io_stats`).
+
+When no hook and no report are requested, the upgrade runs without any instrumentation.
+"""
+
+import contextlib
+import dataclasses
+import json
+import time
+import typing as t
+
+from antares.study.version.fs import IOStats, OverlayChanges, OverlayFS
+
+PHASE = "phase"
+STEP = "step"
+
+
+@dataclasses.dataclass
+class StepMetrics:
+    """
+    Metrics of a single phase or upgrade step.
+
+    Attributes:
+        name: Name of the phase (e.g. "backup") or of the upgrade step (e.g. "UpgradeTo0802").
+        kind: Either "phase" or "step".
+        wall_time: Elapsed wall-clock time in seconds.
+        cpu_time: CPU time of the process in seconds.
+        files_read: Number of files read from the study.
+        files_written: Number of files written: in memory for the upgrade steps, on disk for the commit phases.
+        bytes_read: Size of the files read from the study.
+        bytes_written: Size of the files written.
+        dirs_created: Number of directories created (in memory or on disk, like the files written).
+    """
+
+    name: str
+    kind: str = STEP
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    files_read: int = 0
+    files_written: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    dirs_created: int = 0
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return dataclasses.asdict(self)
+
+
+MetricsHook = t.Callable[[StepMetrics], None]
+
+
+@dataclasses.dataclass
+class UpgradeReport:
+    """
+    Metrics report of a study upgrade: the ordered list of phases and steps.
+    """
+
+    study_dir: str
+    old_version: str
+    new_version: str
+    steps: t.List[StepMetrics] = dataclasses.field(default_factory=list)
+
+    @property
+    def total(self) -> StepMetrics:
+        """Sum of the metrics of all phases and steps."""
+        total = StepMetrics("total", kind=PHASE)
+        for step in self.steps:
+            total.wall_time += step.wall_time
+            total.cpu_time += step.cpu_time
+            total.files_read += step.files_read
+            total.files_written += step.files_written
+            total.bytes_read += step.bytes_read
+            total.bytes_written += step.bytes_written
+            total.dirs_created += step.dirs_created
+        return total
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "study_dir": self.study_dir,
+            "old_version": self.old_version,
+            "new_version": self.new_version,
+            "steps": [step.to_dict() for step in self.steps],
+            "total": self.total.to_dict(),
+        }
+
+    def to_json(self, indent: t.Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+class MetricsRecorder:
+    """
+    Record the metrics of the phases and steps of an upgrade.
+
+    Each measurement is appended to the list of steps and passed to the hooks once finished.
+    The I/O of a nested measurement is not counted again in the enclosing one.
+    """
+
+    def __init__(self, hooks: t.Sequence[MetricsHook] = ()) -> None:
+        self.hooks = list(hooks)
+        self.steps: t.List[StepMetrics] = []
+        self._watched: t.List[OverlayFS] = []
+        self._nested: t.List[IOStats] = []
+
+    def watch(self, fs: OverlayFS) -> None:
+        """
+        Count the I/O performed through a file system view in the next measurements.
+
+        Args:
+            fs: The overlay of the study: its I/O counting is enabled.
+        """
+        if fs.io_stats is None:
+            fs.io_stats = IOStats()
+        self._watched.append(fs)
+
+    def _io_stats(self) -> IOStats:
+        return sum((t.cast(IOStats, fs.io_stats) for fs in self._watched), IOStats())
+
+    @contextlib.contextmanager
+    def measure(
+        self, name: str, kind: str = PHASE, changes: t.Optional[OverlayChanges] = None
+    ) -> t.Iterator[StepMetrics]:
+        """
+        Measure the timing and I/O of a phase or a step.
+
+        Args:
+            name: Name of the phase or step.
+            kind: Either "phase" or "step".
+            changes: The changes written to the disk by the phase, counted if the phase succeeds.
+
+        Yields:
+            The metrics of the phase or step (updated when the context exits).
+        """
+        metrics = StepMetrics(name, kind=kind)
+        start = self._io_stats()
+        self._nested.append(IOStats())
+        written = IOStats()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+            if changes is not None:
+                written = changes.io_stats()
+        finally:
+            metrics.wall_time = time.perf_counter() - wall_start
+            metrics.cpu_time = time.process_time() - cpu_start
+            nested = self._nested.pop()
+            io_stats = self._io_stats() - start + written
+            if self._nested:
+                self._nested[-1] += io_stats
+            io_stats -= nested
+            metrics.files_read = io_stats.files_read
+            metrics.files_written = io_stats.files_written
+            metrics.bytes_read = io_stats.bytes_read
+            metrics.bytes_written = io_stats.bytes_written
+            metrics.dirs_created = io_stats.dirs_created
+            self.steps.append(metrics)
+            for hook in self.hooks:
+                hook(metrics)
+
+
+class _NullRecorder:
+    """
+    Recorder used when metrics are disabled: measurements do nothing.
+    """
+
+    steps: t.Tuple[StepMetrics, ...] = ()
+
+    def watch(self, fs: OverlayFS) -> None:
+        pass
+
+    def measure(
+        self, name: str, kind: str = PHASE, changes: t.Optional[OverlayChanges] = None
+    ) -> t.ContextManager[t.Any]:
+        return contextlib.nullcontext()
+
+
+NULL_RECORDER = _NullRecorder()
+
+Recorder = t.Union[MetricsRecorder, _NullRecorder]
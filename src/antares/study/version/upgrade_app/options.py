@@ -0,0 +1,83 @@
+"""
+Options of the upgraders.
+
+The upgraders are class methods called with the study only: the options of the upgrade
+are made available to them through a context variable, set by the `UpgradeApp` during the upgrade.
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .transform_cache import TransformCache
+
+NUMERIC_SPLIT = "numeric"
+TEXT_SPLIT = "text"
+SPLIT_MODES = (NUMERIC_SPLIT, TEXT_SPLIT)
+
+
+@dataclasses.dataclass(frozen=True)
+class UpgradeOptions:
+    """
+    Options of the upgraders.
+
+    Attributes:
+        max_workers: Maximum number of threads used to transform the matrix files
+            (e.g. to split the link files). By default, it depends on the number of CPUs.
+            With one worker, the files are processed sequentially.
+        split_mode: How the matrix files are split by columns (e.g. the link matrices):
+            "numeric" parses the values and writes them with the "%.6f" format,
+            "text" copies the values as is, without numeric conversion (faster and lossless).
+        chunk_size: Number of rows processed at once when a matrix file is split by columns.
+            By default, the whole matrix is loaded in memory. With a chunk size, the memory used
+            to split a matrix depends on the chunk size, not on the size of the matrix.
+        empty_defaults: Whether the output files of a split whose values are all zeros are written
+            as empty files. Antares reads an empty series file as the default series (zeros),
+            so the study is unchanged, but much smaller.
+        transform_cache: Persistent cache of the outputs of the matrix transformations, shared between
+            the upgrades of several studies. By default, the transformations are always computed.
+    """
+
+    max_workers: t.Optional[int] = None
+    split_mode: str = NUMERIC_SPLIT
+    chunk_size: t.Optional[int] = None
+    empty_defaults: bool = False
+    transform_cache: t.Optional["TransformCache"] = None
+
+    def __post_init__(self) -> None:
+        if self.max_workers is not None and self.max_workers < 1:
+            raise ValueError(f"The number of workers must be positive: {self.max_workers}")
+        if self.split_mode not in SPLIT_MODES:
+            raise ValueError(f"Invalid split mode '{self.split_mode}', expected one of {SPLIT_MODES}")
+        if self.chunk_size is not None and self.chunk_size < 1:
+            raise ValueError(f"The chunk size must be positive: {self.chunk_size}")
+
+
+_upgrade_options: "contextvars.ContextVar[UpgradeOptions]" = contextvars.ContextVar(
+    "upgrade_options", default=UpgradeOptions()
+)
+
+
+def get_upgrade_options() -> UpgradeOptions:
+    """Return the options of the current upgrade (the default options outside an upgrade)."""
+    return _upgrade_options.get()
+
+
+@contextlib.contextmanager
+def use_upgrade_options(options: UpgradeOptions) -> t.Iterator[UpgradeOptions]:
+    """
+    Set the options of the upgraders in the current context.
+
+    Args:
+        options: The options to use.
+
+    Yields:
+        The options.
+    """
+    token = _upgrade_options.set(options)
+    try:
+        yield options
+    finally:
+        _upgrade_options.reset(token)
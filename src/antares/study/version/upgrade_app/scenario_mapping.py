@@ -1,4 +1,5 @@
 import collections.abc
+import functools
 import typing as t
 
 from antares.study.version.model.study_version import StudyVersion
@@ -191,3 +192,24 @@ class ScenarioMapping(collections.abc.Mapping):
 
 
 scenarios = ScenarioMapping(ALL_UPGRADE_METHODS)
+
+
+@functools.lru_cache(maxsize=None)
+def get_available_upgrades(study_version: StudyVersion) -> t.Tuple[StudyVersion, ...]:
+    """
+    Get the versions to which a study can be upgraded, in ascending order.
+
+    The result is cached, as it only depends on the version: this is useful to scan many studies.
+
+    Args:
+        study_version: The current version of the study.
+
+    Returns:
+        The target versions, or an empty tuple if the study is already in the last version,
+        or if its version is unknown.
+    """
+    try:
+        methods = scenarios[study_version : scenarios[-1].new]  # type: ignore
+    except KeyError:
+        return ()
+    return tuple(meth.new for meth in methods)  # type: ignore
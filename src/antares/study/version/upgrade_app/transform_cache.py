@@ -0,0 +1,260 @@
+"""
+Persistent cache of the matrix transformations, shared between upgrades.
+
+When a fleet of studies is upgraded, the same input files keep reappearing (e.g. default link
+matrices): the outputs of a transformation are stored on disk, so that the next studies reuse them
+instead of recomputing them.
+
+An entry is identified by a key computed from:
+
+- the upgrader class, and a fingerprint of the code of the transformation (the source files
+  of the upgrader and of the matrix modules, and the version of the package), so that the entries
+  computed by another version of the code are never reused;
+- the pattern of the relative paths of the transformed files (e.g. "input/links/*/*.txt");
+- the SHA-256 hash of the input file;
+- the upgrade options which change the outputs (e.g. the split mode).
+
+The size of the cache is bounded: the least recently used entries are evicted first.
+"""
+
+import collections
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import typing as t
+from pathlib import Path
+
+from antares.study.version.__about__ import __version__
+
+from .options import UpgradeOptions
+
+DEFAULT_TRANSFORM_CACHE_SIZE = 1024 * 1024 * 1024
+"""Default maximum size (in bytes) of the transformation cache on disk."""
+
+ENTRY_SUFFIX = ".entry"
+"""Suffix of the entry files in the cache directory."""
+
+_CODE_MODULES = (
+    "antares.study.version.matrix_io",
+    "antares.study.version.upgrade_app.matrix_split",
+    "antares.study.version.upgrade_app.upgrade_method",
+)
+"""Modules implementing the matrix transformations, in addition to the module of each upgrader."""
+
+
+@dataclasses.dataclass
+class TransformCacheInfo:
+    """
+    Statistics of the transformation cache.
+
+    Attributes:
+        hits: Number of transformations whose outputs were found in the cache.
+        misses: Number of transformations computed.
+        stores: Number of entries added to the cache.
+        evictions: Number of entries evicted from the cache.
+        size: Size (in bytes) of the entries on disk.
+        count: Number of entries on disk.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    size: int = 0
+    count: int = 0
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint(upgrader: type) -> str:
+    """
+    Compute the fingerprint of the code of the transformations of an upgrader.
+
+    Args:
+        upgrader: The upgrader class.
+
+    Returns:
+        The hexadecimal SHA-256 hash of the version of the package and of the source files
+        of the upgrader module and of the matrix modules.
+    """
+    digest = hashlib.sha256(__version__.encode())
+    for module_name in (upgrader.__module__, *_CODE_MODULES):
+        module_file = getattr(sys.modules.get(module_name), "__file__", None)
+        digest.update(module_name.encode())
+        if module_file:
+            digest.update(Path(module_file).read_bytes())
+    return digest.hexdigest()
+
+
+class TransformCache:
+    """
+    Persistent cache of the outputs of the matrix transformations, in a local directory.
+
+    Each entry is a single file named after its key, containing the outputs of a transformation.
+    The entries are written atomically, so the cache can be shared by several processes.
+
+    Args:
+        cache_dir: The directory of the cache (created if needed).
+        max_size: Maximum size (in bytes) of the entries on disk.
+            The least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: t.Union[str, Path], max_size: int = DEFAULT_TRANSFORM_CACHE_SIZE) -> None:
+        if max_size < 0:
+            raise ValueError(f"The cache size must be positive: {max_size}")
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._info = TransformCacheInfo()
+        self._entries: t.Optional["collections.OrderedDict[str, int]"] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.cache_dir)!r}, max_size={self.max_size})"
+
+    @staticmethod
+    def make_key(upgrader: type, pattern: str, content_hash: str, options: UpgradeOptions) -> str:
+        """
+        Compute the key of a transformation.
+
+        Args:
+            upgrader: The upgrader class.
+            pattern: The pattern of the relative paths of the transformed files.
+            content_hash: The SHA-256 hash of the input file.
+            options: The options of the upgrade.
+
+        Returns:
+            The hexadecimal key of the entry.
+        """
+        fields = {
+            "upgrader": f"{upgrader.__module__}.{upgrader.__qualname__}",
+            "code": code_fingerprint(upgrader),
+            "pattern": pattern,
+            "content": content_hash,
+            "split_mode": options.split_mode,
+            "empty_defaults": options.empty_defaults,
+        }
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str, count: t.Optional[int] = None) -> t.Optional[t.List[bytes]]:
+        """
+        Return the outputs of a transformation, if they are in the cache.
+
+        Args:
+            key: The key of the transformation (see `make_key`).
+            count: The expected number of outputs: an entry with another number of outputs
+                is not used (and counted as a miss).
+
+        Returns:
+            The contents of the outputs, or `None` if the entry is missing or doesn't match.
+        """
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            contents = None
+        else:
+            contents = _decode_entry(data)
+            if contents is not None and count is not None and len(contents) != count:
+                contents = None
+        with self._lock:
+            entries = self._load_entries()
+            if contents is None:
+                self._info.misses += 1
+                entries.pop(key, None)
+            else:
+                self._info.hits += 1
+                entries[key] = len(data)
+                entries.move_to_end(key)
+        return contents
+
+    def put(self, key: str, contents: t.Sequence[bytes]) -> None:
+        """
+        Add the outputs of a transformation to the cache, evicting the least recently used entries if needed.
+
+        An entry larger than the maximum size of the cache is not stored.
+
+        Args:
+            key: The key of the transformation (see `make_key`).
+            contents: The contents of the outputs.
+        """
+        data = _encode_entry(contents)
+        if len(data) > self.max_size:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # The entry is written under a temporary name, so that the cache never contains partial entries
+        fd, tmp_name = tempfile.mkstemp(suffix=".tmp", prefix=f"~{key}", dir=self.cache_dir)
+        try:
+            with open(fd, mode="wb") as f:
+                f.write(data)
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            entries = self._load_entries()
+            entries[key] = len(data)
+            entries.move_to_end(key)
+            self._info.stores += 1
+            total_size = sum(entries.values())
+            while total_size > self.max_size:
+                evicted, size = entries.popitem(last=False)
+                self._entry_path(evicted).unlink(missing_ok=True)
+                self._info.evictions += 1
+                total_size -= size
+
+    def cache_info(self) -> TransformCacheInfo:
+        """Return the statistics of the cache."""
+        with self._lock:
+            entries = self._load_entries()
+            return dataclasses.replace(self._info, size=sum(entries.values()), count=len(entries))
+
+    def clear(self) -> None:
+        """Remove all the entries of the cache, and reset the statistics."""
+        with self._lock:
+            for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+                path.unlink(missing_ok=True)
+            self._entries = collections.OrderedDict()
+            self._info = TransformCacheInfo()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir.joinpath(f"{key}{ENTRY_SUFFIX}")
+
+    def _load_entries(self) -> "collections.OrderedDict[str, int]":
+        # The entries on disk are listed once, ordered by access time (modification time of the files)
+        if self._entries is None:
+            stats = []
+            for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                stats.append((stat.st_mtime, path.name[: -len(ENTRY_SUFFIX)], stat.st_size))
+            self._entries = collections.OrderedDict((key, size) for _, key, size in sorted(stats))
+        return self._entries
+
+
+def _encode_entry(contents: t.Sequence[bytes]) -> bytes:
+    # The first line is the JSON list of the sizes of the outputs, followed by the outputs
+    header = json.dumps([len(content) for content in contents]).encode() + b"\n"
+    return header + b"".join(contents)
+
+
+def _decode_entry(data: bytes) -> t.Optional[t.List[bytes]]:
+    header, _, body = data.partition(b"\n")
+    try:
+        sizes = json.loads(header)
+    except ValueError:
+        return None
+    if not isinstance(sizes, list) or sum(sizes) != len(body):
+        return None
+    contents, offset = [], 0
+    for size in sizes:
+        contents.append(body[offset : offset + size])
+        offset += size
+    return contents
@@ -1,7 +1,13 @@
 import typing as t
-from pathlib import Path
 
+from antares.study.version.fs import StudyDir, StudyFS
+from antares.study.version.fs.base import parent_relpath
 from antares.study.version.model.study_version import StudyVersion
+from antares.study.version.parallel import run_in_parallel
+
+from .exceptions import MatrixTransformationError
+from .matrix_split import ColumnSelector, group_identical_files, hash_file, split_matrix
+from .options import get_upgrade_options
 
 
 class UpgradeMethod:
@@ -33,11 +39,114 @@ class UpgradeMethod:
         return self.old <= version < self.new
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to the new version.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
         raise NotImplementedError
+
+    @staticmethod
+    def transform_files(func: t.Callable[[str], None], file_paths: t.Sequence[str]) -> None:
+        """
+        Apply a transformation to independent matrix files, in parallel.
+
+        The number of workers is given by the options of the current upgrade (see `UpgradeOptions`).
+        If a transformation fails, the remaining ones are cancelled and the failure of the first file
+        (in the order of `file_paths`) is raised.
+
+        Args:
+            func: The transformation, called with the relative path of each file.
+            file_paths: Relative paths of the files to transform.
+
+        Raises:
+            MatrixTransformationError: If a transformation fails.
+        """
+
+        def transform(file_path: str) -> None:
+            try:
+                func(file_path)
+            except Exception as e:
+                raise MatrixTransformationError(file_path, str(e) or e.__class__.__name__) from e
+
+        run_in_parallel(transform, file_paths, max_workers=get_upgrade_options().max_workers)
+
+    @classmethod
+    def split_files(
+        cls,
+        fs: StudyFS,
+        file_paths: t.Sequence[str],
+        get_outputs: t.Callable[[str], t.Sequence[t.Tuple[str, ColumnSelector]]],
+        pattern: str,
+    ) -> None:
+        """
+        Split matrix files by columns (see `split_matrix`), in parallel, and remove them.
+
+        Identical files are split only once: the outputs of the first file of a group of identical files
+        are copied as is to the outputs of the other files. The parent directories of the outputs
+        are created if needed.
+
+        With a transformation cache in the upgrade options, the outputs are taken from the cache
+        when the same content was already split by the same upgrader (possibly in another study).
+
+        Args:
+            fs: The file system view of the study.
+            file_paths: Relative paths of the matrix files to split.
+            get_outputs: Function giving the outputs of a matrix file (relative paths and columns).
+            pattern: The pattern of the relative paths of the matrix files (e.g. "input/links/*/*.txt"),
+                which identifies the transformation in the cache.
+
+        Raises:
+            MatrixTransformationError: If a transformation fails (the first file of its group is reported).
+        """
+        options = get_upgrade_options()
+        cache = options.transform_cache
+        groups = group_identical_files(fs, file_paths, max_workers=options.max_workers)
+        duplicates = {group[0]: group[1:] for group in groups}
+
+        def make_parents(outputs: t.Sequence[t.Tuple[str, ColumnSelector]]) -> None:
+            for dir_path in {parent_relpath(output_path) for output_path, _ in outputs}:
+                if dir_path:
+                    fs.mkdir(dir_path, parents=True, exist_ok=True)
+
+        def split(file_path: str, outputs: t.Sequence[t.Tuple[str, ColumnSelector]]) -> None:
+            # The options are those of the caller thread: they are also used in the cache key
+            split_matrix(
+                fs,
+                file_path,
+                outputs,
+                mode=options.split_mode,
+                chunk_size=options.chunk_size,
+                empty_defaults=options.empty_defaults,
+            )
+
+        def split_group(file_path: str) -> None:
+            outputs = get_outputs(file_path)
+            make_parents(outputs)
+            contents: t.Optional[t.List[bytes]] = None
+            if cache is None:
+                split(file_path, outputs)
+            else:
+                key = cache.make_key(cls, pattern, hash_file(fs, file_path), options)
+                contents = cache.get(key, count=len(outputs))
+                if contents is not None:
+                    for (output_path, _), content in zip(outputs, contents):
+                        fs.write_bytes(output_path, content)
+                else:
+                    split(file_path, outputs)
+                    contents = [fs.read_bytes(output_path) for output_path, _ in outputs]
+                    cache.put(key, contents)
+            if duplicates[file_path]:
+                if contents is None:
+                    contents = [fs.read_bytes(output_path) for output_path, _ in outputs]
+                for duplicate in duplicates[file_path]:
+                    duplicate_outputs = get_outputs(duplicate)
+                    make_parents(duplicate_outputs)
+                    for (output_path, _), content in zip(duplicate_outputs, contents):
+                        fs.write_bytes(output_path, content)
+                    fs.unlink(duplicate)
+            fs.unlink(file_path)
+
+        cls.transform_files(split_group, list(duplicates))
@@ -1,5 +1,4 @@
-from pathlib import Path
-
+from antares.study.version.fs import StudyDir
 from antares.study.version.model.study_version import StudyVersion
 
 from .upgrade_method import UpgradeMethod
@@ -14,12 +13,12 @@ class UpgradeTo0702(UpgradeMethod):
     new = StudyVersion(7, 2)
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 7.2.
 
         There is no input modification between the 7.1.0 and the 7.2.0 versions.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
@@ -1,5 +1,4 @@
-from pathlib import Path
-
+from antares.study.version.fs import StudyDir
 from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData
 from antares.study.version.model.study_version import StudyVersion
 
@@ -17,12 +16,12 @@ class UpgradeTo0800(UpgradeMethod):
 
     # noinspection SpellCheckingInspection
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.0.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
         data = GeneralData.from_ini_file(study_dir)
         data["other preferences"]["hydro-heuristic-policy"] = "accommodate rule curves"
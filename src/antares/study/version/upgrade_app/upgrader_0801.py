@@ -1,11 +1,11 @@
-from pathlib import Path
-
+from antares.study.version.fs import StudyDir, as_study_fs
+from antares.study.version.ini_tables import ClusterTable
 from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData
+from antares.study.version.model.study_index import THERMAL
 from antares.study.version.model.study_version import StudyVersion
 
+from .options import get_upgrade_options
 from .upgrade_method import UpgradeMethod
-from antares.study.version.ini_writer import IniWriter
-from antares.study.version.ini_reader import IniReader
 
 
 class UpgradeTo0801(UpgradeMethod):
@@ -18,25 +18,23 @@ class UpgradeTo0801(UpgradeMethod):
     files = [GENERAL_DATA_PATH, "input"]
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.1.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-        data = GeneralData.from_ini_file(study_dir)
+        fs = as_study_fs(study_dir)
+        data = GeneralData.from_ini_file(fs)
         data["other preferences"]["renewable-generation-modelling"] = "aggregated"
-        data.to_ini_file(study_dir)
-        study_dir.joinpath("input", "renewables", "clusters").mkdir(parents=True, exist_ok=True)
-        study_dir.joinpath("input", "renewables", "series").mkdir(parents=True, exist_ok=True)
+        data.to_ini_file(fs)
+        fs.mkdir("input/renewables/clusters", parents=True, exist_ok=True)
+        fs.mkdir("input/renewables/series", parents=True, exist_ok=True)
 
         # Migrate thermal group from Other to Other 1
-        thermal_cluster_dir = study_dir / "input" / "thermal" / "clusters"
-        for area in thermal_cluster_dir.iterdir():
-            ini_path = thermal_cluster_dir / area / "list.ini"
-            sections = IniReader().read(ini_path)
-            for section in sections.values():
-                if section["group"].lower() == "Other".lower():
-                    section["group"] = "other 1"
-            IniWriter().write(sections, ini_path)
+        clusters = ClusterTable.read(fs, THERMAL, max_workers=get_upgrade_options().max_workers)
+        if "group" in clusters.df:
+            is_other = clusters.df["group"].astype(str).str.lower() == "other"
+            clusters.df.loc[is_other, "group"] = "other 1"
+        clusters.write()
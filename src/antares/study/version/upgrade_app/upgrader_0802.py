@@ -1,13 +1,10 @@
 import typing as t
-from pathlib import Path
-
-import numpy as np
-import numpy.typing as npt
-import pandas
 
+from antares.study.version.fs import StudyDir, as_study_fs
 from antares.study.version.model.study_version import StudyVersion
 
 from .exceptions import UnexpectedMatrixLinksError
+from .matrix_split import ColumnSelector
 from .upgrade_method import UpgradeMethod
 
 
@@ -22,44 +19,41 @@ class UpgradeTo0802(UpgradeMethod):
     should_denormalize = True
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.2.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-        links = (p for p in study_dir.glob("input/links/*") if p.is_dir())
+        fs = as_study_fs(study_dir)
+        links = (p for p in fs.glob("input/links/*") if fs.is_dir(p))
+        all_txt = []
         for folder_path in links:
             # Check if there are unresolved matrix links in the directory
-            unresolved_link = next(iter(folder_path.glob("*.txt.link")), False)
-            if isinstance(unresolved_link, Path):
-                raise UnexpectedMatrixLinksError(unresolved_link.relative_to(study_dir).as_posix())
+            unresolved_link = next(iter(fs.glob(f"{folder_path}/*.txt.link")), None)
+            if unresolved_link is not None:
+                raise UnexpectedMatrixLinksError(unresolved_link)
+            all_txt.extend(fs.glob(f"{folder_path}/*.txt"))
+
+        # The links are independent: they are split in parallel, identical links only once
+        cls.split_files(fs, all_txt, cls._link_outputs, pattern="input/links/*/*.txt")
+
+    @staticmethod
+    def _link_outputs(txt: str) -> t.List[t.Tuple[str, ColumnSelector]]:
+        """
+        Outputs of the split of a link matrix: the parameters, direct and indirect capacities matrices.
 
-            all_txt = folder_path.glob("*.txt")
-            for txt in all_txt:
-                df = pandas.read_csv(txt, sep="\t", header=None)
-                df_parameters = df.iloc[:, 2:8]
-                df_direct = df.iloc[:, 0]
-                df_indirect = df.iloc[:, 1]
-                name = Path(txt).stem
-                np.savetxt(
-                    folder_path / f"{name}_parameters.txt",
-                    t.cast(npt.NDArray[np.float64], df_parameters.values),
-                    delimiter="\t",
-                    fmt="%.6f",
-                )
-                (folder_path / "capacities").mkdir(exist_ok=True)
-                np.savetxt(
-                    folder_path / "capacities" / f"{name}_direct.txt",
-                    t.cast(npt.NDArray[np.float64], df_direct.values),
-                    delimiter="\t",
-                    fmt="%.6f",
-                )
-                np.savetxt(
-                    folder_path / "capacities" / f"{name}_indirect.txt",
-                    t.cast(npt.NDArray[np.float64], df_indirect.values),
-                    delimiter="\t",
-                    fmt="%.6f",
-                )
-                (folder_path / f"{name}.txt").unlink()
+        Args:
+            txt: The relative path of the link matrix.
+
+        Returns:
+            The relative paths of the output matrices, with their columns.
+        """
+        folder_path, _, filename = txt.rpartition("/")
+        name = filename[: -len(".txt")]
+        return [
+            (f"{folder_path}/{name}_parameters.txt", slice(2, 8)),
+            (f"{folder_path}/capacities/{name}_direct.txt", 0),
+            (f"{folder_path}/capacities/{name}_indirect.txt", 1),
+        ]
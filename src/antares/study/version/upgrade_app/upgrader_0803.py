@@ -1,6 +1,4 @@
-from pathlib import Path
-
-from antares.study.version.ini_writer import IniWriter
+from antares.study.version.fs import StudyDir, as_study_fs
 from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData
 from antares.study.version.model.study_version import StudyVersion
 
@@ -17,25 +15,25 @@ class UpgradeTo0803(UpgradeMethod):
     files = [GENERAL_DATA_PATH, "input/areas"]
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.3.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-        data = GeneralData.from_ini_file(study_dir)
+        fs = as_study_fs(study_dir)
+        data = GeneralData.from_ini_file(fs)
         data["adequacy patch"] = {
             "include-adq-patch": False,
             "set-to-null-ntc-between-physical-out-for-first-step": True,
             "set-to-null-ntc-from-physical-out-to-physical-in-for-first-step": True,
         }
         data["optimization"]["include-split-exported-mps"] = False
-        data.to_ini_file(study_dir)
-        areas = (p for p in study_dir.glob("input/areas/*") if p.is_dir())
+        data.to_ini_file(fs)
+        areas = (p for p in fs.glob("input/areas/*") if fs.is_dir(p))
         for folder_path in areas:
-            writer = IniWriter()
-            writer.write(
+            fs.write_ini(
+                f"{folder_path}/adequacy_patch.ini",
                 {"adequacy-patch": {"adequacy-patch-mode": "outside"}},
-                folder_path / "adequacy_patch.ini",
             )
@@ -1,5 +1,4 @@
-from pathlib import Path
-
+from antares.study.version.fs import StudyDir
 from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData
 from antares.study.version.model.study_version import StudyVersion
 
@@ -22,12 +21,12 @@ class UpgradeTo0804(UpgradeMethod):
     files = [GENERAL_DATA_PATH]
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.4.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
         data = GeneralData.from_ini_file(study_dir)
         actual_capacities = data["optimization"]["transmission-capacities"]
@@ -1,9 +1,8 @@
-from pathlib import Path
-
+from antares.study.version.fs import StudyDir, as_study_fs
 from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData
+from antares.study.version.model.study_index import StudyIndex
 from antares.study.version.model.study_version import StudyVersion
 
-from .helpers import transform_name_to_id
 from .upgrade_method import UpgradeMethod
 
 
@@ -18,27 +17,25 @@ class UpgradeTo0806(UpgradeMethod):
 
     # noinspection SpellCheckingInspection
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.6.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-        data = GeneralData.from_ini_file(study_dir)
+        fs = as_study_fs(study_dir)
+        data = GeneralData.from_ini_file(fs)
         data["adequacy patch"]["enable-first-step"] = False
-        data.to_ini_file(study_dir)
-
-        study_dir.joinpath("input", "st-storage", "clusters").mkdir(parents=True, exist_ok=True)
-        study_dir.joinpath("input", "st-storage", "series").mkdir(parents=True, exist_ok=True)
-        areas_path = study_dir.joinpath("input", "areas", "list.txt")
-        area_names = areas_path.read_text(encoding="utf-8").splitlines(keepends=False)
-        area_ids = (transform_name_to_id(area_name) for area_name in area_names)
-        for area_id in area_ids:
-            st_storage_path = study_dir.joinpath("input", "st-storage", "clusters", area_id)
-            st_storage_path.mkdir(parents=True, exist_ok=True)
-            (st_storage_path / "list.ini").touch()
-
-            hydro_series_path = study_dir.joinpath("input", "hydro", "series", area_id)
-            hydro_series_path.mkdir(parents=True, exist_ok=True)
-            (hydro_series_path / "mingen.txt").touch()
+        data.to_ini_file(fs)
+
+        fs.mkdir("input/st-storage/clusters", parents=True, exist_ok=True)
+        fs.mkdir("input/st-storage/series", parents=True, exist_ok=True)
+        for area_id in StudyIndex.of(fs).area_ids:
+            st_storage_path = f"input/st-storage/clusters/{area_id}"
+            fs.mkdir(st_storage_path, parents=True, exist_ok=True)
+            fs.touch(f"{st_storage_path}/list.ini")
+
+            hydro_series_path = f"input/hydro/series/{area_id}"
+            fs.mkdir(hydro_series_path, parents=True, exist_ok=True)
+            fs.touch(f"{hydro_series_path}/mingen.txt")
@@ -1,15 +1,13 @@
 import typing as t
-from pathlib import Path
 
-import numpy as np
-import numpy.typing as npt
-import pandas as pd
-
-from antares.study.version.ini_reader import IniReader
-from antares.study.version.ini_writer import IniWriter
+from antares.study.version.fs import StudyDir, as_study_fs
+from antares.study.version.ini_tables import ClusterTable
+from antares.study.version.model.study_index import THERMAL
 from antares.study.version.model.study_version import StudyVersion
 
 from .exceptions import UnexpectedMatrixLinksError
+from .matrix_split import ColumnSelector
+from .options import get_upgrade_options
 from .upgrade_method import UpgradeMethod
 
 
@@ -24,60 +22,56 @@ class UpgradeTo0807(UpgradeMethod):
     should_denormalize = True
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.7.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-        binding_constraints_dit = study_dir / "input" / "bindingconstraints"
+        fs = as_study_fs(study_dir)
+        binding_constraints_dit = "input/bindingconstraints"
 
         # Check if there are unresolved matrix links in the directory
-        unresolved_link = next(iter(binding_constraints_dit.glob("*.txt.link")), False)
-        if isinstance(unresolved_link, Path):
-            raise UnexpectedMatrixLinksError(unresolved_link.relative_to(study_dir).as_posix())
-
-        # Split existing binding constraints in 3 different files
-        binding_constraints_files = binding_constraints_dit.glob("*.txt")
-        for file in binding_constraints_files:
-            name = file.stem
-            if file.stat().st_size == 0:
-                lt, gt, eq = pd.Series(), pd.Series(), pd.Series()  # type: ignore
-            else:
-                df = pd.read_csv(file, sep="\t", header=None)
-                lt, gt, eq = df.iloc[:, 0], df.iloc[:, 1], df.iloc[:, 2]
-            for term, suffix in zip([lt, gt, eq], ["lt", "gt", "eq"]):
-                # noinspection PyTypeChecker
-                np.savetxt(
-                    binding_constraints_dit / f"{name}_{suffix}.txt",
-                    t.cast(npt.NDArray[np.float64], term.values),
-                    delimiter="\t",
-                    fmt="%.6f",
-                )
-            file.unlink()
+        unresolved_link = next(iter(fs.glob(f"{binding_constraints_dit}/*.txt.link")), None)
+        if unresolved_link is not None:
+            raise UnexpectedMatrixLinksError(unresolved_link)
 
-        ini_reader = IniReader()
-        ini_writer = IniWriter()
+        # Split existing binding constraints in 3 different files, in parallel (identical ones only once)
+        pattern = f"{binding_constraints_dit}/*.txt"
+        binding_constraints_files = fs.glob(pattern)
+        cls.split_files(fs, binding_constraints_files, cls._binding_constraint_outputs, pattern=pattern)
 
         # Add property group for every section in .ini file
-        ini_file_path = binding_constraints_dit / "bindingconstraints.ini"
-        data = ini_reader.read(ini_file_path)
+        ini_file_path = f"{binding_constraints_dit}/bindingconstraints.ini"
+        data = fs.read_ini(ini_file_path)
         for section in data:
             data[section]["group"] = "default"
-        ini_writer.write(data, ini_file_path)
+        fs.write_ini(ini_file_path, data)
 
         # Add properties for thermal clusters in .ini file
-        ini_files = study_dir.glob("input/thermal/clusters/*/list.ini")
-        thermal_path = study_dir / Path("input/thermal/series")
-        for ini_file_path in ini_files:
-            data = ini_reader.read(ini_file_path)
-            area_id = ini_file_path.parent.name
-            for cluster in data:
-                new_thermal_path = thermal_path / area_id / cluster.lower()
-                (new_thermal_path / "CO2Cost.txt").touch()
-                (new_thermal_path / "fuelCost.txt").touch()
-                data[cluster]["costgeneration"] = "SetManually"
-                data[cluster]["efficiency"] = 100
-                data[cluster]["variableomcost"] = 0
-            ini_writer.write(data, ini_file_path)
+        clusters = ClusterTable.read(fs, THERMAL, max_workers=get_upgrade_options().max_workers)
+        thermal_path = "input/thermal/series"
+        for area_id, cluster in clusters.df.index:
+            new_thermal_path = f"{thermal_path}/{area_id}/{cluster.lower()}"
+            fs.touch(f"{new_thermal_path}/CO2Cost.txt")
+            fs.touch(f"{new_thermal_path}/fuelCost.txt")
+        clusters.df["costgeneration"] = "SetManually"
+        clusters.df["efficiency"] = 100
+        clusters.df["variableomcost"] = 0
+        clusters.write()
+
+    @staticmethod
+    def _binding_constraint_outputs(file: str) -> t.List[t.Tuple[str, ColumnSelector]]:
+        """
+        Outputs of the split of a binding constraint matrix: the "lt", "gt" and "eq" terms matrices.
+
+        Args:
+            file: The relative path of the binding constraint matrix.
+
+        Returns:
+            The relative paths of the output matrices, with their columns.
+        """
+        folder_path, _, filename = file.rpartition("/")
+        name = filename[: -len(".txt")]
+        return [(f"{folder_path}/{name}_{suffix}.txt", column) for column, suffix in enumerate(["lt", "gt", "eq"])]
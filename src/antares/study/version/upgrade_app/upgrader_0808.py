@@ -1,9 +1,9 @@
-from pathlib import Path
-
-from antares.study.version.ini_reader import IniReader
-from antares.study.version.ini_writer import IniWriter
+from antares.study.version.fs import StudyDir, as_study_fs
+from antares.study.version.ini_tables import ClusterTable
+from antares.study.version.model.study_index import ST_STORAGE
 from antares.study.version.model.study_version import StudyVersion
 
+from .options import get_upgrade_options
 from .upgrade_method import UpgradeMethod
 
 
@@ -17,24 +17,20 @@ class UpgradeTo0808(UpgradeMethod):
     files = ["input/st-storage/clusters"]
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 8.8.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-        st_storage_dir = study_dir / "input" / "st-storage" / "clusters"
-        if not st_storage_dir.exists():
+        fs = as_study_fs(study_dir)
+        st_storage_dir = "input/st-storage/clusters"
+        if not fs.exists(st_storage_dir):
             # The folder only exists for studies in v8.6+ that have some short term storage clusters.
             # For every other case, this upgrader has nothing to do.
             return
 
-        reader = IniReader()
-        writer = IniWriter()
-        cluster_files = st_storage_dir.glob("*/list.ini")
-        for file_path in cluster_files:
-            sections = reader.read(file_path)
-            for section in sections.values():
-                section["enabled"] = True
-            writer.write(sections, file_path)
+        storages = ClusterTable.read(fs, ST_STORAGE, max_workers=get_upgrade_options().max_workers)
+        storages.df["enabled"] = True
+        storages.write()
@@ -1,5 +1,4 @@
-from pathlib import Path
-
+from antares.study.version.fs import StudyDir
 from antares.study.version.model.study_version import StudyVersion
 
 from .upgrade_method import UpgradeMethod
@@ -15,12 +14,12 @@ class UpgradeTo0900(UpgradeMethod):
     files = ["study.antares"]
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 9.0.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
         # Nothing to do since version number is handled in src/antares/study/version/model/study_antares.py
         pass
@@ -1,15 +1,18 @@
 from itertools import product
-from pathlib import Path
 
 import typing as t
 
-from antares.study.version.ini_reader import IniReader
-from antares.study.version.ini_writer import IniWriter
+import pandas as pd
+
+from antares.study.version.fs import StudyDir, StudyFS, as_study_fs
+from antares.study.version.ini_tables import HYDRO_INI_PATH, ClusterTable, read_area_table, write_area_table
 from antares.study.version.model.study_version import StudyVersion
 from .exceptions import UnexpectedThematicTrimmingFieldsError
 
+from .options import get_upgrade_options
 from .upgrade_method import UpgradeMethod
 from ..model.general_data import GENERAL_DATA_PATH, GeneralData
+from ..model.study_index import ST_STORAGE, StudyIndex
 
 
 def _upgrade_thematic_trimming(data: GeneralData) -> None:
@@ -50,11 +53,11 @@ class UpgradeTo0902(UpgradeMethod):
 
     old = StudyVersion(9, 0)
     new = StudyVersion(9, 2)
-    files = ["input/st-storage", GENERAL_DATA_PATH, "input/hydro/hydro.ini", "input/areas"]
+    files = ["input/st-storage", GENERAL_DATA_PATH, HYDRO_INI_PATH, "input/areas"]
 
     @staticmethod
-    def _upgrade_general_data(study_dir: Path) -> None:
-        data = GeneralData.from_ini_file(study_dir)
+    def _upgrade_general_data(fs: StudyFS) -> None:
+        data = GeneralData.from_ini_file(fs)
         adq_patch = data["adequacy patch"]
         adq_patch.pop("enable-first-step", None)
         adq_patch.pop("set-to-null-ntc-between-physical-out-for-first-step", None)
@@ -66,21 +69,16 @@ class UpgradeTo0902(UpgradeMethod):
         if "variables selection" in data:
             _upgrade_thematic_trimming(data)
 
-        data.to_ini_file(study_dir)
+        data.to_ini_file(fs)
 
     @staticmethod
-    def _upgrade_storages(study_dir: Path) -> None:
-        st_storage_dir = study_dir / "input" / "st-storage"
-        reader = IniReader()
-        writer = IniWriter()
-        cluster_files = (st_storage_dir / "clusters").glob("*/list.ini")
-        for file_path in cluster_files:
-            sections = reader.read(file_path)
-            for section in sections.values():
-                section["efficiencywithdrawal"] = 1
-                section["penalize-variation-injection"] = False
-                section["penalize-variation-withdrawal"] = False
-            writer.write(sections, file_path)
+    def _upgrade_storages(fs: StudyFS) -> None:
+        st_storage_dir = "input/st-storage"
+        storages = ClusterTable.read(fs, ST_STORAGE, max_workers=get_upgrade_options().max_workers)
+        storages.df["efficiencywithdrawal"] = 1
+        storages.df["penalize-variation-injection"] = False
+        storages.df["penalize-variation-withdrawal"] = False
+        storages.write()
 
         matrices_to_create = [
             "cost-injection.txt",
@@ -89,44 +87,36 @@ class UpgradeTo0902(UpgradeMethod):
             "cost-variation-injection.txt",
             "cost-variation-withdrawal.txt",
         ]
-        series_path = st_storage_dir / "series"
-        if not Path(series_path).is_dir():
+        series_path = f"{st_storage_dir}/series"
+        if not fs.is_dir(series_path):
             return
-        for area in series_path.iterdir():
-            area_dir = st_storage_dir / "series" / area
-            for storage in area_dir.iterdir():
-                final_dir = area_dir / storage
+        for area in fs.iterdir(series_path):
+            area_dir = f"{series_path}/{area}"
+            for storage in fs.iterdir(area_dir):
+                final_dir = f"{area_dir}/{storage}"
                 for matrix in matrices_to_create:
-                    (final_dir / matrix).touch()
+                    fs.touch(f"{final_dir}/{matrix}")
 
     @staticmethod
-    def _upgrade_hydro(study_dir: Path) -> None:
+    def _upgrade_hydro(fs: StudyFS) -> None:
         # Retrieves the list of existing areas
-        all_areas_ids = set()
-        for element in (study_dir / "input" / "areas").iterdir():
-            if element.is_dir():
-                all_areas_ids.add(element.name)
-
-        # Builds the new section to add to the file
-        new_section = {area_id: 1 for area_id in all_areas_ids}
-
-        # Adds the section to the file
-        ini_path = study_dir / "input" / "hydro" / "hydro.ini"
-        reader = IniReader()
-        sections = reader.read(ini_path)
-        sections["overflow spilled cost difference"] = new_section
-        writer = IniWriter()
-        writer.write(sections, ini_path)
+        all_areas_ids = StudyIndex.of(fs).area_folders
+
+        # Adds the new property to the file, with the same value for all the areas
+        df = read_area_table(fs, HYDRO_INI_PATH)
+        df = df.reindex(df.index.union(all_areas_ids))
+        df["overflow spilled cost difference"] = pd.Series(1, index=all_areas_ids, dtype="Int64")
+        write_area_table(fs, HYDRO_INI_PATH, df)
 
     @classmethod
-    def upgrade(cls, study_dir: Path) -> None:
+    def upgrade(cls, study_dir: StudyDir) -> None:
         """
         Upgrades the study to version 9.2.
 
         Args:
-            study_dir: The study directory.
+            study_dir: The study directory, or the file system view of the study.
         """
-
-        cls._upgrade_general_data(study_dir)
-        cls._upgrade_storages(study_dir)
-        cls._upgrade_hydro(study_dir)
+        fs = as_study_fs(study_dir)
+        cls._upgrade_general_data(fs)
+        cls._upgrade_storages(fs)
+        cls._upgrade_hydro(fs)
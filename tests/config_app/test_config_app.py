@@ -0,0 +1,40 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.config_app import ExportConfigApp, ImportConfigApp
+from antares.study.version.create_app import CreateApp
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "My Study"
+    CreateApp(study_dir, caption="My Study", version=StudyVersion(8, 8), author="John Doe")()
+    return study_dir
+
+
+class TestConfigApps:
+    def test_export_and_import(self, study_dir: Path, tmp_path: Path) -> None:
+        snapshot_path = tmp_path / "config.json"
+        export_app = ExportConfigApp(study_dir, snapshot_path)
+        output = io.StringIO()
+        export_app(file=output)
+        snapshot = export_app.snapshot
+        assert snapshot is not None
+        assert output.getvalue() == f"Exported {len(snapshot.files)} INI files (hash: {snapshot.content_hash})\n"
+
+        target_dir = tmp_path / "target"
+        output = io.StringIO()
+        ImportConfigApp(snapshot_path, target_dir)(file=output)
+        assert output.getvalue() == f"Imported {len(snapshot.files)} INI files (hash: {snapshot.content_hash})\n"
+        assert target_dir.joinpath("settings/generaldata.ini").is_file()
+
+    def test_invalid_arguments(self, study_dir: Path, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            ExportConfigApp(tmp_path / "missing", tmp_path / "config.json")
+        with pytest.raises(ValueError, match="format"):
+            ExportConfigApp(study_dir, tmp_path / "config.json", fmt="xml")
+        with pytest.raises(FileNotFoundError):
+            ImportConfigApp(tmp_path / "config.json", study_dir)
@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import bulk
+from antares.study.version.fs.bulk import BulkExecutor
+
+
+@pytest.fixture(name="root")
+def fixture_root(tmp_path: Path) -> Path:
+    root = tmp_path / "study"
+    root.joinpath("input/thermal/series/fr").mkdir(parents=True)
+    root.joinpath("input/thermal/series/fr/old.txt").write_text("1\n")
+    return root
+
+
+class TestBulkExecutor:
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    @pytest.mark.parametrize("dir_fd", [True, False])
+    def test_run(self, root: Path, max_workers: int, dir_fd: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(bulk, "_SUPPORTS_DIR_FD", bulk._SUPPORTS_DIR_FD and dir_fd)
+        executor = BulkExecutor(root, max_workers=max_workers)
+        for cluster in ["gas", "coal", "nuclear"]:
+            executor.mkdir("input/thermal/series/fr")  # existing directory
+            executor.mkdir(f"input/thermal/series/fr/{cluster}")
+            executor.mkdir(f"input/thermal/series/fr/{cluster}/sub")
+            executor.mkdir(f"input/thermal/series/fr/{cluster}")  # duplicate
+            executor.touch(f"input/thermal/series/fr/{cluster}/CO2Cost.txt")
+            executor.write(f"input/thermal/series/fr/{cluster}/fuelCost.txt", b"1\n2\n")
+        executor.unlink("input/thermal/series/fr/old.txt")
+        executor.unlink("input/thermal/series/fr/missing.txt")
+        assert len(executor) == 15
+
+        executor.run()
+
+        assert len(executor) == 0
+        series_dir = root / "input/thermal/series/fr"
+        assert sorted(p.name for p in series_dir.iterdir()) == ["coal", "gas", "nuclear"]
+        for cluster in ["gas", "coal", "nuclear"]:
+            assert series_dir.joinpath(cluster, "sub").is_dir()
+            assert series_dir.joinpath(cluster, "CO2Cost.txt").read_bytes() == b""
+            assert series_dir.joinpath(cluster, "fuelCost.txt").read_bytes() == b"1\n2\n"
+
+    def test_write__replaces_file_and_preserves_hard_links(self, root: Path) -> None:
+        src_path = root / "input/thermal/series/fr/old.txt"
+        backup_path = root / "backup.txt"
+        os.link(src_path, backup_path)
+
+        executor = BulkExecutor(root)
+        executor.write("input/thermal/series/fr/old.txt", b"2\n")
+        executor.run()
+
+        assert src_path.read_bytes() == b"2\n"
+        assert backup_path.read_bytes() == b"1\n"
+
+    def test_write__moves_file(self, root: Path, tmp_path: Path) -> None:
+        spilled_path = tmp_path / "spilled.bin"
+        spilled_path.write_bytes(b"3\n")
+
+        executor = BulkExecutor(root)
+        executor.write("input/thermal/series/fr/new.txt", spilled_path)
+        executor.run()
+
+        assert root.joinpath("input/thermal/series/fr/new.txt").read_bytes() == b"3\n"
+        assert not spilled_path.exists()
+
+    def test_unlink_after_write(self, root: Path) -> None:
+        executor = BulkExecutor(root)
+        executor.touch("input/new.txt")
+        executor.unlink("input/new.txt")
+        executor.run()
+        assert not root.joinpath("input/new.txt").exists()
+
+    def test_missing_parent(self, root: Path) -> None:
+        executor = BulkExecutor(root, max_workers=4)
+        executor.touch("input/missing/new.txt")
+        executor.touch("input/new.txt")
+        with pytest.raises(FileNotFoundError):
+            executor.run()
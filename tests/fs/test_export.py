@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS, OverlayFS
+from antares.study.version.fs.export import export_study
+
+
+@pytest.fixture(name="root")
+def fixture_root(tmp_path: Path) -> Path:
+    root = tmp_path / "study"
+    root.joinpath("input/links/fr").mkdir(parents=True)
+    root.joinpath("input/links/fr/de.txt").write_text("1\t2\n")
+    root.joinpath("input/links/fr/it.txt").write_text("3\t4\n")
+    root.joinpath("settings").mkdir()
+    root.joinpath("settings/generaldata.ini").write_text("[general]\nmode = Economy\n")
+    return root
+
+
+class TestExportStudy:
+    @pytest.mark.parametrize("link_mode", ["hardlink", "reflink", "copy"])
+    def test_export_study(self, root: Path, tmp_path: Path, link_mode: str) -> None:
+        lower = DiskFS(root)
+        fs = OverlayFS(lower)
+        fs.write_text("input/links/fr/de.txt", "5\t6\n")
+        fs.mkdir("input/links/fr/capacities")
+        fs.touch("input/links/fr/capacities/de_direct.txt")
+        fs.unlink("input/links/fr/it.txt")
+
+        target_dir = tmp_path / "target"
+        summary = export_study(lower, fs.changes(), target_dir, link_mode=link_mode)
+
+        assert sum(summary.shared.values()) == 1
+        assert summary.written == 2
+        assert target_dir.joinpath("input/links/fr/de.txt").read_text() == "5\t6\n"
+        assert target_dir.joinpath("input/links/fr/capacities/de_direct.txt").is_file()
+        assert not target_dir.joinpath("input/links/fr/it.txt").exists()
+        assert target_dir.joinpath("settings/generaldata.ini").read_text() == "[general]\nmode = Economy\n"
+        if link_mode == "hardlink":
+            assert summary.shared["hardlink"] == 1
+            assert target_dir.joinpath("settings/generaldata.ini").samefile(root / "settings/generaldata.ini")
+
+        # the source study is untouched
+        assert root.joinpath("input/links/fr/de.txt").read_text() == "1\t2\n"
+        assert root.joinpath("input/links/fr/it.txt").exists()
+        assert not root.joinpath("input/links/fr/capacities").exists()
+
+    def test_export_study__invalid_link_mode(self, root: Path, tmp_path: Path) -> None:
+        fs = OverlayFS(DiskFS(root))
+        with pytest.raises(ValueError, match="symlink"):
+            export_study(DiskFS(root), fs.changes(), tmp_path / "target", link_mode="symlink")
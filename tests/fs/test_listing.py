@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS
+from antares.study.version.fs.listing import ListingCache
+
+
+@pytest.fixture(name="root")
+def fixture_root(tmp_path: Path) -> Path:
+    root = tmp_path / "study"
+    for area in ["de", "fr", "it"]:
+        root.joinpath(f"input/areas/{area}").mkdir(parents=True)
+        root.joinpath(f"input/areas/{area}/optimization.ini").touch()
+    root.joinpath("input/areas/list.txt").write_text("de\nfr\nit\n")
+    return root
+
+
+class TestListingCache:
+    def test_listing(self, root: Path) -> None:
+        cache = ListingCache(root)
+        assert cache.listing("input/areas") == {"de": True, "fr": True, "it": True, "list.txt": False}
+        assert cache.listing("input/areas/list.txt") is None
+        assert cache.listing("input/missing/dir") is None
+        assert cache.kind("") is True
+        assert cache.kind("input/areas/fr") is True
+        assert cache.kind("input/areas/list.txt") is False
+        assert cache.kind("input/areas/es") is None
+
+        # each directory is scanned once: "", "input" and "input/areas" (the others are known to be missing)
+        assert cache.cache_info().scans == 3
+        for _ in range(3):
+            for area in ["de", "fr", "it", "es"]:
+                cache.kind(f"input/areas/{area}/optimization.ini")
+        assert cache.cache_info().scans == 6
+
+    def test_invalidate(self, root: Path) -> None:
+        cache = ListingCache(root)
+        assert cache.kind("input/areas/fr/optimization.ini") is False
+        root.joinpath("input/areas/fr/optimization.ini").unlink()
+        root.joinpath("input/areas/es").mkdir()
+        # the cache doesn't see the changes until it is invalidated
+        assert cache.kind("input/areas/fr/optimization.ini") is False
+        cache.invalidate("input/areas/fr/optimization.ini")
+        cache.invalidate("input/areas/es")
+        assert cache.kind("input/areas/fr/optimization.ini") is None
+        assert cache.kind("input/areas/es") is True
+
+
+class TestDiskFSWithListingCache:
+    def test_queries(self, root: Path) -> None:
+        fs = DiskFS(root, cache_listings=True)
+        reference = DiskFS(root)
+        for relpath in ["", "input", "input/areas/fr", "input/areas/list.txt", "input/missing", "input/areas/x/y"]:
+            assert fs.exists(relpath) == reference.exists(relpath)
+            assert fs.is_dir(relpath) == reference.is_dir(relpath)
+            assert fs.is_file(relpath) == reference.is_file(relpath)
+        assert fs.glob("input/areas/*/*.ini") == reference.glob("input/areas/*/*.ini")
+        assert list(fs.walk()) == list(reference.walk())
+        assert fs.iterdir("input/areas") == ["de", "fr", "it", "list.txt"]
+        with pytest.raises(NotADirectoryError):
+            fs.iterdir("input/areas/list.txt")
+        with pytest.raises(FileNotFoundError):
+            fs.iterdir("input/missing")
+
+    def test_changes_invalidate_the_cache(self, root: Path) -> None:
+        fs = DiskFS(root, cache_listings=True)
+        assert fs.glob("input/areas/*/*.txt") == []
+
+        fs.mkdir("input/areas/es/series", parents=True)
+        fs.touch("input/areas/es/series/load.txt")
+        fs.write_text("input/areas/fr/load.txt", "1\n")
+        fs.unlink("input/areas/fr/optimization.ini")
+
+        assert fs.glob("input/areas/*/*.txt") == ["input/areas/fr/load.txt"]
+        assert fs.glob("input/areas/*/series/*.txt") == ["input/areas/es/series/load.txt"]
+        assert not fs.exists("input/areas/fr/optimization.ini")
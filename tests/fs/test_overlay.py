@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS, OverlayFS
+from antares.study.version.fs.overlay import apply_changes, backup_files, restore_files
+
+
+@pytest.fixture(name="root")
+def fixture_root(tmp_path: Path) -> Path:
+    root = tmp_path / "study"
+    root.joinpath("input/links/fr").mkdir(parents=True)
+    root.joinpath("input/links/fr/de.txt").write_text("1\t2\n")
+    root.joinpath("input/links/fr/it.txt").write_text("3\t4\n")
+    root.joinpath("settings").mkdir()
+    root.joinpath("settings/generaldata.ini").write_text("[general]\nmode = Economy\n")
+    return root
+
+
+class TestOverlayFS:
+    def test_read_fallback(self, root: Path) -> None:
+        fs = OverlayFS(DiskFS(root))
+        assert fs.read_text("input/links/fr/de.txt") == "1\t2\n"
+        assert fs.is_dir("input/links/fr")
+        assert fs.is_file("input/links/fr/de.txt")
+        assert fs.iterdir("input/links/fr") == ["de.txt", "it.txt"]
+        assert fs.glob("input/links/*/*.txt") == ["input/links/fr/de.txt", "input/links/fr/it.txt"]
+        assert fs.read_ini("settings/generaldata.ini") == {"general": {"mode": "Economy"}}
+        assert fs.read_ini("settings/missing.ini") == {}
+
+    def test_write_in_memory(self, root: Path) -> None:
+        fs = OverlayFS(DiskFS(root))
+        fs.write_text("input/links/fr/de.txt", "5\t6\n")
+        fs.mkdir("input/links/fr/capacities")
+        fs.touch("input/links/fr/capacities/de_direct.txt")
+        fs.unlink("input/links/fr/it.txt")
+
+        # the disk is not modified
+        assert root.joinpath("input/links/fr/de.txt").read_text() == "1\t2\n"
+        assert not root.joinpath("input/links/fr/capacities").exists()
+        assert root.joinpath("input/links/fr/it.txt").exists()
+
+        # the overlay shows the modifications
+        assert fs.read_text("input/links/fr/de.txt") == "5\t6\n"
+        assert fs.iterdir("input/links/fr") == ["capacities", "de.txt"]
+        assert fs.size("input/links/fr/capacities/de_direct.txt") == 0
+        assert not fs.exists("input/links/fr/it.txt")
+        with pytest.raises(FileNotFoundError):
+            fs.read_bytes("input/links/fr/it.txt")
+        with pytest.raises(FileNotFoundError):
+            fs.touch("input/missing/foo.txt")
+        with pytest.raises(FileExistsError):
+            fs.mkdir("input/links/fr")
+        assert fs.memory_used == len("5\t6\n")
+
+    def test_memory_budget(self, root: Path, tmp_path: Path) -> None:
+        spill_dir = tmp_path / "spill"
+        fs = OverlayFS(DiskFS(root), memory_budget=10, spill_dir=spill_dir)
+        fs.write_bytes("input/links/fr/small.txt", b"12345")
+        fs.write_bytes("input/links/fr/big.txt", b"0123456789")
+        assert fs.memory_used == 5
+        assert len(list(spill_dir.iterdir())) == 1
+        assert fs.read_bytes("input/links/fr/big.txt") == b"0123456789"
+        assert fs.size("input/links/fr/big.txt") == 10
+        fs.unlink("input/links/fr/big.txt")
+        assert not list(spill_dir.iterdir())
+
+    def test_memory_budget__streaming(self, root: Path, tmp_path: Path) -> None:
+        # a file written by chunks is spilled as soon as it exceeds the budget
+        spill_dir = tmp_path / "spill"
+        fs = OverlayFS(DiskFS(root), memory_budget=100, spill_dir=spill_dir)
+        with fs.open("input/links/fr/big.txt", "wb") as f:
+            for _ in range(100):
+                f.write(b"0123456789")
+                f.flush()
+                assert fs.memory_used == 0
+        assert fs.memory_used == 0
+        assert fs.size("input/links/fr/big.txt") == 1000
+        assert fs.read_bytes("input/links/fr/big.txt") == b"0123456789" * 100
+        assert fs.changes().files["input/links/fr/big.txt"] == next(spill_dir.iterdir())
+
+    def test_changes(self, root: Path) -> None:
+        fs = OverlayFS(DiskFS(root))
+        fs.write_text("input/links/fr/de.txt", "1\t2\n")  # same content
+        fs.write_text("input/links/fr/it.txt", "7\t8\n")
+        fs.mkdir("input/links/fr/capacities/foo", parents=True)
+        fs.touch("input/links/fr/capacities/foo/bar.txt")
+        fs.touch("settings/generaldata.ini")  # existing file
+        fs.touch("settings/tmp.txt")
+        fs.unlink("settings/tmp.txt")  # removed before being written
+
+        changes = fs.changes()
+        assert changes.dirs == ["input/links/fr/capacities", "input/links/fr/capacities/foo"]
+        assert changes.files == {
+            "input/links/fr/capacities/foo/bar.txt": b"",
+            "input/links/fr/it.txt": b"7\t8\n",
+        }
+        assert changes.deleted == []
+
+    def test_apply_and_restore(self, root: Path, tmp_path: Path) -> None:
+        fs = OverlayFS(DiskFS(root))
+        fs.write_text("input/links/fr/de.txt", "5\t6\n")
+        fs.mkdir("input/links/fr/capacities")
+        fs.touch("input/links/fr/capacities/de_direct.txt")
+        fs.unlink("input/links/fr/it.txt")
+        changes = fs.changes()
+
+        backup_dir = tmp_path / "backup"
+        backed_up = backup_files(changes, root, backup_dir)
+        assert sorted(backed_up) == ["input/links/fr/de.txt", "input/links/fr/it.txt"]
+
+        apply_changes(changes, root)
+        assert root.joinpath("input/links/fr/de.txt").read_text() == "5\t6\n"
+        assert root.joinpath("input/links/fr/capacities/de_direct.txt").is_file()
+        assert not root.joinpath("input/links/fr/it.txt").exists()
+        # the backup is not modified by the commit
+        assert backup_dir.joinpath("input/links/fr/de.txt").read_text() == "1\t2\n"
+
+        restore_files(changes, root, backup_dir, backed_up)
+        assert root.joinpath("input/links/fr/de.txt").read_text() == "1\t2\n"
+        assert root.joinpath("input/links/fr/it.txt").read_text() == "3\t4\n"
+        assert not root.joinpath("input/links/fr/capacities").exists()
@@ -0,0 +1,72 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import OverlayFS, ZipFS, as_study_fs, is_zip_study
+from antares.study.version.fs.zip_fs import write_zip
+
+
+def _make_zip(zip_path: Path, members: dict) -> Path:
+    with zipfile.ZipFile(zip_path, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return zip_path
+
+
+@pytest.fixture(name="zip_path")
+def fixture_zip_path(tmp_path: Path) -> Path:
+    members = {
+        "My Study/study.antares": "[antares]\nversion = 800\n",
+        "My Study/input/links/fr/de.txt": "1\t2\n" * 100,
+        "My Study/input/links/fr/it.txt": "3\t4\n",
+        "My Study/settings/generaldata.ini": "[general]\nmode = Economy\n",
+    }
+    return _make_zip(tmp_path / "My Study.zip", members)
+
+
+class TestZipFS:
+    def test_read(self, zip_path: Path) -> None:
+        assert is_zip_study(zip_path)
+        with ZipFS(zip_path) as fs:
+            assert fs.prefix == "My Study/"
+            assert fs.iterdir("") == ["input", "settings", "study.antares"]
+            assert fs.is_dir("input/links/fr")
+            assert fs.is_file("input/links/fr/de.txt")
+            assert not fs.exists("input/links/fr/es.txt")
+            assert fs.glob("input/links/*/*.txt") == ["input/links/fr/de.txt", "input/links/fr/it.txt"]
+            assert fs.size("input/links/fr/it.txt") == 4
+            assert fs.read_ini("settings/generaldata.ini") == {"general": {"mode": "Economy"}}
+            with pytest.raises(FileNotFoundError):
+                fs.read_bytes("input/links/fr/es.txt")
+            with pytest.raises(NotADirectoryError):
+                fs.iterdir("study.antares")
+            with pytest.raises(PermissionError):
+                fs.write_text("input/links/fr/it.txt", "5\t6\n")
+
+    def test_root_prefix(self, tmp_path: Path) -> None:
+        zip_path = _make_zip(tmp_path / "study.zip", {"study.antares": "", "input/areas/list.txt": ""})
+        fs = as_study_fs(zip_path)
+        assert isinstance(fs, ZipFS)
+        assert fs.prefix == ""
+        assert fs.iterdir("input") == ["areas"]
+
+    def test_write_zip(self, zip_path: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "output.zip"
+        with ZipFS(zip_path) as lower:
+            fs = OverlayFS(lower)
+            fs.write_text("input/links/fr/it.txt", "5\t6\n")
+            fs.mkdir("input/links/fr/capacities")
+            fs.touch("input/links/fr/capacities/de_direct.txt")
+            write_zip(lower, fs.changes(), output_path)
+
+        with zipfile.ZipFile(zip_path) as src, zipfile.ZipFile(output_path) as dst:
+            assert dst.testzip() is None
+            assert dst.read("My Study/input/links/fr/it.txt") == b"5\t6\n"
+            assert dst.read("My Study/input/links/fr/capacities/de_direct.txt") == b""
+            assert "My Study/input/links/fr/capacities/" in dst.namelist()
+            # untouched members are copied as is
+            src_info = src.getinfo("My Study/input/links/fr/de.txt")
+            dst_info = dst.getinfo("My Study/input/links/fr/de.txt")
+            assert (dst_info.CRC, dst_info.compress_size) == (src_info.CRC, src_info.compress_size)
+            assert dst.read(dst_info) == src.read(src_info)
@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.inventory_app import IndexApp, QueryIndexApp
+from antares.study.version.inventory_app.index import InventoryIndex, RefreshStats, study_size
+
+
+def _write_study_antares(study_dir: Path, version: str, caption: str = "Study") -> None:
+    study_dir.joinpath("study.antares").write_text(
+        f"[antares]\nversion = {version}\ncaption = {caption}\ncreated = 1246524135\nlastsave = 1686128483\n"
+        "author = John Doe\n"
+    )
+
+
+@pytest.fixture(name="fleet_dir")
+def fixture_fleet_dir(tmp_path: Path) -> Path:
+    fleet_dir = tmp_path / "fleet"
+    for name, version in [("a", "9.2"), ("b", "800"), ("team/c", "8.6"), ("team/d", "foo")]:
+        study_dir = fleet_dir / name
+        study_dir.joinpath("input").mkdir(parents=True)
+        study_dir.joinpath("input/data.txt").write_text("0123456789")
+        study_dir.joinpath("output").mkdir()
+        study_dir.joinpath("output/result.txt").write_text("result" * 100)
+        _write_study_antares(study_dir, version, caption=name)
+    return fleet_dir
+
+
+def test_study_size(fleet_dir: Path) -> None:
+    study_dir = fleet_dir / "a"
+    assert study_size(study_dir) == 10 + study_dir.joinpath("study.antares").stat().st_size
+
+
+class TestInventoryIndex:
+    def test_refresh(self, fleet_dir: Path, tmp_path: Path) -> None:
+        with InventoryIndex(tmp_path / "inventory.db") as index:
+            assert index.refresh([fleet_dir], max_workers=2) == RefreshStats(added=4)
+            assert len(index) == 4
+
+            # Nothing changed: no study is read again
+            assert index.refresh([fleet_dir]) == RefreshStats(unchanged=4)
+
+            # Upgrade a study, remove another one and add a new one
+            study_antares = fleet_dir / "b/study.antares"
+            _write_study_antares(fleet_dir / "b", "8.8", caption="b")
+            os.utime(study_antares, ns=(1_700_000_000 * 10**9, 1_700_000_000 * 10**9))
+            shutil.rmtree(fleet_dir / "team/c")
+            (fleet_dir / "e").mkdir()
+            _write_study_antares(fleet_dir / "e", "7.0")
+            assert index.refresh([fleet_dir]) == RefreshStats(added=1, updated=1, removed=1, unchanged=2)
+
+            (study,) = index.query(root_dir=fleet_dir / "b")
+            assert study.version == StudyVersion(8, 8)
+            assert study.previous_version == StudyVersion(8, 0)
+            assert study.upgraded_date == 1_700_000_000
+            assert study.size == 10 + study_antares.stat().st_size
+
+    def test_refresh__other_roots_are_kept(self, fleet_dir: Path, tmp_path: Path) -> None:
+        with InventoryIndex(tmp_path / "inventory.db") as index:
+            index.refresh([fleet_dir])
+            shutil.rmtree(fleet_dir / "a")
+            # Only the studies below the refreshed root directory can be removed
+            assert index.refresh([fleet_dir / "team"]) == RefreshStats(unchanged=2)
+            assert len(index) == 4
+
+    def test_query(self, fleet_dir: Path, tmp_path: Path) -> None:
+        db_path = tmp_path / "inventory.db"
+        with InventoryIndex(db_path) as index:
+            index.refresh([fleet_dir])
+
+        # The index is persistent
+        with InventoryIndex(db_path) as index:
+            studies = index.query()
+            assert [study.caption for study in studies] == ["a", "b", "team/c", "team/d"]
+            assert studies[1].available_upgrades[0] == StudyVersion(8, 1)
+            assert studies[3].version is None
+            assert studies[3].error.startswith("Invalid version")
+
+            assert [study.caption for study in index.query(below="8.8")] == ["b", "team/c"]
+            assert [study.caption for study in index.query(from_version=StudyVersion(8, 6))] == ["a", "team/c"]
+            assert [study.caption for study in index.query(below=920, root_dir=fleet_dir / "team")] == ["team/c"]
+
+    def test_unsupported_version(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "inventory.db"
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute("PRAGMA user_version = 99")
+        with pytest.raises(ValueError, match="Unsupported inventory index version"):
+            InventoryIndex(db_path)
+
+
+class TestIndexApps:
+    def test_index_and_query(self, fleet_dir: Path, tmp_path: Path) -> None:
+        db_path = tmp_path / "inventory.db"
+        output = io.StringIO()
+        app = IndexApp(db_path, [fleet_dir])
+        app(file=output)
+        assert output.getvalue() == "Indexed 4 studies: 4 added, 0 updated, 0 removed, 0 unchanged\n"
+
+        output = io.StringIO()
+        query_app = QueryIndexApp(db_path, below=StudyVersion(8, 8), fmt="json")
+        query_app(file=output)
+        assert query_app.count == 2
+        records = json.loads(output.getvalue())
+        assert [record["version"] for record in records] == ["8.0", "8.6"]
+        assert records[0]["size"] == 10 + fleet_dir.joinpath("b/study.antares").stat().st_size
+
+    def test_validation(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            IndexApp(tmp_path / "missing/inventory.db", [tmp_path])
+        with pytest.raises(FileNotFoundError):
+            IndexApp(tmp_path / "inventory.db", [tmp_path / "missing"])
+        with pytest.raises(FileNotFoundError):
+            QueryIndexApp(tmp_path / "inventory.db")
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.inventory_app import ShowAllApp
+from antares.study.version.inventory_app.scanner import StudyInfo, read_study_info, scan_fleet, write_study_infos
+from antares.study.version.upgrade_app.scenario_mapping import get_available_upgrades
+
+
+def _make_study(study_dir: Path, version: str, caption: str = "Study") -> Path:
+    study_dir.mkdir(parents=True)
+    study_dir.joinpath("study.antares").write_text(
+        f"[antares]\nversion = {version}\ncaption = {caption}\ncreated = 1246524135\nlastsave = 1686128483\n"
+        "author = John Doe\n"
+    )
+    return study_dir
+
+
+@pytest.fixture(name="fleet_dir")
+def fixture_fleet_dir(tmp_path: Path) -> Path:
+    fleet_dir = tmp_path / "fleet"
+    study_a = _make_study(fleet_dir / "a", "9.2", caption="Study A")
+    _make_study(fleet_dir / "team/b", "800", caption="Study B")
+    _make_study(fleet_dir / "team/invalid", "foo")
+    # Not explored: the subdirectories of a study, the input/output directories and the temporary upgrades
+    _make_study(study_a / "user/copy", "8.8")
+    _make_study(fleet_dir / "broken/output/20240101-0000eco/study", "8.8")
+    _make_study(fleet_dir / "~b.upgrade.tmp", "8.8")
+    return fleet_dir
+
+
+class TestScanner:
+    def test_read_study_info(self, fleet_dir: Path) -> None:
+        info = read_study_info(fleet_dir / "team/b")
+        assert info == StudyInfo(
+            path=str(fleet_dir / "team/b"),
+            caption="Study B",
+            version=StudyVersion(8, 0),
+            created_date=1246524135,
+            last_save_date=1686128483,
+            author="John Doe",
+            available_upgrades=get_available_upgrades(StudyVersion(8, 0)),
+        )
+        assert info.available_upgrades[-1] == StudyVersion(9, 2)
+        assert info.to_dict()["available_upgrades"][0] == "8.1"
+
+    def test_read_study_info__invalid(self, fleet_dir: Path) -> None:
+        info = read_study_info(fleet_dir / "team/invalid")
+        assert info.version is None
+        assert info.available_upgrades == ()
+        assert info.error.startswith("Invalid version")
+
+        info = read_study_info(fleet_dir / "broken")
+        assert info.error.startswith("Cannot read 'study.antares'")
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_scan_fleet(self, fleet_dir: Path, max_workers: int) -> None:
+        infos = sorted(scan_fleet([fleet_dir], max_workers=max_workers), key=lambda info: info.path)
+        assert [info.path for info in infos] == [
+            str(fleet_dir / "a"),
+            str(fleet_dir / "team/b"),
+            str(fleet_dir / "team/invalid"),
+        ]
+        assert infos[0].version == StudyVersion(9, 2)
+        assert infos[0].available_upgrades == ()
+
+    def test_scan_fleet__stop_early(self, fleet_dir: Path) -> None:
+        infos = scan_fleet([fleet_dir, fleet_dir / "a"], max_workers=2)
+        assert next(infos).caption
+        infos.close()
+
+    def test_write_study_infos(self, fleet_dir: Path) -> None:
+        infos = [read_study_info(fleet_dir / "a"), read_study_info(fleet_dir / "team/b")]
+
+        output = io.StringIO()
+        assert write_study_infos(infos, output, fmt="json") == 2
+        assert json.loads(output.getvalue()) == [info.to_dict() for info in infos]
+
+        output = io.StringIO()
+        assert write_study_infos([], output, fmt="json") == 0
+        assert json.loads(output.getvalue()) == []
+
+        output = io.StringIO()
+        write_study_infos(infos, output, fmt="ndjson")
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == [info.to_dict() for info in infos]
+
+        output = io.StringIO()
+        write_study_infos(infos, output, fmt="csv")
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        assert [row["caption"] for row in rows] == ["Study A", "Study B"]
+        assert rows[0]["available_upgrades"] == ""
+        assert rows[1]["available_upgrades"].split()[-1] == "9.2"
+
+        with pytest.raises(ValueError, match="Invalid output format"):
+            write_study_infos(infos, io.StringIO(), fmt="xml")
+
+
+class TestShowAllApp:
+    def test_call(self, fleet_dir: Path) -> None:
+        app = ShowAllApp([fleet_dir / "team"], fmt="ndjson", max_workers=2)
+        output = io.StringIO()
+        app(file=output)
+        assert app.count == 2
+        versions = sorted(json.loads(line)["version"] or "" for line in output.getvalue().splitlines())
+        assert versions == ["", "8.0"]
+
+    def test_validation(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            ShowAllApp([tmp_path / "missing"])
+        with pytest.raises(ValueError, match="Invalid output format"):
+            ShowAllApp([tmp_path], fmt="xml")
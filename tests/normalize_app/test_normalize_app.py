@@ -0,0 +1,65 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.create_app import CreateApp
+from antares.study.version.matrix_store import MatrixStore
+from antares.study.version.normalize_app import NormalizeApp
+from antares.study.version.upgrade_app import UpgradeApp
+
+MATRIX = "1\t2\t3\t4\t5\t6\t7\t8\n" * 10
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "My Study"
+    CreateApp(study_dir, caption="My Study", version=StudyVersion(8, 0), author="John Doe")()
+    link_dir = study_dir.joinpath("input/links/fr")
+    link_dir.mkdir(parents=True)
+    link_dir.joinpath("de.txt").write_text(MATRIX)
+    link_dir.joinpath("it.txt").write_text(MATRIX)
+    link_dir.joinpath("es.txt").write_text(MATRIX.replace("1", "9"))
+    study_dir.joinpath("input/areas/list.txt").write_text("fr\n")
+    return study_dir
+
+
+class TestNormalizeApp:
+    def test_normalize(self, study_dir: Path, tmp_path: Path) -> None:
+        store_dir = tmp_path / "matrixstore"
+        app = NormalizeApp(study_dir, matrix_store=store_dir)
+        output = io.StringIO()
+        app(file=output)
+
+        summary = app.summary
+        assert summary is not None
+        assert (summary.files, summary.matrices, summary.added) == (3, 2, 2)
+        assert summary.files_size == 3 * len(MATRIX)
+        assert summary.added_size == 2 * len(MATRIX)
+        assert summary.space_saved == len(MATRIX) - summary.links_size
+        assert f"Space saved: {summary.space_saved} bytes" in output.getvalue()
+
+        link_dir = study_dir.joinpath("input/links/fr")
+        assert sorted(p.name for p in link_dir.iterdir()) == ["de.txt.link", "es.txt.link", "it.txt.link"]
+        assert link_dir.joinpath("de.txt.link").read_text() == link_dir.joinpath("it.txt.link").read_text()
+        assert len(list(store_dir.iterdir())) == 2
+        # the list of areas is not a matrix
+        assert study_dir.joinpath("input/areas/list.txt").read_text() == "fr\n"
+
+        # normalizing another study with the same matrices doesn't add anything to the store
+        study_dir.joinpath("input/links/fr/pt.txt").write_text(MATRIX)
+        app = NormalizeApp(study_dir, matrix_store=store_dir)
+        app(file=io.StringIO())
+        assert app.summary is not None
+        assert (app.summary.files, app.summary.added, app.summary.added_size) == (1, 0, 0)
+
+    def test_normalize_then_upgrade(self, study_dir: Path, tmp_path: Path) -> None:
+        store = MatrixStore(tmp_path / "matrixstore")
+        NormalizeApp(study_dir, matrix_store=store)(file=io.StringIO())
+        UpgradeApp(study_dir, version=StudyVersion(8, 2), matrix_store=store)()
+
+        link_dir = study_dir.joinpath("input/links/fr")
+        assert link_dir.joinpath("capacities/de_direct.txt").read_text() == "1.000000\n" * 10
+        assert link_dir.joinpath("capacities/es_direct.txt").read_text() == "9.000000\n" * 10
+        assert not list(link_dir.glob("*.link"))
@@ -1,5 +1,6 @@
 import dataclasses
 import datetime
+import io
 import typing as t
 from pathlib import Path
 
@@ -45,3 +46,31 @@ class TestShowApp:
         actual = app.available_upgrades
         expected = list(meth.new for meth in scenarios.values())
         assert actual == expected
+
+    def test_entity_counts(self, study_dir: Path) -> None:
+        study_dir.joinpath("input/areas").mkdir(parents=True)
+        study_dir.joinpath("input/areas/list.txt").write_text("DE\nFR\n")
+        study_dir.joinpath("input/thermal/clusters/fr").mkdir(parents=True)
+        study_dir.joinpath("input/thermal/clusters/fr/list.ini").write_text("[Nuclear]\n\n[Gas]\n")
+        app = ShowApp(study_dir)
+        assert app.entity_counts == {
+            "Areas": 2,
+            "Links": 0,
+            "Thermal clusters": 2,
+            "Renewable clusters": 0,
+            "Short-term storages": 0,
+            "Binding constraints": 0,
+        }
+
+    def test_call__entities(self, study_dir: Path) -> None:
+        study_dir.joinpath("input/areas").mkdir(parents=True)
+        study_dir.joinpath("input/areas/list.txt").write_text("DE\nFR\n")
+
+        # The entities are not counted by default
+        output = io.StringIO()
+        ShowApp(study_dir)(file=output)
+        assert "Areas:" not in output.getvalue()
+
+        output = io.StringIO()
+        ShowApp(study_dir, entities=True)(file=output)
+        assert output.getvalue().splitlines()[-1].startswith("Areas: 2, Links: 0, Thermal clusters: 0")
@@ -1,6 +1,8 @@
 import configparser
 import datetime
+import json
 import typing as t
+import zipfile
 from pathlib import Path
 from unittest import mock
 from unittest.mock import ANY
@@ -37,6 +39,11 @@ class TestCli:
         assert "Created: 2009-07-02 08:42:15" in show_str
         assert "Last Save: 2023-06-07 09:01:23" in show_str
         assert "Author: John Doe" in show_str
+        assert "Areas:" not in show_str
+
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["show", str(study_dir), "--entities"])
+        assert result.exit_code == 0
+        assert "Areas: 0, Links: 0" in result.output
 
     @pytest.mark.parametrize("study_version", list(TEMPLATES_BY_VERSIONS))
     def test_cli__create(self, tmp_path: Path, study_version: StudyVersion) -> None:
@@ -103,3 +110,115 @@ class TestCli:
             "lastsave": mock.ANY,
             "author": "Robert Smith",
         }
+
+    def test_upgrade__zip_archive(self, tmp_path: Path) -> None:
+        # the assets of the nominal case are used without being extracted
+        asset_dir = Path(__file__).parent.joinpath("cli/upgrade__nominal_case")
+        asset_zip = asset_dir / "Thermal Fleet.zip"
+        study_zip = tmp_path / "Thermal Fleet (archive).zip"
+        study_zip.write_bytes(asset_zip.read_bytes())
+        output_zip = tmp_path / "Thermal Fleet (upgraded).zip"
+
+        runner = CliRunner()
+        args = ["upgrade", str(study_zip), "--version=8.8", f"--output={output_zip}"]
+        result = runner.invoke(t.cast(click.BaseCommand, cli), args)
+        assert result.exit_code == 0, result.output
+
+        # the original archive is not modified
+        assert study_zip.read_bytes() == asset_zip.read_bytes()
+
+        actual_dir = tmp_path / "actual"
+        with zipfile.ZipFile(output_zip) as zf:
+            zf.extractall(actual_dir)
+        expected_dir = tmp_path / "expected"
+        with zipfile.ZipFile(asset_dir / "Thermal Fleet.expected.zip") as zf:
+            zf.extractall(expected_dir)
+        assert are_same_dir(actual_dir.joinpath("input"), expected_dir.joinpath("input"))
+
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["show", str(output_zip)])
+        assert result.exit_code == 0, result.output
+        assert "Version: v8.8" in result.output
+
+    def test_upgrade__metrics(self, tmp_path: Path) -> None:
+        study_dir = tmp_path / "My Study"
+        runner = CliRunner()
+        args = ["create", str(study_dir), "--version=8.0"]
+        result = runner.invoke(t.cast(click.BaseCommand, cli), args)
+        assert result.exit_code == 0, result.output
+
+        args = ["upgrade", str(study_dir), "--version=8.1", "--metrics=json"]
+        result = runner.invoke(t.cast(click.BaseCommand, cli), args)
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert report["old_version"] == "8.0"
+        assert report["new_version"] == "8.1"
+        assert [step["name"] for step in report["steps"]] == ["UpgradeTo0801", "backup", "commit", "cleanup"]
+
+    def test_normalize(self, tmp_path: Path) -> None:
+        study_dir = tmp_path / "My Study"
+        runner = CliRunner()
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["create", str(study_dir), "--version=8.0"])
+        assert result.exit_code == 0, result.output
+        study_dir.joinpath("input/links/fr").mkdir(parents=True)
+        study_dir.joinpath("input/links/fr/de.txt").write_text("1\t2\n" * 100)
+        study_dir.joinpath("input/links/fr/it.txt").write_text("1\t2\n" * 100)
+
+        store_dir = tmp_path / "matrixstore"
+        result = runner.invoke(
+            t.cast(click.BaseCommand, cli), ["normalize", str(study_dir), f"--matrix-store={store_dir}"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Normalized 2 matrix files (1 distinct matrices, 1 added to the matrix store)" in result.output
+        assert study_dir.joinpath("input/links/fr/de.txt.link").is_file()
+
+    def test_export_and_import_config(self, tmp_path: Path) -> None:
+        study_dir = tmp_path / "My Study"
+        runner = CliRunner()
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["create", str(study_dir), "--version=8.8"])
+        assert result.exit_code == 0, result.output
+
+        snapshot_path = tmp_path / "config.json"
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["export-config", str(study_dir), str(snapshot_path)])
+        assert result.exit_code == 0, result.output
+        assert result.output.startswith("Exported ")
+        snapshot = json.loads(snapshot_path.read_text())
+        assert "settings/generaldata.ini" in snapshot["files"]
+
+        target_dir = tmp_path / "target"
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["import-config", str(snapshot_path), str(target_dir)])
+        assert result.exit_code == 0, result.output
+        assert result.output.startswith("Imported ")
+        assert target_dir.joinpath("settings/generaldata.ini").is_file()
+
+    def test_show_all(self, tmp_path: Path) -> None:
+        runner = CliRunner()
+        for name in ["foo", "bar"]:
+            result = runner.invoke(t.cast(click.BaseCommand, cli), ["create", str(tmp_path / name), "--version=8.8"])
+            assert result.exit_code == 0, result.output
+
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["show-all", str(tmp_path), "--format=ndjson"])
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+        assert sorted(record["path"] for record in records) == [str(tmp_path / "bar"), str(tmp_path / "foo")]
+        assert records[0]["version"] == "8.8"
+        assert "Found 2 studies" in result.output
+
+    def test_index_and_query_index(self, tmp_path: Path) -> None:
+        runner = CliRunner()
+        studies_dir = tmp_path / "studies"
+        for name, version in [("foo", "8.0"), ("bar", "8.8")]:
+            args = ["create", str(studies_dir / name), f"--version={version}"]
+            result = runner.invoke(t.cast(click.BaseCommand, cli), args)
+            assert result.exit_code == 0, result.output
+
+        db_path = tmp_path / "inventory.db"
+        result = runner.invoke(t.cast(click.BaseCommand, cli), ["index", str(db_path), str(studies_dir)])
+        assert result.exit_code == 0, result.output
+        assert result.output.startswith("Indexed 2 studies: 2 added")
+
+        args = ["query-index", str(db_path), "--below=8.8", "--format=ndjson"]
+        result = runner.invoke(t.cast(click.BaseCommand, cli), args)
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+        assert [record["path"] for record in records] == [str(studies_dir / "foo")]
+        assert "Found 1 studies" in result.output
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.config_snapshot import (
+    ConfigSnapshot,
+    export_config,
+    import_config,
+    list_config_files,
+    load_snapshot,
+    save_snapshot,
+)
+from antares.study.version.create_app import CreateApp
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "My Study"
+    CreateApp(study_dir, caption="My Study", version=StudyVersion(8, 8), author="John Doe")()
+    study_dir.joinpath("input/thermal/clusters/fr").mkdir(parents=True, exist_ok=True)
+    study_dir.joinpath("input/thermal/clusters/fr/list.ini").write_text("[Gas]\nname = Gas\nenabled = true\n")
+    study_dir.joinpath("input/areas/sets.ini").write_text("[all areas]\ncaption = All areas\n+ = fr\n+ = de\n")
+    return study_dir
+
+
+class TestConfigSnapshot:
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_export_config(self, study_dir: Path, max_workers: int) -> None:
+        snapshot = export_config(study_dir, max_workers=max_workers)
+        assert list(snapshot.files) == list_config_files(study_dir)
+        assert all(path.startswith(("settings/", "input/")) for path in snapshot.files)
+        assert snapshot.files["input/thermal/clusters/fr/list.ini"] == {"Gas": {"name": "Gas", "enabled": True}}
+        assert snapshot.files["input/areas/sets.ini"]["all areas"]["+"] == ["fr", "de"]
+        assert "general" in snapshot.files["settings/generaldata.ini"]
+        assert len(snapshot.content_hash) == 64
+
+    def test_content_hash(self) -> None:
+        snapshot1 = ConfigSnapshot(files={"a.ini": {"s": {"x": 1, "y": 2}}})
+        snapshot2 = ConfigSnapshot(files={"a.ini": {"s": {"y": 2, "x": 1}}})
+        snapshot3 = ConfigSnapshot(files={"a.ini": {"s": {"x": 1, "y": 3}}})
+        assert snapshot1.content_hash == snapshot2.content_hash != snapshot3.content_hash
+
+    def test_save_and_load(self, study_dir: Path, tmp_path: Path) -> None:
+        snapshot = export_config(study_dir)
+        snapshot_path = tmp_path / "config.json"
+        save_snapshot(snapshot, snapshot_path)
+        assert load_snapshot(snapshot_path, verify=True) == snapshot
+
+        # a modified content is detected
+        obj = json.loads(snapshot_path.read_text())
+        obj["files"]["input/thermal/clusters/fr/list.ini"]["Gas"]["enabled"] = False
+        snapshot_path.write_text(json.dumps(obj))
+        assert load_snapshot(snapshot_path).files["input/thermal/clusters/fr/list.ini"]["Gas"]["enabled"] is False
+        with pytest.raises(ValueError, match="hash"):
+            load_snapshot(snapshot_path, verify=True)
+
+        with pytest.raises(ValueError, match="format"):
+            save_snapshot(snapshot, snapshot_path, fmt="xml")
+
+    def test_save_and_load__msgpack(self, study_dir: Path, tmp_path: Path) -> None:
+        pytest.importorskip("msgpack")
+        snapshot = export_config(study_dir)
+        snapshot_path = tmp_path / "config.msgpack"
+        save_snapshot(snapshot, snapshot_path)
+        assert load_snapshot(snapshot_path, verify=True) == snapshot
+
+    def test_import_config(self, study_dir: Path, tmp_path: Path) -> None:
+        snapshot = export_config(study_dir)
+        target_dir = tmp_path / "target"
+        import_config(snapshot, target_dir)
+        assert export_config(target_dir).content_hash == snapshot.content_hash
+        assert "+ = fr\n+ = de\n" in target_dir.joinpath("input/areas/sets.ini").read_text()
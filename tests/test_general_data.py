@@ -0,0 +1,116 @@
+import textwrap
+import typing as t
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS, ZipFS
+from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData, split_sections
+
+GENERAL_DATA_INI = textwrap.dedent(
+    """\
+    [general]
+    mode = Economy
+    nbyears = 3
+
+    [optimization]
+    transmission-capacities = true
+    include-split-exported-mps = false
+
+    [playlist]
+    ; custom formatting is preserved
+    playlist_reset=false
+    playlist_year + = 0
+    playlist_year + = 2
+
+    [variables selection]
+    select_var - = OP. COST
+    select_var - = MRG. PRICE
+    """
+)
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "study"
+    study_dir.joinpath("settings").mkdir(parents=True)
+    study_dir.joinpath(GENERAL_DATA_PATH).write_text(GENERAL_DATA_INI)
+    return study_dir
+
+
+def test_split_sections() -> None:
+    sections = split_sections("; comment\n[a]\nx = 1\n\n[b]\n[a]\ny = 2")
+    assert sections == {"a": "[a]\nx = 1\n\n[a]\ny = 2\n", "b": "[b]\n"}
+    assert split_sections("x = 1\n[a]\n") is None
+
+
+class TestGeneralData:
+    def test_lazy_sections(self, study_dir: Path) -> None:
+        data = GeneralData.from_ini_file(study_dir)
+        assert list(data) == ["general", "optimization", "playlist", "variables selection"]
+        assert "playlist" in data
+        assert not any(data.is_parsed(name) for name in data)
+
+        assert data["general"] == {"mode": "Economy", "nbyears": 3}
+        assert data.get("missing") is None
+        assert data.is_parsed("general")
+        assert not data.is_parsed("playlist")
+
+        assert data["playlist"]["playlist_year +"] == [0, 2]
+        assert data["variables selection"] == {"select_var -": ["OP. COST", "MRG. PRICE"]}
+
+    def test_to_ini_file__untouched_sections_are_written_verbatim(self, study_dir: Path) -> None:
+        data = GeneralData.from_ini_file(study_dir)
+        data["optimization"]["transmission-capacities"] = "local-values"
+        data["optimization"].pop("include-split-exported-mps")
+        data["compatibility"] = {"hydro-pmax": "daily"}
+        data.to_ini_file(study_dir)
+
+        text = study_dir.joinpath(GENERAL_DATA_PATH).read_text()
+        # the sections are written in their original order, the new sections at the end
+        assert text.index("[general]") < text.index("[optimization]") < text.index("[compatibility]")
+        assert "; custom formatting is preserved\nplaylist_reset=false\n" in text
+        assert "transmission-capacities = local-values\n" in text
+        assert "include-split-exported-mps" not in text
+
+        actual = GeneralData.from_ini_file(study_dir)
+        assert actual["optimization"] == {"transmission-capacities": "local-values"}
+        assert actual["compatibility"] == {"hydro-pmax": "daily"}
+        assert actual["playlist"] == {"playlist_reset": False, "playlist_year +": [0, 2]}
+
+    def test_dict_api(self, study_dir: Path) -> None:
+        fs = DiskFS(study_dir)
+        data = GeneralData.from_ini_file(fs)
+        assert data == GeneralData.from_ini_file(fs)
+        assert dict(data)["general"] == {"mode": "Economy", "nbyears": 3}
+        assert data.pop("variables selection") == {"select_var -": ["OP. COST", "MRG. PRICE"]}
+        assert data.setdefault("playlist", {})["playlist_reset"] is False
+        assert dict(data.items()).keys() == {"general", "optimization", "playlist"}
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert GeneralData.from_ini_file(tmp_path) == {}
+
+    def test_from_ini_file__zip(self, study_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        zip_path = tmp_path / "study.zip"
+        with zipfile.ZipFile(zip_path, mode="w") as zf:
+            zf.writestr("study/study.antares", "")
+            zf.write(study_dir / GENERAL_DATA_PATH, arcname=f"study/{GENERAL_DATA_PATH}")
+        closed: t.List[Path] = []
+        close = ZipFS.close
+
+        def recording_close(fs: ZipFS) -> None:
+            closed.append(fs.zip_path)
+            close(fs)
+
+        monkeypatch.setattr(ZipFS, "close", recording_close)
+
+        assert GeneralData.from_ini_file(zip_path)["general"] == {"mode": "Economy", "nbyears": 3}
+        assert closed == [zip_path]
+
+        # The archive is also closed when the file is missing
+        empty_zip_path = tmp_path / "empty.zip"
+        with zipfile.ZipFile(empty_zip_path, mode="w") as zf:
+            zf.writestr("study/study.antares", "")
+        assert GeneralData.from_ini_file(empty_zip_path) == {}
+        assert closed == [zip_path, empty_zip_path]
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS
+from antares.study.version.ini_query import IniRecord, query_ini
+
+CLUSTERS_PATTERN = "input/thermal/clusters/*/list.ini"
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    clusters_dir = tmp_path / "input/thermal/clusters"
+    for area in ["de", "fr", "it"]:
+        clusters_dir.joinpath(area).mkdir(parents=True)
+    clusters_dir.joinpath("de/list.ini").write_text(
+        "[Coal]\ngroup = Other\nenabled = false\nunitcount = 2\n\n[Lignite]\ngroup = Lignite\n"
+    )
+    clusters_dir.joinpath("fr/list.ini").write_text(
+        "[Nuclear]\ngroup = Nuclear\n\n[Gas]\ngroup = other\nunitcount = 1\n"
+    )
+    clusters_dir.joinpath("it/list.ini").write_text("[Oil]\ngroup = Oil\nenabled = true\n")
+    return tmp_path
+
+
+class TestQueryIni:
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_where(self, study_dir: Path, max_workers: int) -> None:
+        records = query_ini(study_dir, CLUSTERS_PATTERN, where={"group": "OTHER"}, max_workers=max_workers)
+        assert list(records) == [
+            IniRecord(
+                "input/thermal/clusters/de/list.ini", "Coal", {"group": "Other", "enabled": False, "unitcount": 2}
+            ),
+            IniRecord("input/thermal/clusters/fr/list.ini", "Gas", {"group": "other", "unitcount": 1}),
+        ]
+
+    def test_where__values_and_functions(self, study_dir: Path) -> None:
+        records = query_ini(study_dir, CLUSTERS_PATTERN, where={"enabled": False})
+        assert [r.section for r in records] == ["Coal"]
+        # a boolean doesn't match an integer
+        assert list(query_ini(study_dir, CLUSTERS_PATTERN, where={"unitcount": True})) == []
+        records = query_ini(study_dir, CLUSTERS_PATTERN, where={"unitcount": lambda n: n >= 1})
+        assert [r.section for r in records] == ["Coal", "Gas"]
+
+    def test_section_and_columns(self, study_dir: Path) -> None:
+        records = query_ini(study_dir, CLUSTERS_PATTERN, section="Gas", columns=["unitcount"])
+        assert list(records) == [IniRecord("input/thermal/clusters/fr/list.ini", "Gas", {"unitcount": 1})]
+        records = query_ini(DiskFS(study_dir), CLUSTERS_PATTERN, where={"group": "oil"}, columns=["enabled"])
+        assert list(records) == [IniRecord("input/thermal/clusters/it/list.ini", "Oil", {"enabled": True})]
+
+    def test_files_without_the_values_are_not_parsed(self, study_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        from antares.study.version import ini_query
+
+        parsed = []
+
+        class IniReader(ini_query.IniReader):
+            def read(self, path, **kwargs):  # type: ignore[no-untyped-def]
+                parsed.append(path)
+                return super().read(path, **kwargs)
+
+        monkeypatch.setattr(ini_query, "IniReader", IniReader)
+        records = list(query_ini(study_dir, CLUSTERS_PATTERN, where={"group": "nuclear"}, max_workers=1))
+        assert [r.section for r in records] == ["Nuclear"]
+        assert len(parsed) == 1
+
+    def test_no_match(self, tmp_path: Path) -> None:
+        assert list(query_ini(tmp_path, CLUSTERS_PATTERN)) == []
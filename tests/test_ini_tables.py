@@ -0,0 +1,146 @@
+import textwrap
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from antares.study.version.fs import DiskFS, OverlayFS
+from antares.study.version.ini_tables import (
+    HYDRO_INI_PATH,
+    ClusterTable,
+    format_ini_value,
+    read_area_table,
+    write_area_table,
+)
+from antares.study.version.model.study_index import THERMAL
+
+HYDRO_INI = textwrap.dedent(
+    """\
+    [inter-daily-breakdown]
+    fr = 1
+    de = 1
+
+    [leeway low]
+    fr = 0.5
+    de = 1
+
+    [reservoir]
+    fr = true
+
+    [initialize reservoir date]
+    """
+)
+
+
+def test_format_ini_value() -> None:
+    assert format_ini_value(True) == "true"
+    assert format_ini_value(False) == "false"
+    assert format_ini_value(3) == "3"
+    assert format_ini_value(3.0) == "3"
+    assert format_ini_value(0.25) == "0.25"
+    assert format_ini_value("x") == "x"
+
+
+class TestAreaTable:
+    def test_read_area_table(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("input/hydro").mkdir(parents=True)
+        tmp_path.joinpath(HYDRO_INI_PATH).write_text(HYDRO_INI)
+        df = read_area_table(DiskFS(tmp_path), HYDRO_INI_PATH)
+        assert df.index.tolist() == ["de", "fr"]
+        assert df.columns.tolist() == ["inter-daily-breakdown", "leeway low", "reservoir", "initialize reservoir date"]
+        assert df["inter-daily-breakdown"].tolist() == [1, 1]
+        assert str(df["inter-daily-breakdown"].dtype) == "Int64"
+        assert df["leeway low"].tolist() == [1, 0.5]
+        assert df.loc["fr", "reservoir"]
+        assert pd.isna(df.loc["de", "reservoir"])
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        df = read_area_table(DiskFS(tmp_path), HYDRO_INI_PATH)
+        assert df.empty
+
+    def test_write_area_table(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("input/hydro").mkdir(parents=True)
+        tmp_path.joinpath(HYDRO_INI_PATH).write_text(HYDRO_INI)
+        fs = DiskFS(tmp_path)
+
+        df = read_area_table(fs, HYDRO_INI_PATH)
+        df = df.reindex(df.index.union(["it"]))
+        df["inter-daily-breakdown"] *= 2
+        df["reservoir"] = df["reservoir"].fillna(False)
+        df["pumping efficiency"] = 1
+        write_area_table(fs, HYDRO_INI_PATH, df)
+
+        # the sections are written in the order of the columns, the areas in alphabetical order
+        expected = textwrap.dedent(
+            """\
+            [inter-daily-breakdown]
+            de = 2
+            fr = 2
+
+            [leeway low]
+            de = 1
+            fr = 0.5
+
+            [reservoir]
+            de = false
+            fr = true
+            it = false
+
+            [initialize reservoir date]
+
+            [pumping efficiency]
+            de = 1
+            fr = 1
+            it = 1
+
+            """
+        )
+        assert tmp_path.joinpath(HYDRO_INI_PATH).read_text() == expected
+
+
+class TestClusterTable:
+    @pytest.fixture(name="study_dir")
+    def fixture_study_dir(self, tmp_path: Path) -> Path:
+        clusters_dir = tmp_path / "input/thermal/clusters"
+        for area in ["de", "fr", "it"]:
+            clusters_dir.joinpath(area).mkdir(parents=True)
+        clusters_dir.joinpath("de/list.ini").write_text("[Coal]\nname = Coal\ngroup = Other\nunitcount = 2\n")
+        clusters_dir.joinpath("fr/list.ini").write_text(
+            "[Nuclear]\nname = Nuclear\ngroup = Nuclear\n\n[Gas]\nname = Gas\nnominalcapacity = 1.5\n"
+        )
+        clusters_dir.joinpath("it/list.ini").write_text("")
+        return tmp_path
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_read(self, study_dir: Path, max_workers: int) -> None:
+        table = ClusterTable.read(DiskFS(study_dir), THERMAL, max_workers=max_workers)
+        assert table.df.index.tolist() == [("de", "Coal"), ("fr", "Nuclear"), ("fr", "Gas")]
+        assert table.df.columns.tolist() == ["name", "group", "unitcount", "nominalcapacity"]
+        assert table.df.loc[("de", "Coal"), "unitcount"] == 2
+        assert pd.isna(table.df.loc[("fr", "Gas"), "group"])
+
+    def test_write__only_changed_areas(self, study_dir: Path) -> None:
+        fs = OverlayFS(DiskFS(study_dir))
+        table = ClusterTable.read(fs, THERMAL)
+        assert table.write() == []
+
+        table.df.loc[table.df["group"] == "Other", "group"] = "other 1"
+        table.df.loc[("de", "Coal"), "enabled"] = False
+        assert table.write() == ["input/thermal/clusters/de/list.ini"]
+        assert fs.read_ini("input/thermal/clusters/de/list.ini") == {
+            "Coal": {"name": "Coal", "group": "other 1", "unitcount": 2, "enabled": False}
+        }
+        assert table.write() == []
+
+        table.df["enabled"] = True
+        assert table.write() == ["input/thermal/clusters/de/list.ini", "input/thermal/clusters/fr/list.ini"]
+        assert fs.read_ini("input/thermal/clusters/fr/list.ini") == {
+            "Nuclear": {"name": "Nuclear", "group": "Nuclear", "enabled": True},
+            "Gas": {"name": "Gas", "nominalcapacity": 1.5, "enabled": True},
+        }
+
+    def test_empty(self, tmp_path: Path) -> None:
+        table = ClusterTable.read(DiskFS(tmp_path), THERMAL)
+        assert table.df.empty
+        table.df["enabled"] = True
+        assert table.write() == []
@@ -0,0 +1,57 @@
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antares.study.version.fs import DiskFS
+from antares.study.version.matrix_io import format_matrix, read_matrix, write_matrix
+
+
+def _savetxt(matrix: np.ndarray) -> str:
+    buffer = io.StringIO()
+    np.savetxt(buffer, matrix, delimiter="\t", fmt="%.6f")
+    return buffer.getvalue()
+
+
+MATRICES = {
+    "random": np.random.default_rng(42).normal(0, 1e4, size=(8760, 8)),
+    "integers": np.arange(8760 * 3).reshape(8760, 3),
+    "column": np.random.default_rng(0).uniform(-1, 1, size=8760),
+    "special": np.array([[np.nan, np.inf, -np.inf], [-0.0, 1e300, 5e-7], [0.0000005, 0.0000015, 2.5]]),
+    "no_columns": np.zeros((3, 0)),
+    "no_rows": np.zeros(0),
+    "wide": np.random.default_rng(1).uniform(0, 100, size=(10, 100_000)),
+}
+
+
+class TestMatrixIO:
+    @pytest.mark.parametrize("name", list(MATRICES))
+    def test_format_matrix__same_as_savetxt(self, name: str) -> None:
+        matrix = MATRICES[name]
+        assert format_matrix(matrix) == _savetxt(matrix)
+
+    def test_format_matrix__invalid_shape(self) -> None:
+        with pytest.raises(ValueError):
+            format_matrix(np.zeros((2, 2, 2)))
+
+    def test_read_write_matrix(self, tmp_path: Path) -> None:
+        fs = DiskFS(tmp_path)
+        matrix = MATRICES["random"]
+        write_matrix(fs, "matrix.txt", matrix)
+        assert tmp_path.joinpath("matrix.txt").read_text() == _savetxt(matrix)
+        actual = read_matrix(fs, "matrix.txt")
+        assert actual.dtype == np.float64
+        np.testing.assert_allclose(actual, matrix, atol=1e-6)
+
+        tmp_path.joinpath("empty.txt").touch()
+        assert read_matrix(fs, "empty.txt").shape == (0, 0)
+
+        tmp_path.joinpath("invalid.txt").write_text("1\tfoo\n")
+        with pytest.raises(ValueError):
+            read_matrix(fs, "invalid.txt")
+
+    def test_read_matrix__irregular(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("matrix.txt").write_text("1\t2\t\n3\t4\t\n")
+        actual = read_matrix(DiskFS(tmp_path), "matrix.txt")
+        np.testing.assert_array_equal(actual[:, :2], [[1, 2], [3, 4]])
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS, OverlayFS
+from antares.study.version.matrix_store import (
+    InvalidMatrixLinkError,
+    MatrixNotFoundError,
+    MatrixStore,
+    denormalize_study,
+    find_matrix_links,
+    parse_matrix_link,
+)
+
+MATRIX_ID = "7f8e2b0d1c4a"
+
+
+@pytest.fixture(name="store_dir")
+def fixture_store_dir(tmp_path: Path) -> Path:
+    store_dir = tmp_path / "matrixstore"
+    store_dir.mkdir()
+    store_dir.joinpath(f"{MATRIX_ID}.tsv").write_text("1\t2\n3\t4\n")
+    store_dir.joinpath("empty.tsv").write_bytes(b"")
+    return store_dir
+
+
+class TestMatrixStore:
+    def test_parse_matrix_link(self) -> None:
+        assert parse_matrix_link("de.txt.link", f"matrix://{MATRIX_ID}\n") == MATRIX_ID
+        for content in ["", "matrix://", f"file://{MATRIX_ID}", "matrix://../secret"]:
+            with pytest.raises(InvalidMatrixLinkError):
+                parse_matrix_link("de.txt.link", content)
+
+    def test_get(self, store_dir: Path) -> None:
+        store = MatrixStore(store_dir, cache_size=10)
+        assert store.get(MATRIX_ID) == b"1\t2\n3\t4\n"
+        assert store.get(MATRIX_ID) == b"1\t2\n3\t4\n"
+        assert store.get("empty") == b""
+        info = store.cache_info()
+        assert (info.hits, info.misses, info.count, info.size) == (1, 2, 2, 8)
+        with pytest.raises(MatrixNotFoundError):
+            store.get("missing")
+
+    def test_get__eviction(self, store_dir: Path) -> None:
+        store_dir.joinpath("other.tsv").write_text("5\t6\n")
+        store = MatrixStore(store_dir, cache_size=10)
+        store.get(MATRIX_ID)  # 8 bytes
+        store.get("other")  # 4 bytes: the first matrix is evicted
+        info = store.cache_info()
+        assert (info.count, info.size) == (1, 4)
+        store.get(MATRIX_ID)
+        assert store.cache_info().misses == 3
+
+    def test_denormalize_study(self, store_dir: Path, tmp_path: Path) -> None:
+        root = tmp_path / "study"
+        root.joinpath("input/links/fr").mkdir(parents=True)
+        root.joinpath("input/links/fr/de.txt.link").write_text(f"matrix://{MATRIX_ID}")
+        root.joinpath("input/links/fr/it.txt.link").write_text(f"matrix://{MATRIX_ID}")
+        root.joinpath("input/links/fr/es.txt").write_text("7\t8\n")
+
+        fs = OverlayFS(DiskFS(root))
+        store = MatrixStore(store_dir)
+        assert denormalize_study(fs, store, max_workers=2) == 2
+        assert fs.iterdir("input/links/fr") == ["de.txt", "es.txt", "it.txt"]
+        assert fs.read_bytes("input/links/fr/de.txt") == b"1\t2\n3\t4\n"
+        assert fs.read_bytes("input/links/fr/it.txt") == b"1\t2\n3\t4\n"
+        assert store.cache_info().misses == 1
+
+    def test_denormalize_study__missing_matrix(self, store_dir: Path, tmp_path: Path) -> None:
+        root = tmp_path / "study"
+        root.joinpath("input").mkdir(parents=True)
+        root.joinpath("input/de.txt.link").write_text("matrix://missing")
+        with pytest.raises(MatrixNotFoundError, match="missing"):
+            denormalize_study(OverlayFS(DiskFS(root)), MatrixStore(store_dir))
+
+    def test_denormalize_study__first_error(self, store_dir: Path, tmp_path: Path) -> None:
+        root = tmp_path / "study"
+        root.joinpath("input/links/fr").mkdir(parents=True)
+        for name in ["be", "de", "es", "it", "nl"]:
+            root.joinpath(f"input/links/fr/{name}.txt.link").write_text(f"matrix://missing-{name}")
+        # The error of the first link (in alphabetical order) is raised, whatever the order of completion
+        for _ in range(5):
+            with pytest.raises(MatrixNotFoundError, match="missing-be"):
+                denormalize_study(OverlayFS(DiskFS(root)), MatrixStore(store_dir), max_workers=4)
+
+    def test_find_matrix_links(self, tmp_path: Path) -> None:
+        root = tmp_path / "study"
+        assert find_matrix_links(DiskFS(root)) == []
+        root.joinpath("input/links/fr").mkdir(parents=True)
+        root.joinpath("input/links/fr/de.txt.link").write_text(f"matrix://{MATRIX_ID}")
+        root.joinpath("input/links/fr/es.txt").write_text("7\t8\n")
+        # The links outside the `input` directory are ignored
+        root.joinpath("output/20240101-0000eco").mkdir(parents=True)
+        root.joinpath("output/20240101-0000eco/values.txt.link").write_text(f"matrix://{MATRIX_ID}")
+        root.joinpath("user").mkdir()
+        root.joinpath("user/notes.txt.link").write_text(f"matrix://{MATRIX_ID}")
+        assert find_matrix_links(DiskFS(root)) == ["input/links/fr/de.txt.link"]
@@ -0,0 +1,44 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from antares.study.version.parallel import run_in_parallel
+
+
+class TestRunInParallel:
+    @pytest.mark.parametrize("max_workers", [None, 1, 4])
+    def test_results_order(self, max_workers: int) -> None:
+        def square(x: int) -> int:
+            time.sleep(0.001 * (10 - x))
+            return x * x
+
+        assert run_in_parallel(square, range(10), max_workers=max_workers) == [x * x for x in range(10)]
+
+    def test_uses_several_threads(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+        assert run_in_parallel(lambda x: barrier.wait() >= 0, [1, 2], max_workers=2) == [True, True]
+
+    def test_context_is_copied(self) -> None:
+        var: "contextvars.ContextVar[str]" = contextvars.ContextVar("var", default="default")
+        var.set("caller")
+        assert run_in_parallel(lambda _: var.get(), range(4), max_workers=4) == ["caller"] * 4
+
+    def test_first_failure_is_raised(self) -> None:
+        started = []
+
+        def func(x: int) -> int:
+            started.append(x)
+            if x in {3, 1}:
+                # the failure of the item 3 happens first, but the item 1 comes first in the order of the items
+                time.sleep(0.05 if x == 1 else 0)
+                raise ValueError(f"item {x}")
+            time.sleep(0.01)
+            return x
+
+        with pytest.raises(ValueError, match="item 1"):
+            run_in_parallel(func, range(100), max_workers=4)
+
+        # the pending items are cancelled
+        assert len(started) < 100
@@ -0,0 +1,159 @@
+import textwrap
+from pathlib import Path
+
+import numpy as np
+
+from antares.study.version.model.general_data import GENERAL_DATA_PATH, GeneralData
+from antares.study.version.model.playlist import Playlist
+
+PLAYLIST_SECTION = textwrap.dedent(
+    """\
+    [playlist]
+    playlist_reset = false
+    playlist_year + = 0
+    playlist_year + = 2
+    playlist_year + = 3
+    playlist_year + = 99
+    playlist_year - = 3
+    playlist_year_weight = 2,1.5
+    """
+)
+
+
+class TestPlaylist:
+    def test_from_text(self) -> None:
+        playlist = Playlist.from_text(PLAYLIST_SECTION, nb_years=5)
+        assert playlist.nb_years == 5
+        assert playlist.active.tolist() == [True, False, True, False, False]
+        assert playlist.weights.tolist() == [1, 1, 1.5, 1, 1]
+        assert playlist.options == {}
+
+    def test_from_section(self) -> None:
+        section = {
+            "playlist_reset": True,
+            "playlist_year -": [1],
+            "playlist_year_weight": ["0,2.0"],
+            "other": 3,
+        }
+        playlist = Playlist.from_section(section, nb_years=3)
+        assert playlist.active_years.tolist() == [0, 2]
+        assert playlist.weights.tolist() == [2, 1, 1]
+        assert playlist.options == {"other": 3}
+        assert playlist.to_section() == section
+        assert Playlist.from_text(playlist.to_text(), nb_years=3) == playlist
+
+    def test_vectorized_edits(self) -> None:
+        playlist = Playlist(nb_years=1000)
+        playlist.disable(slice(490, None))
+        playlist.enable(np.arange(900, 1000, 10))
+        playlist.set_weights(playlist.active, 0.5)
+        assert playlist.active_years.size == 500
+        assert np.count_nonzero(playlist.weights == 0.5) == 500
+
+        # the shortest form is written: here, the list of the enabled years
+        text = playlist.to_text()
+        assert text.startswith("[playlist]\nplaylist_reset = false\nplaylist_year + = 0\n")
+        assert text.count("playlist_year + =") == 500
+        assert text.count("playlist_year_weight =") == 500
+        assert Playlist.from_text(text, nb_years=1000) == playlist
+
+
+class TestGeneralDataPlaylist:
+    def test_playlist(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("settings").mkdir()
+        ini_path = tmp_path / GENERAL_DATA_PATH
+        ini_path.write_text(f"[general]\nnbyears = 5\n\n{PLAYLIST_SECTION}\n[other preferences]\nx = 1\n")
+
+        data = GeneralData.from_ini_file(tmp_path)
+        data.playlist.enable()
+        assert data.playlist is data.playlist
+        data.to_ini_file(tmp_path)
+        assert "[playlist]\nplaylist_reset = true\nplaylist_year_weight = 2,1.5\n\n" in ini_path.read_text()
+
+        # the dictionary API sees the changes made through the view
+        data = GeneralData.from_ini_file(tmp_path)
+        data.playlist.disable([0, 1])
+        assert data["playlist"] == {
+            "playlist_reset": True,
+            "playlist_year -": [0, 1],
+            "playlist_year_weight": ["2,1.5"],
+        }
+        assert data.playlist.active_years.tolist() == [2, 3, 4]
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("settings").mkdir()
+        ini_path = tmp_path / GENERAL_DATA_PATH
+        text = (
+            "[general]\nnbyears = 5\n\n"
+            "[playlist]\nplaylist_reset = false\nplaylist_other = true\nplaylist_year + = 2\nplaylist_year + = 4\n"
+            "playlist_year_weight = 2,1.50\nplaylist_year_weight = 4,2\n\n"
+            "[other preferences]\nx = 1\n\n"
+        )
+        ini_path.write_text(text)
+
+        # the values are written back as they were
+        data = GeneralData.from_ini_file(tmp_path)
+        assert data.playlist.options == {"playlist_other": True}
+        data.to_ini_file(tmp_path)
+        assert ini_path.read_text() == text
+
+        # the changed values are formatted like the INI writer does
+        data = GeneralData.from_ini_file(tmp_path)
+        data.playlist.options["playlist_other"] = False
+        data.playlist.set_weights([1, 2], [3.0, 0.25])
+        data.to_ini_file(tmp_path)
+        assert "[playlist]\nplaylist_reset = false\nplaylist_other = false\n" in ini_path.read_text()
+        assert (
+            "playlist_year_weight = 1,3\nplaylist_year_weight = 2,0.25\nplaylist_year_weight = 4,2\n\n"
+            in ini_path.read_text()
+        )
+
+    def test_round_trip__original_form(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("settings").mkdir()
+        ini_path = tmp_path / GENERAL_DATA_PATH
+        # not the shortest form, and an explicit weight of 1
+        text = (
+            "[general]\nnbyears = 4\n\n"
+            "[playlist]\nplaylist_reset = false\nplaylist_year + = 0\nplaylist_year + = 1\nplaylist_year + = 2\n"
+            "playlist_year_weight = 3,1\n\n"
+        )
+        ini_path.write_text(text)
+
+        data = GeneralData.from_ini_file(tmp_path)
+        assert data.playlist.active_years.tolist() == [0, 1, 2]
+        assert not data.playlist.modified
+        data.to_ini_file(tmp_path)
+        assert ini_path.read_text() == text
+        assert data["playlist"] == {
+            "playlist_reset": False,
+            "playlist_year +": [0, 1, 2],
+            "playlist_year_weight": ["3,1"],
+        }
+
+        # once modified, the shortest form is written
+        data = GeneralData.from_ini_file(tmp_path)
+        data.playlist.disable([2])
+        assert data.playlist.modified
+        data.to_ini_file(tmp_path)
+        assert (
+            "[playlist]\nplaylist_reset = false\nplaylist_year + = 0\nplaylist_year + = 1\n\n" in ini_path.read_text()
+        )
+
+    def test_missing_section(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("settings").mkdir()
+        ini_path = tmp_path / GENERAL_DATA_PATH
+        text = "[general]\nnbyears = 3\n\n"
+        ini_path.write_text(text)
+
+        # reading the view doesn't add the section
+        data = GeneralData.from_ini_file(tmp_path)
+        assert data.playlist.active_years.tolist() == [0, 1, 2]
+        assert "playlist" not in data
+        data.to_ini_file(tmp_path)
+        assert ini_path.read_text() == text
+
+        # the section is added once the view is modified
+        data.playlist.disable([0])
+        assert list(data) == ["general", "playlist"]
+        data.to_ini_file(tmp_path)
+        assert ini_path.read_text() == f"{text}[playlist]\nplaylist_reset = true\nplaylist_year - = 0\n\n"
@@ -0,0 +1,98 @@
+import typing as t
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.fs import DiskFS, ZipFS
+from antares.study.version.model.exceptions import ValidationError
+from antares.study.version.model.study_antares import (
+    SNIFF_SIZE,
+    STUDY_ANTARES_PATH,
+    StudyAntares,
+    read_study_version,
+    sniff_study_antares,
+)
+
+STUDY_ANTARES = (
+    "[antares]\n"
+    "version = 880\n"
+    "caption = Thermal fleet optimization\n"
+    "created = 1246524135\n"
+    "lastsave = 1686128483\n"
+    "author = John Doe\n"
+)
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "study"
+    study_dir.mkdir()
+    study_dir.joinpath(STUDY_ANTARES_PATH).write_text(STUDY_ANTARES)
+    return study_dir
+
+
+class TestSniffStudyAntares:
+    def test_sniff(self, study_dir: Path) -> None:
+        assert sniff_study_antares(study_dir) == {"version": "880"}
+        fields = sniff_study_antares(study_dir, ["caption", "author", "missing"])
+        assert fields == {"caption": "Thermal fleet optimization", "author": "John Doe"}
+
+    def test_read_study_version(self, study_dir: Path) -> None:
+        version = read_study_version(study_dir)
+        assert version == StudyAntares.from_ini_file(study_dir).version == StudyVersion(8, 8)
+        # the versions are cached
+        assert read_study_version(DiskFS(study_dir)) is version
+
+    def test_read_study_version__zip(self, study_dir: Path, tmp_path: Path) -> None:
+        zip_path = tmp_path / "study.zip"
+        with zipfile.ZipFile(zip_path, mode="w") as zf:
+            zf.write(study_dir / STUDY_ANTARES_PATH, arcname=f"study/{STUDY_ANTARES_PATH}")
+        assert read_study_version(zip_path) == StudyVersion(8, 8)
+
+    def test_large_file(self, study_dir: Path) -> None:
+        # a huge caption before the version: the whole file is read
+        text = f"[antares]\ncaption = {'x' * SNIFF_SIZE}\nversion = 9.2\n"
+        study_dir.joinpath(STUDY_ANTARES_PATH).write_text(text)
+        assert read_study_version(study_dir) == StudyVersion(9, 2)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("[antares]\ncaption = foo\n", id="missing"),
+            pytest.param("[antares]\nversion = foo\n", id="invalid"),
+            pytest.param("[other]\nversion = 8.8\n", id="other-section"),
+        ],
+    )
+    def test_invalid_version(self, study_dir: Path, text: str) -> None:
+        study_dir.joinpath(STUDY_ANTARES_PATH).write_text(text)
+        with pytest.raises(ValidationError):
+            read_study_version(study_dir)
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            read_study_version(tmp_path)
+
+
+class TestStudyAntares:
+    def test_from_ini_file__zip(self, study_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        zip_path = tmp_path / "study.zip"
+        with zipfile.ZipFile(zip_path, mode="w") as zf:
+            zf.write(study_dir / STUDY_ANTARES_PATH, arcname=f"study/{STUDY_ANTARES_PATH}")
+        closed: t.List[Path] = []
+        close = ZipFS.close
+
+        def recording_close(fs: ZipFS) -> None:
+            closed.append(fs.zip_path)
+            close(fs)
+
+        monkeypatch.setattr(ZipFS, "close", recording_close)
+
+        assert StudyAntares.from_ini_file(zip_path).version == StudyVersion(8, 8)
+        assert closed == [zip_path]
+
+        # A file system view given by the caller is not closed
+        with ZipFS(zip_path) as fs:
+            assert StudyAntares.from_ini_file(fs).author == "John Doe"
+            assert closed == [zip_path]
@@ -0,0 +1,77 @@
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.fs import DiskFS, OverlayFS
+from antares.study.version.model.study_index import RENEWABLE, ST_STORAGE, THERMAL, StudyIndex
+
+
+@pytest.fixture(name="study_dir")
+def fixture_study_dir(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "study"
+    study_dir.joinpath("input/areas").mkdir(parents=True)
+    study_dir.joinpath("input/areas/list.txt").write_text("DE\nFR\nIT (North)\n")
+    for area in ["de", "fr", "it (north)"]:
+        study_dir.joinpath(f"input/areas/{area}").mkdir()
+    study_dir.joinpath("input/links/de").mkdir(parents=True)
+    study_dir.joinpath("input/links/de/properties.ini").write_text("[fr]\nhurdles-cost = false\n\n[it (north)]\n")
+    study_dir.joinpath("input/links/fr").mkdir()
+    study_dir.joinpath("input/links/fr/properties.ini").write_text("[it (north)]\n")
+    study_dir.joinpath("input/thermal/clusters/fr").mkdir(parents=True)
+    study_dir.joinpath("input/thermal/clusters/fr/list.ini").write_text("[Nuclear]\nunitcount = 2\n\n[Gas]\n")
+    study_dir.joinpath("input/thermal/clusters/de").mkdir()
+    study_dir.joinpath("input/bindingconstraints").mkdir(parents=True)
+    study_dir.joinpath("input/bindingconstraints/bindingconstraints.ini").write_text(
+        "[0]\nid = bc_1\nname = BC 1\n\n[1]\nid = bc_2\nname = BC 2\n"
+    )
+    return study_dir
+
+
+class TestStudyIndex:
+    def test_index(self, study_dir: Path) -> None:
+        index = StudyIndex(DiskFS(study_dir))
+        assert index.area_ids == ["de", "fr", "it (north)"]
+        assert index.area_folders == ["de", "fr", "it (north)"]
+        assert index.links == {"de": ["fr", "it (north)"], "fr": ["it (north)"]}
+        assert index.cluster_list_files(THERMAL) == ["input/thermal/clusters/fr/list.ini"]
+        assert index.thermal_clusters == {"fr": ["Nuclear", "Gas"]}
+        assert index.renewable_clusters == {}
+        assert index.st_storages == {}
+        assert index.binding_constraints == ["bc_1", "bc_2"]
+
+    def test_empty_study(self, tmp_path: Path) -> None:
+        index = StudyIndex(DiskFS(tmp_path))
+        assert index.area_ids == []
+        assert index.area_folders == []
+        assert index.links == {}
+        assert index.clusters(RENEWABLE) == {}
+        assert index.binding_constraints == []
+
+    def test_of(self, study_dir: Path) -> None:
+        fs = OverlayFS(DiskFS(study_dir))
+        assert StudyIndex.of(fs) is StudyIndex.of(fs)
+        assert StudyIndex.of(fs) is not StudyIndex.of(OverlayFS(DiskFS(study_dir)))
+
+    def test_consistent_with_changes(self, study_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        fs = OverlayFS(DiskFS(study_dir))
+        index = StudyIndex.of(fs)
+        assert index.st_storages == {}
+
+        # the parts of the index are built once while the study is not modified
+        builds = []
+
+        def build_clusters(kind: str) -> t.Dict[str, t.List[str]]:
+            builds.append(kind)
+            return {}
+
+        monkeypatch.setattr(index, "_build_clusters", build_clusters)
+        for _ in range(3):
+            assert index.clusters(ST_STORAGE) == {}
+        assert builds == []
+
+        monkeypatch.undo()
+        fs.mkdir("input/st-storage/clusters/fr", parents=True)
+        fs.write_text("input/st-storage/clusters/fr/list.ini", "[Battery]\n")
+        assert index.st_storages == {"fr": ["Battery"]}
+        assert index.cluster_list_files(ST_STORAGE) == ["input/st-storage/clusters/fr/list.ini"]
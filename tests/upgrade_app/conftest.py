@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.create_app import CreateApp
+
+
+@pytest.fixture(name="study_0800")
+def fixture_study_0800(tmp_path: Path) -> Path:
+    study_dir = tmp_path / "My Study"
+    CreateApp(study_dir, caption="My Study", version=StudyVersion(8, 0), author="John Doe")()
+    return study_dir
+
+
+@pytest.fixture(name="link_dir")
+def fixture_link_dir(study_0800: Path) -> Path:
+    """Directory of the links of the "fr" area, with several link files to split (one per other area)."""
+    link_dir = study_0800.joinpath("input/links/fr")
+    link_dir.mkdir(parents=True)
+    for index, other in enumerate(["be", "de", "es", "it"]):
+        link_dir.joinpath(f"{other}.txt").write_text(f"1.2345678{index}\t0\t0\t0\t0\t0\t0\t0\n" * 3)
+    return link_dir
@@ -0,0 +1,159 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antares.study.version.fs import DiskFS
+from antares.study.version.upgrade_app.matrix_split import (
+    group_identical_files,
+    is_zero_text,
+    split_matrix,
+    split_text,
+)
+from antares.study.version.upgrade_app.options import UpgradeOptions, use_upgrade_options
+
+OUTPUTS = [("direct.txt", 0), ("indirect.txt", 1), ("parameters.txt", slice(2, 8))]
+
+
+@pytest.fixture(name="fs")
+def fixture_fs(tmp_path: Path) -> DiskFS:
+    return DiskFS(tmp_path)
+
+
+class TestSplitText:
+    def test_split_text(self) -> None:
+        data = b"1.5\t2\t3\t4\n0.123456789\t-2e-3\t7\t8\n"
+        assert split_text(data, [0, 1, slice(2, 8), slice(5, 8)]) == [
+            b"1.5\n0.123456789\n",
+            b"2\n-2e-3\n",
+            b"3\t4\n7\t8\n",
+            b"\n\n",
+        ]
+
+    def test_split_text__crlf_and_no_final_newline(self) -> None:
+        assert split_text(b"1\t2\r\n3\t4", [1]) == [b"2\n4\n"]
+
+    def test_split_text__empty(self) -> None:
+        assert split_text(b"", [0, slice(2, 8)]) == [b"", b""]
+
+    def test_split_text__missing_column(self) -> None:
+        with pytest.raises(ValueError, match="Column 2 is missing at line 2"):
+            split_text(b"1\t2\t3\n1\t2\n", [2])
+
+
+class TestIsZeroText:
+    @pytest.mark.parametrize("content", [b"", b"\n\n", b"0\n0.000000\n", b"-0.0\t0e+00\t.0\r\n", b"+0\t0.\n"])
+    def test_zeros(self, content: bytes) -> None:
+        assert is_zero_text(content)
+
+    @pytest.mark.parametrize("content", [b"0\n1\n", b"0.000001\n", b"nan\n", b"0\t\n", b"e\n", b"-\n", b"0..0\n"])
+    def test_not_zeros(self, content: bytes) -> None:
+        assert not is_zero_text(content)
+
+
+class TestSplitMatrix:
+    def test_numeric_mode(self, fs: DiskFS) -> None:
+        fs.write_text("matrix.txt", "1\t2\t3\n4.1234567\t5\t6\n")
+        split_matrix(fs, "matrix.txt", OUTPUTS, mode="numeric")
+        assert fs.read_text("direct.txt") == "1.000000\n4.123457\n"
+        assert fs.read_text("indirect.txt") == "2.000000\n5.000000\n"
+        assert fs.read_text("parameters.txt") == "3.000000\n6.000000\n"
+
+    def test_text_mode(self, fs: DiskFS) -> None:
+        fs.write_text("matrix.txt", "1\t2\t3\n4.1234567\t5\t6\n")
+        with use_upgrade_options(UpgradeOptions(split_mode="text")):
+            split_matrix(fs, "matrix.txt", OUTPUTS)
+        assert fs.read_text("direct.txt") == "1\n4.1234567\n"
+        assert fs.read_text("indirect.txt") == "2\n5\n"
+        assert fs.read_text("parameters.txt") == "3\n6\n"
+
+    @pytest.mark.parametrize("mode", ["numeric", "text"])
+    def test_empty_matrix(self, fs: DiskFS, mode: str) -> None:
+        fs.touch("matrix.txt")
+        split_matrix(fs, "matrix.txt", OUTPUTS, mode=mode)
+        assert [fs.size(path) for path, _ in OUTPUTS] == [0, 0, 0]
+
+    @pytest.mark.parametrize("mode", ["numeric", "text"])
+    def test_same_result_for_formatted_values(self, fs: DiskFS, mode: str) -> None:
+        # files written with the "%.6f" format are split identically in both modes
+        fs.write_text("matrix.txt", "".join(f"{i:.6f}\t{-i / 3:.6f}\t{i * 7:.6f}\n" for i in range(100)))
+        split_matrix(fs, "matrix.txt", OUTPUTS, mode=mode)
+        assert fs.read_text("indirect.txt") == "".join(f"{-i / 3:.6f}\n" for i in range(100))
+
+    @pytest.mark.parametrize("mode", ["numeric", "text"])
+    def test_empty_defaults(self, fs: DiskFS, mode: str) -> None:
+        fs.write_text("matrix.txt", "1\t0\t0\t0\n2\t0.000000\t0\t3\n")
+        with use_upgrade_options(UpgradeOptions(empty_defaults=True)):
+            split_matrix(fs, "matrix.txt", OUTPUTS, mode=mode)
+        assert fs.size("direct.txt") > 0
+        assert fs.size("indirect.txt") == 0
+        assert fs.size("parameters.txt") > 0
+
+        # the option is disabled by default
+        split_matrix(fs, "matrix.txt", OUTPUTS, mode=mode)
+        assert fs.size("indirect.txt") > 0
+
+    def test_invalid_mode(self, fs: DiskFS) -> None:
+        fs.touch("matrix.txt")
+        with pytest.raises(ValueError, match="Invalid split mode"):
+            split_matrix(fs, "matrix.txt", OUTPUTS, mode="binary")
+
+
+class TestSplitMatrixByChunks:
+    @pytest.mark.parametrize("mode", ["numeric", "text"])
+    @pytest.mark.parametrize("chunk_size", [1, 7, 100, 10_000])
+    def test_same_result_as_whole_matrix(self, fs: DiskFS, mode: str, chunk_size: int) -> None:
+        matrix = np.random.default_rng(0).normal(0, 1e3, size=(500, 8))
+        np.savetxt(fs.path("matrix.txt"), matrix, delimiter="\t", fmt="%.9f")
+        whole = [(f"whole_{path}", columns) for path, columns in OUTPUTS]
+        chunked = [(f"chunked_{path}", columns) for path, columns in OUTPUTS]
+
+        split_matrix(fs, "matrix.txt", whole, mode=mode)
+        with use_upgrade_options(UpgradeOptions(chunk_size=chunk_size)):
+            split_matrix(fs, "matrix.txt", chunked, mode=mode)
+
+        for (whole_path, _), (chunked_path, _) in zip(whole, chunked):
+            assert fs.read_bytes(chunked_path) == fs.read_bytes(whole_path)
+
+    @pytest.mark.parametrize("mode", ["numeric", "text"])
+    def test_empty_matrix(self, fs: DiskFS, mode: str) -> None:
+        fs.touch("matrix.txt")
+        split_matrix(fs, "matrix.txt", OUTPUTS, mode=mode, chunk_size=10)
+        assert [fs.size(path) for path, _ in OUTPUTS] == [0, 0, 0]
+
+    @pytest.mark.parametrize("mode", ["numeric", "text"])
+    def test_empty_defaults(self, fs: DiskFS, mode: str) -> None:
+        # the non-zero value of the third column is in the last chunk only
+        fs.write_text("matrix.txt", "1\t0\t0\n" * 10 + "1\t0\t5\n")
+        split_matrix(fs, "matrix.txt", OUTPUTS, mode=mode, chunk_size=4, empty_defaults=True)
+        assert fs.size("direct.txt") > 0
+        assert fs.size("indirect.txt") == 0
+        assert fs.read_text("parameters.txt").splitlines()[-2:] == (
+            ["0", "5"] if mode == "text" else ["0.000000", "5.000000"]
+        )
+
+    def test_missing_column(self, fs: DiskFS) -> None:
+        fs.write_text("matrix.txt", "1\t2\n" * 10 + "1\n")
+        with pytest.raises(ValueError, match="Column 1 is missing at line 11"):
+            split_matrix(fs, "matrix.txt", OUTPUTS, mode="text", chunk_size=4)
+
+
+class TestGroupIdenticalFiles:
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_group_identical_files(self, fs: DiskFS, max_workers: int) -> None:
+        fs.write_text("a.txt", "1\t2\n")
+        fs.write_text("b.txt", "3\t4\n")  # same size, different content
+        fs.write_text("c.txt", "1\t2\n")
+        fs.write_text("d.txt", "1\t2\t3\n")
+        fs.touch("e.txt")
+        fs.touch("f.txt")
+        paths = ["a.txt", "b.txt", "c.txt", "d.txt", "e.txt", "f.txt"]
+        assert group_identical_files(fs, paths, max_workers=max_workers) == [
+            ["a.txt", "c.txt"],
+            ["b.txt"],
+            ["d.txt"],
+            ["e.txt", "f.txt"],
+        ]
+
+    def test_no_files(self, fs: DiskFS) -> None:
+        assert group_identical_files(fs, []) == []
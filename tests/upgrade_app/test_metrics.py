@@ -0,0 +1,130 @@
+import json
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion
+from antares.study.version.fs import DiskFS, OverlayFS
+from antares.study.version.fs.overlay import apply_changes
+from antares.study.version.upgrade_app import UpgradeApp
+from antares.study.version.upgrade_app.metrics import NULL_RECORDER, PHASE, STEP, MetricsRecorder, StepMetrics
+
+
+class TestMetricsRecorder:
+    def test_measure(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("input").mkdir()
+        tmp_path.joinpath("input/data.txt").write_text("0123456789")
+        fs = OverlayFS(DiskFS(tmp_path))
+        collected: t.List[StepMetrics] = []
+        recorder = MetricsRecorder(hooks=[collected.append])
+        recorder.watch(fs)
+        with recorder.measure("write", STEP) as metrics:
+            fs.mkdir("foo")
+            fs.write_text("foo/bar.txt", "Hello")
+            fs.touch("foo/baz.txt")
+            fs.read_text("foo/bar.txt")
+            fs.read_text("input/data.txt")
+        assert recorder.steps == [metrics]
+        assert collected == [metrics]
+        assert metrics.name == "write"
+        assert metrics.kind == STEP
+        assert metrics.wall_time > 0
+        assert metrics.files_written == 2
+        assert metrics.bytes_written == 5
+        assert metrics.files_read == 2
+        assert metrics.bytes_read == 15
+        assert metrics.dirs_created == 1
+
+    def test_measure__other_io_not_counted(self, tmp_path: Path) -> None:
+        fs = OverlayFS(DiskFS(tmp_path))
+        recorder = MetricsRecorder()
+        recorder.watch(fs)
+        with recorder.measure("write") as metrics:
+            # the I/O performed outside the watched file system view is not part of the upgrade
+            tmp_path.joinpath("foo").mkdir()
+            tmp_path.joinpath("foo/bar.txt").write_text("Hello")
+            OverlayFS(DiskFS(tmp_path)).write_text("baz.txt", "World!")
+        assert (metrics.files_written, metrics.files_read, metrics.dirs_created) == (0, 0, 0)
+
+    def test_measure__changes(self, tmp_path: Path) -> None:
+        fs = OverlayFS(DiskFS(tmp_path))
+        fs.mkdir("foo")
+        fs.write_bytes("foo/bar.txt", b"Hello")
+        fs.write_bytes("foo/baz.txt", b"World!")
+        changes = fs.changes()
+        recorder = MetricsRecorder()
+        with recorder.measure("commit", changes=changes) as metrics:
+            apply_changes(changes, tmp_path, max_workers=1)
+        assert metrics.files_written == 2
+        assert metrics.bytes_written == 11
+        assert metrics.files_read == 0
+        assert metrics.dirs_created == 1
+
+        # the changes are not counted if the commit fails
+        with pytest.raises(OSError):
+            with recorder.measure("commit", changes=changes) as metrics:
+                raise OSError("disk full")
+        assert metrics.files_written == 0
+
+    def test_measure__nested_io_not_counted_twice(self, tmp_path: Path) -> None:
+        fs = OverlayFS(DiskFS(tmp_path))
+        recorder = MetricsRecorder()
+        recorder.watch(fs)
+        with recorder.measure("outer") as outer:
+            with recorder.measure("inner") as inner:
+                fs.write_text("foo.txt", "Hello")
+            fs.write_text("bar.txt", "World!")
+        assert inner.files_written == 1
+        assert outer.files_written == 1
+        assert outer.bytes_written == 6
+
+    def test_null_recorder(self, tmp_path: Path) -> None:
+        fs = OverlayFS(DiskFS(tmp_path))
+        NULL_RECORDER.watch(fs)
+        with NULL_RECORDER.measure("write"):
+            fs.write_text("foo.txt", "Hello")
+        assert fs.io_stats is None
+        assert NULL_RECORDER.steps == ()
+
+
+class TestUpgradeAppMetrics:
+    def test_disabled(self, study_0800: Path) -> None:
+        app = UpgradeApp(study_0800, version=StudyVersion(8, 2))
+        app()
+        assert app.metrics is None
+
+    def test_report(self, study_0800: Path) -> None:
+        collected: t.List[StepMetrics] = []
+        app = UpgradeApp(study_0800, version=StudyVersion(8, 2), metrics_hooks=[collected.append])
+        app()
+        report = app.metrics
+        assert report is not None
+        assert report.old_version == "8.0"
+        assert report.new_version == "8.2"
+        assert [(s.name, s.kind) for s in report.steps] == [
+            ("UpgradeTo0801", STEP),
+            ("UpgradeTo0802", STEP),
+            ("backup", PHASE),
+            ("commit", PHASE),
+            ("cleanup", PHASE),
+        ]
+        assert collected == report.steps
+        upgrade_0801 = report.steps[0]
+        assert upgrade_0801.files_read >= 1
+        # the upgrade steps are performed in memory: the files written in the overlay are counted
+        assert upgrade_0801.files_written >= 1  # generaldata.ini
+        assert upgrade_0801.bytes_written > 0
+        commit = report.steps[3]
+        assert commit.files_written >= 2  # generaldata.ini and study.antares
+        written = ["settings/generaldata.ini", "study.antares"]
+        assert commit.bytes_written == sum(study_0800.joinpath(relpath).stat().st_size for relpath in written)
+        assert commit.dirs_created >= 2  # renewables clusters and series
+        # the directories opened to create their entries or to remove them are not files read
+        cleanup = report.steps[4]
+        assert cleanup.files_read == 0
+        total = report.total
+        assert total.files_written == sum(s.files_written for s in report.steps)
+        obj = json.loads(report.to_json())
+        assert obj["total"]["files_written"] == total.files_written
+        assert len(obj["steps"]) == 5
@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from antares.study.version.upgrade_app.options import UpgradeOptions
+from antares.study.version.upgrade_app.transform_cache import TransformCache, TransformCacheInfo, code_fingerprint
+from antares.study.version.upgrade_app.upgrader_0802 import UpgradeTo0802
+from antares.study.version.upgrade_app.upgrader_0807 import UpgradeTo0807
+
+CONTENT_HASH = "0" * 64
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path: Path) -> TransformCache:
+    return TransformCache(tmp_path / "cache", max_size=1000)
+
+
+class TestTransformCache:
+    def test_get_put(self, cache: TransformCache) -> None:
+        assert cache.get("key") is None
+        cache.put("key", [b"1\n2\n", b"", b"3\t4\n"])
+        assert cache.get("key") == [b"1\n2\n", b"", b"3\t4\n"]
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.stores, info.count) == (1, 1, 1, 1)
+        assert info.size == cache.cache_dir.joinpath("key.entry").stat().st_size
+
+    def test_persistence(self, cache: TransformCache) -> None:
+        cache.put("key", [b"abc"])
+        other = TransformCache(cache.cache_dir)
+        assert other.get("key") == [b"abc"]
+        assert other.cache_info() == TransformCacheInfo(hits=1, size=cache.cache_info().size, count=1)
+
+    def test_eviction(self, cache: TransformCache) -> None:
+        content = b"x" * 300
+        for key in ["a", "b", "c"]:
+            cache.put(key, [content])
+        # "a" is the least recently used entry once "a" is read
+        assert cache.get("a") == [content]
+        cache.put("d", [content])
+        assert cache.get("b") is None
+        assert [key for key in "acd" if cache.get(key) is not None] == ["a", "c", "d"]
+        assert cache.cache_info().evictions == 1
+
+    def test_eviction__order_of_existing_entries(self, cache: TransformCache) -> None:
+        content = b"x" * 300
+        for index, key in enumerate(["a", "b", "c"]):
+            cache.put(key, [content])
+            os.utime(cache.cache_dir / f"{key}.entry", (1000 - index, 1000 - index))
+        # a new instance lists the existing entries by access time: "c" is the oldest one
+        other = TransformCache(cache.cache_dir, max_size=1000)
+        other.put("d", [content])
+        assert sorted(p.stem for p in cache.cache_dir.glob("*.entry")) == ["a", "b", "d"]
+
+    def test_entry_too_large(self, cache: TransformCache) -> None:
+        cache.put("key", [b"x" * 2000])
+        assert cache.get("key") is None
+        assert cache.cache_info().stores == 0
+
+    def test_corrupted_entry(self, cache: TransformCache) -> None:
+        cache.put("key", [b"abc"])
+        cache.cache_dir.joinpath("key.entry").write_bytes(b"[10]\nabc")
+        assert cache.get("key") is None
+
+    def test_get__count_mismatch(self, cache: TransformCache) -> None:
+        cache.put("key", [b"abc", b""])
+        assert cache.get("key", count=2) == [b"abc", b""]
+        # an entry with another number of outputs is not used, and it is not a hit
+        assert cache.get("key", count=3) is None
+        info = cache.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_clear(self, cache: TransformCache) -> None:
+        cache.put("key", [b"abc"])
+        cache.clear()
+        assert cache.get("key") is None
+        assert cache.cache_info() == TransformCacheInfo(misses=1)
+
+    def test_invalid_size(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="cache size"):
+            TransformCache(tmp_path, max_size=-1)
+
+
+class TestMakeKey:
+    def test_make_key(self) -> None:
+        options = UpgradeOptions()
+        key = TransformCache.make_key(UpgradeTo0802, "input/links/*/*.txt", CONTENT_HASH, options)
+        assert key == TransformCache.make_key(UpgradeTo0802, "input/links/*/*.txt", CONTENT_HASH, options)
+        # the options which don't change the outputs are not part of the key
+        assert key == TransformCache.make_key(
+            UpgradeTo0802, "input/links/*/*.txt", CONTENT_HASH, UpgradeOptions(max_workers=2, chunk_size=10)
+        )
+
+        other_keys = {
+            TransformCache.make_key(UpgradeTo0807, "input/links/*/*.txt", CONTENT_HASH, options),
+            TransformCache.make_key(UpgradeTo0802, "input/bindingconstraints/*.txt", CONTENT_HASH, options),
+            TransformCache.make_key(UpgradeTo0802, "input/links/*/*.txt", "1" * 64, options),
+            TransformCache.make_key(
+                UpgradeTo0802, "input/links/*/*.txt", CONTENT_HASH, UpgradeOptions(split_mode="text")
+            ),
+            TransformCache.make_key(
+                UpgradeTo0802, "input/links/*/*.txt", CONTENT_HASH, UpgradeOptions(empty_defaults=True)
+            ),
+        }
+        assert len(other_keys) == 5
+        assert key not in other_keys
+
+    def test_code_fingerprint(self) -> None:
+        # the fingerprint depends on the source of the upgrader
+        assert code_fingerprint(UpgradeTo0802) != code_fingerprint(UpgradeTo0807)
+        assert len(code_fingerprint(UpgradeTo0802)) == 64
@@ -0,0 +1,296 @@
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from antares.study.version import StudyVersion, upgrade_app
+from antares.study.version.create_app import CreateApp
+from antares.study.version.exceptions import ApplicationError
+from antares.study.version.fs import StudyDir, StudyFS
+from antares.study.version.model.study_antares import StudyAntares
+from antares.study.version.upgrade_app import UpgradeApp, matrix_split, upgrade_method
+from antares.study.version.upgrade_app.exceptions import MatrixTransformationError, UnexpectedMatrixLinksError
+from antares.study.version.upgrade_app.transform_cache import TransformCache
+from antares.study.version.upgrade_app.upgrader_0802 import UpgradeTo0802
+
+
+class TestUpgradeApp:
+    def test_only_modified_files_are_written(self, study_0800: Path) -> None:
+        untouched = study_0800 / "input/areas/list.txt"
+        general_data = study_0800 / "settings/generaldata.ini"
+        untouched_stat = untouched.stat()
+        general_data_stat = general_data.stat()
+
+        UpgradeApp(study_0800, version=StudyVersion(8, 2))()
+
+        assert StudyAntares.from_ini_file(study_0800).version == StudyVersion(8, 2)
+        assert study_0800.joinpath("input/renewables/clusters").is_dir()
+        assert untouched.stat().st_ino == untouched_stat.st_ino
+        assert untouched.stat().st_mtime_ns == untouched_stat.st_mtime_ns
+        assert general_data.stat().st_mtime_ns >= general_data_stat.st_mtime_ns
+        # no temporary directory remains
+        assert [p.name for p in study_0800.parent.iterdir()] == [study_0800.name]
+
+    def test_failure_leaves_study_untouched(self, study_0800: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        def upgrade(study_dir: StudyDir) -> None:
+            raise RuntimeError("Oops!")
+
+        monkeypatch.setattr(UpgradeTo0802, "upgrade", staticmethod(upgrade))
+        general_data = study_0800.joinpath("settings/generaldata.ini").read_text()
+
+        with pytest.raises(RuntimeError, match="Oops!"):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2))()
+
+        assert StudyAntares.from_ini_file(study_0800).version == StudyVersion(8, 0)
+        assert study_0800.joinpath("settings/generaldata.ini").read_text() == general_data
+        assert not study_0800.joinpath("input/renewables").exists()
+        assert [p.name for p in study_0800.parent.iterdir()] == [study_0800.name]
+
+    def test_memory_budget(self, study_0800: Path) -> None:
+        # with a null budget, every modified file is spilled to disk before the commit
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), memory_budget=0)()
+        assert StudyAntares.from_ini_file(study_0800).version == StudyVersion(8, 2)
+        assert study_0800.joinpath("input/renewables/clusters").is_dir()
+
+    def test_output_path(self, study_0800: Path) -> None:
+        target_dir = study_0800.parent / "My Study (v8.2)"
+        general_data = study_0800.joinpath("settings/generaldata.ini").read_text()
+
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), output_path=target_dir)()
+
+        # the source study is untouched
+        assert StudyAntares.from_ini_file(study_0800).version == StudyVersion(8, 0)
+        assert study_0800.joinpath("settings/generaldata.ini").read_text() == general_data
+        assert not study_0800.joinpath("input/renewables").exists()
+
+        # the untouched files are shared with the source study
+        assert StudyAntares.from_ini_file(target_dir).version == StudyVersion(8, 2)
+        assert target_dir.joinpath("input/renewables/clusters").is_dir()
+        assert target_dir.joinpath("input/areas/list.txt").samefile(study_0800 / "input/areas/list.txt")
+        assert not target_dir.joinpath("settings/generaldata.ini").samefile(study_0800 / "settings/generaldata.ini")
+        assert sorted(p.name for p in study_0800.parent.iterdir()) == [study_0800.name, target_dir.name]
+
+    def test_output_path__already_exists(self, study_0800: Path) -> None:
+        with pytest.raises(FileExistsError):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2), output_path=study_0800.parent)
+
+    def test_matrix_store(self, study_0800: Path, tmp_path: Path) -> None:
+        link_dir = study_0800.joinpath("input/links/fr")
+        link_dir.mkdir(parents=True)
+        link_dir.joinpath("de.txt.link").write_text("matrix://my-matrix")
+        store_dir = tmp_path / "matrixstore"
+        store_dir.mkdir()
+
+        # the links can't be upgraded without a matrix store
+        with pytest.raises(UnexpectedMatrixLinksError):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2))()
+
+        # the matrix is missing from the matrix store
+        with pytest.raises(ApplicationError, match="my-matrix"):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2), matrix_store=store_dir)()
+
+        store_dir.joinpath("my-matrix.tsv").write_text("1\t2\t3\t4\t5\t6\t7\t8\n" * 3)
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), matrix_store=store_dir)()
+
+        assert sorted(p.name for p in link_dir.iterdir()) == ["capacities", "de_parameters.txt"]
+        assert link_dir.joinpath("capacities/de_direct.txt").read_text() == "1.000000\n" * 3
+        assert link_dir.joinpath("de_parameters.txt").read_text().startswith("3.000000\t4.000000\t")
+
+    def test_matrix_store__max_workers(self, study_0800: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        study_0800.joinpath("input/links/fr").mkdir(parents=True)
+        study_0800.joinpath("input/links/fr/de.txt.link").write_text("matrix://my-matrix")
+        store_dir = tmp_path / "matrixstore"
+        store_dir.mkdir()
+        store_dir.joinpath("my-matrix.tsv").write_text("1\t2\t3\t4\t5\t6\t7\t8\n" * 3)
+
+        calls: t.List[t.Dict[str, t.Any]] = []
+        denormalize_study = upgrade_app.denormalize_study
+
+        def recording_denormalize_study(*args: t.Any, **kwargs: t.Any) -> int:
+            calls.append(kwargs)
+            return denormalize_study(*args, **kwargs)
+
+        monkeypatch.setattr(upgrade_app, "denormalize_study", recording_denormalize_study)
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), matrix_store=store_dir, max_workers=3)()
+        assert calls == [{"max_workers": 3}]
+
+    def test_empty_defaults(self, study_0800: Path) -> None:
+        link_dir = study_0800.joinpath("input/links/fr")
+        link_dir.mkdir(parents=True)
+        link_dir.joinpath("de.txt").write_text("1\t0\t0\t0\t0\t0\t0\t0\n" * 3)
+
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), empty_defaults=True)()
+
+        # the columns of zeros are written as empty files
+        assert link_dir.joinpath("capacities/de_direct.txt").read_text() == "1.000000\n" * 3
+        assert link_dir.joinpath("capacities/de_indirect.txt").read_text() == ""
+        assert link_dir.joinpath("de_parameters.txt").read_text() == ""
+
+    def test_identical_matrices_are_split_once(self, study_0800: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        for area, other in [("be", "de"), ("fr", "de"), ("fr", "it")]:
+            link_dir = study_0800.joinpath(f"input/links/{area}")
+            link_dir.mkdir(parents=True, exist_ok=True)
+            link_dir.joinpath(f"{other}.txt").write_text("1\t2\t3\t4\t5\t6\t7\t8\n" * 3)
+        study_0800.joinpath("input/links/fr/de.txt").write_text("9\t2\t3\t4\t5\t6\t7\t8\n" * 3)
+
+        split_paths = []
+
+        def split_matrix(fs: StudyFS, relpath: str, *args: t.Any, **kwargs: t.Any) -> None:
+            split_paths.append(relpath)
+            matrix_split.split_matrix(fs, relpath, *args, **kwargs)
+
+        monkeypatch.setattr(upgrade_method, "split_matrix", split_matrix)
+        UpgradeApp(study_0800, version=StudyVersion(8, 2))()
+
+        assert sorted(split_paths) == ["input/links/be/de.txt", "input/links/fr/de.txt"]
+        for area, other in [("be", "de"), ("fr", "it")]:
+            link_dir = study_0800.joinpath(f"input/links/{area}")
+            assert not link_dir.joinpath(f"{other}.txt").exists()
+            assert link_dir.joinpath(f"capacities/{other}_direct.txt").read_text() == "1.000000\n" * 3
+            assert link_dir.joinpath(f"{other}_parameters.txt").read_text().startswith("3.000000\t4.000000\t")
+        assert study_0800.joinpath("input/links/fr/capacities/de_direct.txt").read_text() == "9.000000\n" * 3
+
+    def test_transform_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache = TransformCache(tmp_path / "cache")
+        study_dirs = []
+        for name in ["Study A", "Study B"]:
+            study_dir = tmp_path / name
+            CreateApp(study_dir, caption=name, version=StudyVersion(8, 0), author="John Doe")()
+            link_dir = study_dir.joinpath("input/links/fr")
+            link_dir.mkdir(parents=True)
+            link_dir.joinpath("de.txt").write_text("1\t2\t3\t4\t5\t6\t7\t8\n" * 3)
+            study_dirs.append(study_dir)
+
+        UpgradeApp(study_dirs[0], version=StudyVersion(8, 2), transform_cache=cache)()
+        assert (cache.cache_info().hits, cache.cache_info().misses) == (0, 1)
+
+        # the outputs of the second study are taken from the cache
+        monkeypatch.setattr(upgrade_method, "split_matrix", None)
+        UpgradeApp(study_dirs[1], version=StudyVersion(8, 2), transform_cache=cache)()
+        assert (cache.cache_info().hits, cache.cache_info().misses) == (1, 1)
+        for relpath in ["de_parameters.txt", "capacities/de_direct.txt", "capacities/de_indirect.txt"]:
+            expected = study_dirs[0].joinpath("input/links/fr", relpath).read_bytes()
+            assert study_dirs[1].joinpath("input/links/fr", relpath).read_bytes() == expected
+        assert not study_dirs[1].joinpath("input/links/fr/de.txt").exists()
+
+    def test_transform_cache__count_mismatch(self, study_0800: Path, link_dir: Path, tmp_path: Path) -> None:
+        cache = TransformCache(tmp_path / "cache")
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), output_path=tmp_path / "Other", transform_cache=cache)()
+        # the entries don't have the expected number of outputs: the files are split again
+        for entry_path in cache.cache_dir.glob("*.entry"):
+            cache.put(entry_path.stem, [b"1\n"])
+        hits, misses = cache.cache_info().hits, cache.cache_info().misses
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), transform_cache=cache)()
+        info = cache.cache_info()
+        assert (info.hits - hits, info.misses - misses) == (0, 4)
+        assert link_dir.joinpath("capacities/be_direct.txt").read_text() == "1.234568\n" * 3
+
+    @pytest.mark.parametrize(
+        "options, use_cache",
+        [
+            pytest.param({"split_mode": "text"}, False, id="split_mode"),
+            pytest.param({"empty_defaults": True}, False, id="empty_defaults"),
+            pytest.param({"chunk_size": 2}, False, id="chunk_size"),
+            pytest.param({"split_mode": "text", "empty_defaults": True}, True, id="transform_cache"),
+        ],
+    )
+    def test_options__several_files(
+        self,
+        study_0800: Path,
+        link_dir: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        options: t.Dict[str, t.Any],
+        use_cache: bool,
+    ) -> None:
+        # the files are split in worker threads, which must use the options of the upgrade
+        others = sorted(path.stem for path in link_dir.glob("*.txt"))
+        split_kwargs: t.List[t.Dict[str, t.Any]] = []
+
+        def split_matrix(fs: StudyFS, relpath: str, *args: t.Any, **kwargs: t.Any) -> None:
+            split_kwargs.append(kwargs)
+            matrix_split.split_matrix(fs, relpath, *args, **kwargs)
+
+        cache = TransformCache(tmp_path / "cache") if use_cache else None
+        if cache is not None:
+            # the cache is filled by a first upgrade, the outputs of the second one are taken from the cache
+            output_path = tmp_path / "Cached Study"
+            UpgradeApp(
+                study_0800,
+                version=StudyVersion(8, 2),
+                output_path=output_path,
+                transform_cache=cache,
+                max_workers=4,
+                **options,
+            )()
+            assert (cache.cache_info().hits, cache.cache_info().misses) == (0, len(others))
+            monkeypatch.setattr(upgrade_method, "split_matrix", None)
+        else:
+            monkeypatch.setattr(upgrade_method, "split_matrix", split_matrix)
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), transform_cache=cache, max_workers=4, **options)()
+
+        if cache is not None:
+            assert (cache.cache_info().hits, cache.cache_info().misses) == (len(others), len(others))
+        else:
+            expected_kwargs = {
+                "mode": options.get("split_mode", "numeric"),
+                "chunk_size": options.get("chunk_size"),
+                "empty_defaults": options.get("empty_defaults", False),
+            }
+            assert split_kwargs == [expected_kwargs] * len(others)
+        for index, other in enumerate(others):
+            # the "text" mode copies the values as is
+            text_mode = options.get("split_mode") == "text"
+            direct = f"1.2345678{index}" if text_mode else "1.234568"
+            indirect = "" if options.get("empty_defaults") else ("0\n" if text_mode else "0.000000\n") * 3
+            assert link_dir.joinpath(f"capacities/{other}_direct.txt").read_text() == f"{direct}\n" * 3
+            assert link_dir.joinpath(f"capacities/{other}_indirect.txt").read_text() == indirect
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_max_workers(self, study_0800: Path, max_workers: int) -> None:
+        for area in ["at", "be", "fr"]:
+            link_dir = study_0800.joinpath(f"input/links/{area}")
+            link_dir.mkdir(parents=True)
+            for index, other in enumerate(["de", "es", "it"]):
+                link_dir.joinpath(f"{other}.txt").write_text(f"{index}\t2\t3\t4\t5\t6\t7\t8\n" * 5)
+
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), max_workers=max_workers)()
+
+        for area in ["at", "be", "fr"]:
+            link_dir = study_0800.joinpath(f"input/links/{area}")
+            assert sorted(p.name for p in link_dir.glob("*.txt")) == [
+                "de_parameters.txt",
+                "es_parameters.txt",
+                "it_parameters.txt",
+            ]
+            assert link_dir.joinpath("capacities/it_direct.txt").read_text() == "2.000000\n" * 5
+
+    def test_max_workers__failure(self, study_0800: Path) -> None:
+        link_dir = study_0800.joinpath("input/links/fr")
+        link_dir.mkdir(parents=True)
+        for name in ["be", "de", "es", "it"]:
+            link_dir.joinpath(f"{name}.txt").write_text("1\t2\t3\t4\t5\t6\t7\t8\n")
+        link_dir.joinpath("de.txt").write_text("a\tb\n")  # invalid matrix
+        link_dir.joinpath("it.txt").write_text("1\n")  # invalid matrix
+
+        # the first invalid file is reported, and the study is untouched
+        with pytest.raises(MatrixTransformationError, match="input/links/fr/de.txt"):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2), max_workers=4)()
+        assert sorted(p.name for p in link_dir.iterdir()) == ["be.txt", "de.txt", "es.txt", "it.txt"]
+
+        with pytest.raises(ValueError):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2), max_workers=0)
+
+    def test_split_mode(self, study_0800: Path) -> None:
+        link_dir = study_0800.joinpath("input/links/fr")
+        link_dir.mkdir(parents=True)
+        link_dir.joinpath("de.txt").write_text("1.23456789\t2\t3\t4\t5\t6\t7\t8\n" * 3)
+
+        UpgradeApp(study_0800, version=StudyVersion(8, 2), split_mode="text")()
+
+        # the values are kept exactly
+        assert link_dir.joinpath("capacities/de_direct.txt").read_text() == "1.23456789\n" * 3
+        assert link_dir.joinpath("de_parameters.txt").read_text() == "3\t4\t5\t6\t7\t8\n" * 3
+
+        with pytest.raises(ValueError, match="split mode"):
+            UpgradeApp(study_0800, version=StudyVersion(8, 2), split_mode="binary")